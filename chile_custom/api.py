@@ -1,56 +1,210 @@
 import frappe
-from chile_custom.constants.regiones import regiones
+from frappe.utils import cint, getdate
+from chile_custom.utils import regiones
+from chile_custom.utils.rut import normalize_ruts
+from chile_custom.chile_custom.doctype.rut_party_index.rut_party_index import find_parties
+from chile_custom.chile_custom.doctype.supplier_pinv_summary.supplier_pinv_summary import get_top_suppliers
+from chile_custom.chile_custom.doctype.supplier_pinv_monthly.supplier_pinv_monthly import get_supplier_ranking
 
 @frappe.whitelist()
 def get_region_from_comuna(comuna):
-    for r in regiones:
-        if comuna in r["comunas"]:
-            return {
-                "region": r["region"],
-                "numero": r["numero"]
-            }
-    return {}
+    return regiones.get_region_from_comuna(comuna)
 
 
-@frappe.whitelist(allow_guest=True)
+# Máximo de RUTs por llamada a normalizar_ruts
+RUT_BATCH_MAX = 5000
+
+
+@frappe.whitelist()
+def normalizar_ruts(ruts):
+    """
+    Normaliza y valida una lista de RUTs en una sola llamada.
+    `ruts` puede venir como lista o como JSON (string), con hasta
+    RUT_BATCH_MAX (5000) elementos; para más, llamar por lotes.
+
+    Devuelve:
+        {
+            "ruts": [...],      # normalizados (None si la fila es inválida)
+            "errores": [...],   # None o código de error por fila
+            "invalidos": N,
+        }
+    """
+    ruts = frappe.parse_json(ruts) or []
+
+    if not isinstance(ruts, list):
+        frappe.throw("El parámetro ruts debe ser una lista.")
+
+    if len(ruts) > RUT_BATCH_MAX:
+        frappe.throw(
+            f"Se recibieron {len(ruts):,} RUTs; el máximo por llamada es {RUT_BATCH_MAX:,}.",
+            frappe.ValidationError,
+        )
+
+    valores, errores = normalize_ruts(ruts)
+
+    return {
+        "ruts": valores,
+        "errores": errores,
+        "invalidos": sum(1 for e in errores if e),
+    }
+
+
+@frappe.whitelist()
+def find_party_by_rut(rut):
+    """
+    Busca Supplier / Customer / Employee / Shareholder por RUT
+    (acepta cualquier formato: "12.345.678-5", "123456785", ...).
+
+    Devuelve [{"party_type", "party"}, ...] o [] si el RUT es inválido
+    o no está registrado. Sólo incluye los parties que el usuario puede leer.
+    """
+    (normalizado,), (error,) = normalize_ruts([rut])
+    if error or not normalizado:
+        return []
+
+    return [
+        p for p in find_parties(normalizado)
+        if frappe.has_permission(p.party_type, "read", doc=p.party)
+    ]
+
+
+@frappe.whitelist()
 def top_proveedores_pinv():
     """
     Devuelve los 10 proveedores con más facturas de compra.
-    SQL simple sin parámetros.
+    Lee el agregado Supplier PINV Summary (mantenido en submit/cancel)
+    con un cache de respuesta de pocos segundos.
     """
-    data = frappe.db.sql(
-        """
-        SELECT
-            supplier,
-            COUNT(*) as total_facturas,
-            SUM(grand_total) as monto_total
-        FROM `tabPurchase Invoice`
-        WHERE docstatus = 1
-        GROUP BY supplier
-        ORDER BY total_facturas DESC
-        LIMIT 10
-        """,
-        as_dict=True
+    _check_pinv_report_permission()
+    return get_top_suppliers(10)
+
+
+@frappe.whitelist()
+def ranking_proveedores_pinv(
+    top_n=10,
+    order_by="count",
+    company=None,
+    from_date=None,
+    to_date=None,
+    project=None,
+    supplier_group=None,
+):
+    """
+    Ranking top-N de proveedores por cantidad de PINV ("count") o monto
+    ("amount"), filtrable por company, rango de fechas, proyecto
+    (Purchase Invoice Item.project) y supplier group.
+    Lee los agregados Supplier PINV Monthly / Project Monthly (los días
+    sueltos de rangos que no calzan con meses completos, desde las facturas).
+
+    Con filtro de proyecto, una factura con ítems de varios proyectos cuenta
+    en cada uno de ellos, con el monto de sus ítems de ese proyecto
+    (prorrateado sobre el grand_total).
+    """
+    _check_pinv_report_permission()
+    return get_supplier_ranking(
+        top_n=top_n,
+        order_by=order_by,
+        company=company,
+        from_date=from_date,
+        to_date=to_date,
+        project=project,
+        supplier_group=supplier_group,
     )
 
-    return data
+
+def _check_pinv_report_permission():
+    """Los agregados de PINV exponen el gasto por proveedor: exige permiso de reporte."""
+    if not frappe.has_permission("Purchase Invoice", "report"):
+        frappe.throw("No tiene permiso para ver reportes de Purchase Invoice.", frappe.PermissionError)
+
+
+# Paginación de facturas_pinv_por_fecha
+PINV_PAGE_SIZE = 500
+PINV_MAX_PAGE_SIZE = 5000
 
 
 @frappe.whitelist()
 def facturas_pinv_por_fecha(fecha_inicio, fecha_fin, supplier=None):
     """
     Consulta SQL avanzada con parámetros.
-    Devuelve todas las PINV entre fechas, opcionalmente filtradas por proveedor.
+    Devuelve las PINV entre fechas, opcionalmente filtradas por proveedor,
+    ordenadas por (posting_date, name) descendente.
+
+    Firma y resultado sin cambios: sólo las primeras PINV_PAGE_SIZE (500)
+    filas. Para recorrer el rango completo usar
+    facturas_pinv_por_fecha_paginado (devuelve next_cursor) o
+    iter_facturas_pinv_por_fecha desde Python.
+    """
+    data, _ = _pinv_page(fecha_inicio, fecha_fin, supplier)
+    return data
+
+
+@frappe.whitelist()
+def facturas_pinv_por_fecha_paginado(fecha_inicio, fecha_fin, supplier=None, page_size=PINV_PAGE_SIZE, cursor=None):
+    """
+    Igual que facturas_pinv_por_fecha pero con paginación por cursor (keyset).
+
+    Devuelve {"data": [...], "next_cursor": "..." | None}. Para la página
+    siguiente se vuelve a llamar con cursor=next_cursor; None = fin del rango.
+    """
+    data, next_cursor = _pinv_page(fecha_inicio, fecha_fin, supplier, page_size, cursor)
+    return {"data": data, "next_cursor": next_cursor}
+
+
+def iter_facturas_pinv_por_fecha(fecha_inicio, fecha_fin, supplier=None, chunk_size=1000):
+    """
+    Generador que entrega el rango COMPLETO en bloques de chunk_size filas,
+    sin OFFSET ni truncar. Ej:
+
+        for bloque in iter_facturas_pinv_por_fecha("2025-01-01", "2025-12-31"):
+            procesar(bloque)
+    """
+    cursor = None
+    while True:
+        data, cursor = _pinv_page(fecha_inicio, fecha_fin, supplier, chunk_size, cursor)
+        if data:
+            yield data
+        if not cursor:
+            break
+
+
+def _pinv_page(fecha_inicio, fecha_fin, supplier=None, page_size=PINV_PAGE_SIZE, cursor=None):
+    """
+    Una página de PINV por keyset (posting_date, name) DESC.
+    Usa el índice (docstatus, posting_date, supplier) creado en after_migrate
+    (chile_custom.custom.indexes). Devuelve (filas, next_cursor).
+    """
+
+    page_size = min(max(cint(page_size) or PINV_PAGE_SIZE, 1), PINV_MAX_PAGE_SIZE)
+    query, params = pinv_page_query(fecha_inicio, fecha_fin, supplier, page_size, cursor)
+
+    results = frappe.db.sql(query, params, as_dict=True)
+
+    # Se pide una fila extra sólo para saber si hay más páginas
+    next_cursor = None
+    if len(results) > page_size:
+        results = results[:page_size]
+        last = results[-1]
+        next_cursor = f"{last.posting_date}|{last.name}"
+
+    return results, next_cursor
+
+
+def pinv_page_query(fecha_inicio, fecha_fin, supplier=None, page_size=PINV_PAGE_SIZE, cursor=None):
+    """
+    (sql, params) de una página de _pinv_page (pide page_size + 1 filas).
+    También la usa check_indexes (chile_custom.custom.indexes).
     """
 
     conditions = """
-        posting_date BETWEEN %(start)s AND %(end)s
-        AND docstatus = 1
+        docstatus = 1
+        AND posting_date BETWEEN %(start)s AND %(end)s
     """
 
     params = {
         "start": fecha_inicio,
         "end": fecha_fin,
+        "limit": page_size + 1,
     }
 
     # Si el usuario envía un supplier opcional
@@ -58,6 +212,16 @@ def facturas_pinv_por_fecha(fecha_inicio, fecha_fin, supplier=None):
         conditions += " AND supplier = %(supplier)s"
         params["supplier"] = supplier
 
+    # Continuar después de la última fila de la página anterior
+    if cursor:
+        cursor_date, cursor_name = _parse_pinv_cursor(cursor)
+        conditions += """
+            AND (posting_date < %(cursor_date)s
+                 OR (posting_date = %(cursor_date)s AND name < %(cursor_name)s))
+        """
+        params["cursor_date"] = cursor_date
+        params["cursor_name"] = cursor_name
+
     query = f"""
         SELECT
             name,
@@ -68,9 +232,15 @@ def facturas_pinv_por_fecha(fecha_inicio, fecha_fin, supplier=None):
             outstanding_amount
         FROM `tabPurchase Invoice`
         WHERE {conditions}
-        ORDER BY posting_date DESC
-        LIMIT 500
+        ORDER BY posting_date DESC, name DESC
+        LIMIT %(limit)s
     """
+    return query, params
 
-    results = frappe.db.sql(query, params, as_dict=True)
-    return results
+
+def _parse_pinv_cursor(cursor: str):
+    try:
+        cursor_date, cursor_name = cursor.split("|", 1)
+        return getdate(cursor_date), cursor_name
+    except Exception:
+        frappe.throw("Cursor inválido.")
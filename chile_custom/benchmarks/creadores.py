@@ -0,0 +1,116 @@
+# File: chile_custom/benchmarks/creadores.py
+# ---------------------------------------------------------
+# Documentos por segundo de cada creador de datos demo
+# (chile_custom.utils.demodata_creator.transactional_data).
+#
+# OJO: los creadores hacen commit, así que este benchmark DEJA los
+# documentos creados. Usarlo sólo en un sitio demo y sobre un proyecto de
+# prueba.
+#
+# Para ejecutarlo (requiere BD):
+#     bench --site [site] execute chile_custom.benchmarks.creadores.run --kwargs "{'company': '...', 'project_name': 'PROJ-0003', 'cuenta_gasto_rem': '...', 'cuenta_banco': '...'}"
+# ---------------------------------------------------------
+
+import time
+
+from chile_custom.utils.demodata_creator.transactional_data.cobros_por_proyecto_creator import (
+    crear_cobros_para_proyecto,
+)
+from chile_custom.utils.demodata_creator.transactional_data.expenseclaim_creator import (
+    crear_expense_claims_para_proyecto,
+)
+from chile_custom.utils.demodata_creator.transactional_data.pagos_por_proyecto_creator import (
+    crear_pagos_para_proyecto,
+)
+from chile_custom.utils.demodata_creator.transactional_data.pinv_proyecto_creator import (
+    crear_pinv_para_proyecto,
+)
+from chile_custom.utils.demodata_creator.transactional_data.remuneraciones_proyecto_creator import (
+    crear_remuneraciones_para_proyecto,
+)
+from chile_custom.utils.demodata_creator.transactional_data.sinv_proyecto_creator import (
+    crear_facturas_venta_proyecto,
+)
+
+
+def _medir(nombre: str, fn, **kwargs):
+    t0 = time.perf_counter()
+    creados = fn(**kwargs) or []
+    dt = time.perf_counter() - t0
+
+    docs_por_seg = round(len(creados) / dt, 2) if dt else None
+    print(f"⏱ {nombre}: {len(creados)} docs en {dt:.1f}s ({docs_por_seg} docs/s)")
+    return {"docs": len(creados), "total_s": round(dt, 3), "docs_por_seg": docs_por_seg}
+
+
+def run(
+    company: str,
+    project_name: str,
+    cuenta_gasto_rem: str | None = None,
+    cuenta_banco: str | None = None,
+    n_pinv: int = 20,
+    n_expense_claims: int = 10,
+    seed: int = 42,
+):
+    """
+    Corre cada creador sobre `project_name` y devuelve
+    {creador: {docs, s, docs_por_seg}}. Los pagos / cobros sólo si se entrega
+    cuenta_banco; las remuneraciones sólo si se entrega cuenta_gasto_rem.
+    """
+
+    resultado = {
+        "pinv": _medir(
+            "crear_pinv_para_proyecto",
+            crear_pinv_para_proyecto,
+            company=company,
+            project_name=project_name,
+            presupuesto_total=200_000_000,
+            n_pinv=n_pinv,
+            seed=seed,
+        ),
+        "sinv": _medir(
+            "crear_facturas_venta_proyecto",
+            crear_facturas_venta_proyecto,
+            project_name=project_name,
+            presupuesto_total=260_000_000,
+            seed=seed,
+        ),
+        "expense_claims": _medir(
+            "crear_expense_claims_para_proyecto",
+            crear_expense_claims_para_proyecto,
+            project_name=project_name,
+            company=company,
+            cantidad=n_expense_claims,
+        ),
+    }
+
+    if cuenta_gasto_rem:
+        resultado["remuneraciones"] = _medir(
+            "crear_remuneraciones_para_proyecto",
+            crear_remuneraciones_para_proyecto,
+            company=company,
+            project_name=project_name,
+            presupuesto_total=120_000_000,
+            cuenta_gasto_rem=cuenta_gasto_rem,
+            seed=seed,
+        )
+
+    if cuenta_banco:
+        resultado["pagos"] = _medir(
+            "crear_pagos_para_proyecto",
+            crear_pagos_para_proyecto,
+            company=company,
+            project_name=project_name,
+            cuenta_banco=cuenta_banco,
+            seed=seed,
+        )
+        resultado["cobros"] = _medir(
+            "crear_cobros_para_proyecto",
+            crear_cobros_para_proyecto,
+            company=company,
+            project_name=project_name,
+            cuenta_banco=cuenta_banco,
+            seed=seed,
+        )
+
+    return resultado
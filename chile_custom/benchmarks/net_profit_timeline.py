@@ -0,0 +1,284 @@
+# File: chile_custom/benchmarks/net_profit_timeline.py
+# ---------------------------------------------------------
+# Benchmark del motor de acumulado + forward fill del reporte
+# "Net Profit Timeline por Cost Center".
+#
+# Genera filas sintéticas (día, cost center, net profit) con semilla fija,
+# verifica que el motor nuevo entrega EXACTAMENTE lo mismo que el algoritmo
+# anterior (en un dataset chico) y mide el tiempo a 2 años × 500 CC.
+#
+# run_execute() mide el execute() completo del reporte (consulta al
+# Net Profit Snapshot + motor + cache) sobre filas sintéticas insertadas en
+# una transacción que se revierte al final. Con por="project" mide el
+# reporte "Net Profit Timeline por Project" (un project por cada CC
+# sintético, p.ej. 300 projects × 3 años).
+#
+# run_payload() compara el tamaño del JSON (bytes, también con gzip) y el
+# tiempo de serialización de la respuesta por filas vs la columnar
+# (utils.timeline.to_columnar).
+#
+# Para ejecutarlo:
+#     bench --site [site] execute chile_custom.benchmarks.net_profit_timeline.run
+#     bench --site [site] execute chile_custom.benchmarks.net_profit_timeline.run_payload
+#     bench --site [site] execute chile_custom.benchmarks.net_profit_timeline.run_execute
+# o sin bench (sólo el motor):
+#     python -m chile_custom.benchmarks.net_profit_timeline
+# ---------------------------------------------------------
+
+import gzip
+import json
+import random
+import time
+from datetime import date
+
+from chile_custom.utils.timeline import build_report, build_timeline, date_range, group_rows, to_columnar
+
+
+def generar_filas(days: int, cost_centers: int, densidad: float = 0.3, seed: int = 42):
+    """
+    Filas como las que devuelve la query del reporte, ordenadas por día.
+    `densidad` = probabilidad de que un CC tenga movimientos un día dado.
+    """
+    rnd = random.Random(seed)
+    start = date(2024, 1, 1)
+    all_dates = date_range(start, date.fromordinal(start.toordinal() + days - 1))
+    ccs = [f"CC{i:04d} - Centro {i} - CH" for i in range(cost_centers)]
+
+    rows = []
+    for d in all_dates:
+        for cc in ccs:
+            if rnd.random() < densidad:
+                rows.append({
+                    "day": d,
+                    "cost_center": cc,
+                    "net_profit": round(rnd.uniform(-5_000_000, 5_000_000), 2),
+                })
+
+    return rows, all_dates
+
+
+def _forward_fill_anterior(data_by_cc: dict, all_dates):
+    """Algoritmo original del reporte (paso 5), sólo para comparar."""
+    acumulados = {}
+    for cc, values in data_by_cc.items():
+        total = 0
+        acumulated = []
+        for d, np in values:
+            total += np
+            acumulated.append((d, total))
+        acumulados[cc] = dict(acumulated)
+
+    series = {cc: [] for cc in acumulados}
+    for d in all_dates:
+        for cc, valores in acumulados.items():
+            if d in valores:
+                series[cc].append(valores[d])
+            else:
+                prev_dates = [x for x in valores.keys() if x < d]
+                if prev_dates:
+                    series[cc].append(valores[max(prev_dates)])
+                else:
+                    series[cc].append(0)
+
+    return series
+
+
+def _medir(fn, *args, repeticiones: int = 3):
+    mejor = None
+    resultado = None
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = fn(*args)
+        dt = time.perf_counter() - t0
+        mejor = dt if mejor is None else min(mejor, dt)
+    return mejor, resultado
+
+
+def run(days: int = 730, cost_centers: int = 500, seed: int = 42):
+    """
+    Ejecuta el benchmark y devuelve un dict con los tiempos (segundos).
+
+    - check_*: dataset chico donde también corre el algoritmo anterior.
+    - engine_s: motor nuevo a tamaño completo (por defecto 2 años × 500 CC).
+    """
+
+    # -------------------------------------------------
+    # 1. Equivalencia con el algoritmo anterior
+    # -------------------------------------------------
+    rows, all_dates = generar_filas(120, 40, seed=seed)
+    data_by_cc = group_rows(rows)
+
+    legacy_s, esperado = _medir(_forward_fill_anterior, data_by_cc, all_dates, repeticiones=1)
+    check_s, obtenido = _medir(build_timeline, data_by_cc, all_dates, repeticiones=1)
+
+    if obtenido != esperado:
+        raise AssertionError("El motor nuevo no coincide con el algoritmo anterior.")
+
+    # -------------------------------------------------
+    # 2. Tamaño completo
+    # -------------------------------------------------
+    rows, all_dates = generar_filas(days, cost_centers, seed=seed)
+    data_by_cc = group_rows(rows)
+    engine_s, _ = _medir(build_timeline, data_by_cc, all_dates)
+
+    resultado = {
+        "days": days,
+        "cost_centers": cost_centers,
+        "rows": len(rows),
+        "check_legacy_s": round(legacy_s, 6),
+        "check_engine_s": round(check_s, 6),
+        "engine_s": round(engine_s, 6),
+    }
+
+    print(f"✔ Motor equivalente al algoritmo anterior (120 días × 40 CC): "
+          f"anterior {legacy_s:.3f}s vs nuevo {check_s:.4f}s")
+    print(f"⏱ {days} días × {cost_centers} CC ({len(rows):,} filas): {engine_s:.3f}s")
+
+    return resultado
+
+
+def run_payload(days: int = 730, cost_centers: int = 100, seed: int = 42):
+    """
+    Bytes en la respuesta y tiempo de serialización JSON del resultado del
+    reporte (`days` × `cost_centers`): filas (un dict por fecha) vs columnar
+    (fechas + un arreglo por cost center). Verifica que ambos formatos
+    traen los mismos valores.
+    """
+
+    rows, all_dates = generar_filas(days, cost_centers, seed=seed)
+    columns, data = build_report(rows, all_dates, "cost_center")
+
+    def serializar(payload):
+        # mismo criterio que la respuesta de frappe (fechas como string)
+        return json.dumps(payload, default=str, separators=(",", ":"))
+
+    filas_s, filas_json = _medir(serializar, {"columns": columns, "result": data})
+    columnar_s, columnar_json = _medir(serializar, {"columns": columns, "result": to_columnar(columns, data)})
+    conversion_s, columnar = _medir(to_columnar, columns, data)
+
+    # -------------------------------------------------
+    # Equivalencia: cada serie columnar = la columna de las filas
+    # -------------------------------------------------
+    for serie in columnar["series"]:
+        if serie["values"] != [row[serie["fieldname"]] for row in data]:
+            raise AssertionError(f"La serie {serie['fieldname']} no coincide con las filas.")
+
+    filas_bytes = len(filas_json.encode("utf-8"))
+    columnar_bytes = len(columnar_json.encode("utf-8"))
+    filas_gzip = len(gzip.compress(filas_json.encode("utf-8")))
+    columnar_gzip = len(gzip.compress(columnar_json.encode("utf-8")))
+
+    resultado = {
+        "days": days,
+        "cost_centers": cost_centers,
+        "filas_bytes": filas_bytes,
+        "columnar_bytes": columnar_bytes,
+        "filas_gzip_bytes": filas_gzip,
+        "columnar_gzip_bytes": columnar_gzip,
+        "filas_serializar_s": round(filas_s, 6),
+        "columnar_serializar_s": round(columnar_s, 6),
+        "columnar_conversion_s": round(conversion_s, 6),
+    }
+
+    print(f"📦 {days} días × {cost_centers} CC: filas {filas_bytes / 1e6:.2f} MB "
+          f"({filas_gzip / 1e3:.0f} KB gzip) vs columnar {columnar_bytes / 1e6:.2f} MB "
+          f"({columnar_gzip / 1e3:.0f} KB gzip)")
+    print(f"⏱ json.dumps: filas {filas_s * 1000:.1f} ms vs columnar {columnar_s * 1000:.1f} ms "
+          f"(+ conversión {conversion_s * 1000:.1f} ms)")
+
+    return resultado
+
+
+def run_execute(
+    days: int = 730,
+    cost_centers: int = 100,
+    seed: int = 42,
+    por: str = "cost_center",
+    granularities: tuple = ("day", "week", "month"),
+):
+    """
+    Mide execute() del reporte en frío (sin cache) y en caliente (cache hit)
+    con `days` × `cost_centers` filas sintéticas en el snapshot. Requiere BD;
+    hace ROLLBACK al final.
+
+    por="project" mide el reporte por Project: cada fila sintética lleva
+    además un project (uno por cost center).
+
+    Se mide cada granularidad de `granularities` (filas devueltas y tiempos),
+    para ver cuánto achica el resultado agrupar por semana / mes.
+    """
+
+    # frappe sólo se importa aquí: run() debe poder correr sin bench
+    import frappe
+
+    from chile_custom.chile_custom.doctype.net_profit_snapshot.net_profit_snapshot import snapshot_name
+    from chile_custom.chile_custom.report.net_profit_timeline_por_cost_center import (
+        net_profit_timeline_por_cost_center,
+    )
+    from chile_custom.chile_custom.report.net_profit_timeline_por_project import (
+        net_profit_timeline_por_project,
+    )
+
+    if por not in ("cost_center", "project"):
+        raise ValueError(f"por inválido: {por}. Use 'cost_center' o 'project'.")
+
+    reporte = net_profit_timeline_por_project if por == "project" else net_profit_timeline_por_cost_center
+    # clear_cache vive en el reporte por Cost Center (namespace compartido)
+    clear_cache = net_profit_timeline_por_cost_center.clear_cache
+
+    company = "BENCH Company"
+    rows, all_dates = generar_filas(days, cost_centers, seed=seed)
+    filters = {"from_date": all_dates[0], "to_date": all_dates[-1], "company": company}
+
+    timestamp = frappe.utils.now()
+    user = frappe.session.user
+    values = []
+    for r in rows:
+        project = f"BENCH-{r['cost_center'][:6]}" if por == "project" else None
+        values.append((
+            snapshot_name(company, r["cost_center"], r["day"], project),
+            timestamp, timestamp, user, user, 0, 0,
+            company, r["cost_center"], project, r["day"], r["net_profit"],
+        ))
+
+    resultado = {"por": por, "days": days, "cost_centers": cost_centers, "rows": len(rows)}
+
+    try:
+        frappe.db.bulk_insert(
+            "Net Profit Snapshot",
+            fields=[
+                "name", "creation", "modified", "modified_by", "owner", "docstatus", "idx",
+                "company", "cost_center", "project", "posting_date", "net_profit",
+            ],
+            values=values,
+            chunk_size=10_000,
+        )
+
+        for granularity in granularities:
+            filters["granularity"] = granularity
+
+            def frio():
+                clear_cache()
+                return reporte.execute(filters)
+
+            frio_s, (columns, data, _, chart) = _medir(frio)
+            caliente_s, _ = _medir(reporte.execute, filters)
+
+            resultado[granularity] = {
+                "columns": len(columns),
+                "data_rows": len(data),
+                "chart_points": len(chart["data"]["labels"]) if chart else 0,
+                "execute_frio_s": round(frio_s, 6),
+                "execute_caliente_s": round(caliente_s, 6),
+            }
+            print(f"⏱ execute() por {por} ({granularity}), {days} días × {cost_centers} grupos: "
+                  f"{len(data)} filas, frío {frio_s:.3f}s, caliente {caliente_s * 1000:.1f} ms")
+    finally:
+        frappe.db.rollback()
+        clear_cache()
+
+    return resultado
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,110 @@
+# File: chile_custom/benchmarks/pinv_por_fecha.py
+# ---------------------------------------------------------
+# Benchmark de facturas_pinv_por_fecha (paginación keyset).
+#
+# Inserta N Purchase Invoice sintéticas (sólo las columnas que usa la
+# consulta) dentro de una transacción, mide la primera página, una página
+# filtrada por proveedor y el recorrido completo del rango con
+# iter_facturas_pinv_por_fecha, y hace ROLLBACK al final (no deja datos).
+#
+# Para ejecutarlo (requiere BD):
+#     bench --site [site] execute chile_custom.benchmarks.pinv_por_fecha.run
+#     bench --site [site] execute chile_custom.benchmarks.pinv_por_fecha.run --kwargs "{'n_facturas': 1000000}"
+# ---------------------------------------------------------
+
+import random
+import time
+from datetime import date, timedelta
+
+import frappe
+
+from chile_custom.api import facturas_pinv_por_fecha, iter_facturas_pinv_por_fecha
+
+BENCH_PREFIX = "BENCH"
+
+
+def generar_facturas(n_facturas: int, n_suppliers: int = 500, dias: int = 3 * 365, seed: int = 42):
+    """Filas (name, posting_date, supplier, grand_total, docstatus)."""
+    rnd = random.Random(seed)
+    start = date(2023, 1, 1)
+    suppliers = [f"{BENCH_PREFIX} Supplier {i:04d}" for i in range(n_suppliers)]
+
+    filas = []
+    for i in range(n_facturas):
+        filas.append((
+            f"{BENCH_PREFIX}-PINV-{i:08d}",
+            start + timedelta(days=rnd.randrange(dias)),
+            rnd.choice(suppliers),
+            round(rnd.uniform(50_000, 20_000_000), 2),
+            1 if rnd.random() < 0.95 else 2,
+        ))
+
+    return filas, start, start + timedelta(days=dias - 1)
+
+
+def _insertar(filas):
+    timestamp = frappe.utils.now()
+    user = frappe.session.user
+    values = [
+        (name, timestamp, timestamp, user, user, docstatus, 0,
+         f"{BENCH_PREFIX} Company", supplier, posting_date, posting_date, grand_total, grand_total)
+        for name, posting_date, supplier, grand_total, docstatus in filas
+    ]
+    frappe.db.bulk_insert(
+        "Purchase Invoice",
+        fields=[
+            "name", "creation", "modified", "modified_by", "owner", "docstatus", "idx",
+            "company", "supplier", "posting_date", "due_date", "grand_total", "outstanding_amount",
+        ],
+        values=values,
+        chunk_size=10_000,
+    )
+
+
+def _medir(fn, repeticiones: int = 3):
+    mejor = None
+    resultado = None
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = fn()
+        dt = time.perf_counter() - t0
+        mejor = dt if mejor is None else min(mejor, dt)
+    return mejor, resultado
+
+
+def run(n_facturas: int = 100_000, repeticiones: int = 3, seed: int = 42):
+    """Devuelve tiempos (ms) de primera página, página por proveedor y rango completo."""
+
+    filas, desde, hasta = generar_facturas(n_facturas, seed=seed)
+    supplier = filas[0][2]
+    resultado = {"n_facturas": n_facturas}
+
+    try:
+        _insertar(filas)
+
+        pagina_s, pagina = _medir(
+            lambda: facturas_pinv_por_fecha(desde, hasta), repeticiones
+        )
+        supplier_s, _ = _medir(
+            lambda: facturas_pinv_por_fecha(desde, hasta, supplier=supplier), repeticiones
+        )
+        completo_s, total = _medir(
+            lambda: sum(len(b) for b in iter_facturas_pinv_por_fecha(desde, hasta, chunk_size=5000)),
+            1,
+        )
+
+        resultado.update({
+            "primera_pagina_ms": round(pagina_s * 1000, 2),
+            "pagina_supplier_ms": round(supplier_s * 1000, 2),
+            "rango_completo_s": round(completo_s, 4),
+            "rango_completo_filas": total,
+            "rango_completo_filas_por_seg": round(total / completo_s) if completo_s else None,
+        })
+
+        print(f"⏱ primera página ({len(pagina)} filas): {pagina_s * 1000:.1f} ms, "
+              f"por proveedor: {supplier_s * 1000:.1f} ms, "
+              f"rango completo ({total:,} filas): {completo_s:.2f}s")
+    finally:
+        frappe.db.rollback()
+
+    return resultado
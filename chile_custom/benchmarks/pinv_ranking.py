@@ -0,0 +1,170 @@
+# File: chile_custom/benchmarks/pinv_ranking.py
+# ---------------------------------------------------------
+# Benchmark de ranking_proveedores_pinv sobre los agregados mensuales
+# Supplier PINV Monthly / Supplier PINV Project Monthly.
+#
+# Genera un dataset sintético equivalente a N facturas (por defecto 1M),
+# ya agregado por (company, mes, supplier) y (company, mes, supplier,
+# project), lo inserta dentro de una transacción, mide varias consultas de
+# ranking (objetivo: < 100 ms) y hace ROLLBACK al final (no deja datos).
+#
+# Las consultas usan rangos de meses completos: los días sueltos de rangos
+# parciales se leen de tabPurchase Invoice, que este benchmark no llena.
+#
+# Para ejecutarlo (requiere BD):
+#     bench --site [site] execute chile_custom.benchmarks.pinv_ranking.run
+#     bench --site [site] execute chile_custom.benchmarks.pinv_ranking.run --kwargs "{'n_facturas': 100000}"
+# ---------------------------------------------------------
+
+import random
+import time
+from datetime import date, timedelta
+
+import frappe
+
+from chile_custom.chile_custom.doctype.supplier_pinv_monthly.supplier_pinv_monthly import (
+    _query_ranking,
+    monthly_name,
+)
+
+BENCH_PREFIX = "BENCH"
+
+
+def generar_dataset(
+    n_facturas: int = 1_000_000,
+    n_suppliers: int = 2_000,
+    n_projects: int = 60,
+    n_companies: int = 2,
+    n_groups: int = 8,
+    dias: int = 3 * 365,
+    seed: int = 42,
+) -> tuple[list[tuple], list[tuple]]:
+    """
+    Resume n_facturas facturas aleatorias en dos listas de filas:
+        - mensuales: (company, month, supplier, supplier_group, total_facturas, monto_total)
+        - por proyecto: (company, month, supplier, supplier_group, project, total_facturas, monto_total)
+    """
+    rnd = random.Random(seed)
+    start = date(2023, 1, 1)
+
+    companies = [f"{BENCH_PREFIX} Company {i}" for i in range(n_companies)]
+    suppliers = [f"{BENCH_PREFIX} Supplier {i:05d}" for i in range(n_suppliers)]
+    groups = {s: f"{BENCH_PREFIX} Group {rnd.randrange(n_groups)}" for s in suppliers}
+    projects = [f"{BENCH_PREFIX}-PROJ-{i:04d}" for i in range(n_projects)] + [None]
+
+    # Pocos proveedores concentran muchas facturas (distribución tipo Pareto)
+    pesos = [1 / (i + 1) for i in range(n_suppliers)]
+
+    mensual = {}
+    por_proyecto = {}
+    elegidos = rnd.choices(suppliers, weights=pesos, k=n_facturas)
+    for supplier in elegidos:
+        company = rnd.choice(companies)
+        month = (start + timedelta(days=rnd.randrange(dias))).replace(day=1)
+        project = rnd.choice(projects)
+        monto = rnd.uniform(50_000, 20_000_000)
+
+        key = (company, month, supplier)
+        count, total = mensual.get(key, (0, 0.0))
+        mensual[key] = (count + 1, total + monto)
+
+        if project:
+            key = (company, month, supplier, project)
+            count, total = por_proyecto.get(key, (0, 0.0))
+            por_proyecto[key] = (count + 1, total + monto)
+
+    return (
+        [
+            (company, month, supplier, groups[supplier], count, round(total, 2))
+            for (company, month, supplier), (count, total) in mensual.items()
+        ],
+        [
+            (company, month, supplier, groups[supplier], project, count, round(total, 2))
+            for (company, month, supplier, project), (count, total) in por_proyecto.items()
+        ],
+    )
+
+
+def _insertar(mensual, por_proyecto):
+    timestamp = frappe.utils.now()
+    user = frappe.session.user
+    meta = ["name", "creation", "modified", "modified_by", "owner", "docstatus", "idx"]
+
+    frappe.db.bulk_insert(
+        "Supplier PINV Monthly",
+        fields=[*meta, "company", "month", "supplier", "supplier_group", "total_facturas", "monto_total"],
+        values=[
+            (monthly_name(c, d, s), timestamp, timestamp, user, user, 0, 0, c, d, s, g, n, m)
+            for c, d, s, g, n, m in mensual
+        ],
+        chunk_size=10_000,
+    )
+    frappe.db.bulk_insert(
+        "Supplier PINV Project Monthly",
+        fields=[*meta, "company", "month", "supplier", "supplier_group", "project", "total_facturas", "monto_total"],
+        values=[
+            (monthly_name(c, d, s, p), timestamp, timestamp, user, user, 0, 0, c, d, s, g, p, n, m)
+            for c, d, s, g, p, n, m in por_proyecto
+        ],
+        chunk_size=10_000,
+    )
+
+
+def run(n_facturas: int = 1_000_000, repeticiones: int = 5, seed: int = 42):
+    """
+    Devuelve {consulta: mejor tiempo en ms} para varios filtros del ranking,
+    más la cantidad de filas de cada agregado (y de la company / proyecto
+    filtrados), que es lo que recorre cada consulta.
+    """
+
+    t0 = time.perf_counter()
+    mensual, por_proyecto = generar_dataset(n_facturas, seed=seed)
+    print(f"🧪 Dataset: {n_facturas:,} facturas → {len(mensual):,} filas mensuales + "
+          f"{len(por_proyecto):,} por proyecto ({time.perf_counter() - t0:.1f}s)")
+
+    company = f"{BENCH_PREFIX} Company 0"
+    consultas = {
+        "top10_count_company": dict(company=company),
+        "top10_amount_company_1y": dict(company=company, from_date=date(2024, 1, 1), to_date=date(2024, 12, 31)),
+        "top10_count_project": dict(project=f"{BENCH_PREFIX}-PROJ-0007"),
+        "top25_amount_group_q": dict(
+            supplier_group=f"{BENCH_PREFIX} Group 3", from_date=date(2025, 1, 1), to_date=date(2025, 3, 31)
+        ),
+    }
+
+    resultado = {
+        "n_facturas": n_facturas,
+        "filas_mensual": len(mensual),
+        "filas_por_proyecto": len(por_proyecto),
+        "filas_mensual_company": sum(1 for f in mensual if f[0] == company),
+        "filas_por_proyecto_filtro": sum(1 for f in por_proyecto if f[4] == consultas["top10_count_project"]["project"]),
+    }
+
+    try:
+        _insertar(mensual, por_proyecto)
+
+        for nombre, filtros in consultas.items():
+            top_n = 25 if nombre.startswith("top25") else 10
+            order_by = "amount" if "amount" in nombre else "count"
+
+            mejor = None
+            for _ in range(repeticiones):
+                t = time.perf_counter()
+                _query_ranking(
+                    top_n,
+                    order_by,
+                    filtros.get("company"),
+                    filtros.get("from_date"),
+                    filtros.get("to_date"),
+                    filtros.get("project"),
+                    filtros.get("supplier_group"),
+                )
+                dt = time.perf_counter() - t
+                mejor = dt if mejor is None else min(mejor, dt)
+
+            resultado[f"{nombre}_ms"] = round(mejor * 1000, 2)
+            print(f"{'✔' if mejor < 0.1 else '⚠️'} {nombre}: {mejor * 1000:.1f} ms (objetivo < 100 ms)")
+    finally:
+        frappe.db.rollback()
+
+    return resultado
@@ -0,0 +1,106 @@
+# File: chile_custom/benchmarks/regiones.py
+# ---------------------------------------------------------
+# Benchmark de get_region_from_comuna (índice precalculado en
+# chile_custom.utils.regiones) versus la búsqueda lineal original sobre
+# chile_custom.constants.regiones.
+#
+# Verifica que ambos den lo mismo para las comunas escritas tal cual y mide
+# comunas por segundo con entradas mixtas (mayúsculas, sin tildes, espacios
+# extra y algunas inexistentes).
+#
+# Para ejecutarlo:
+#     bench --site [site] execute chile_custom.benchmarks.regiones.run
+# ---------------------------------------------------------
+
+import random
+import time
+import unicodedata
+
+from chile_custom.constants.regiones import regiones
+from chile_custom.utils.regiones import get_region_from_comuna
+
+
+def _region_lineal(comuna):
+    """Implementación original de api.get_region_from_comuna (referencia)."""
+    for r in regiones:
+        if comuna in r["comunas"]:
+            return {
+                "region": r["region"],
+                "numero": r["numero"]
+            }
+    return {}
+
+
+def _sin_tildes(texto: str) -> str:
+    texto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def generar_comunas(n: int, porcentaje_desconocidas: float = 0.05, seed: int = 42) -> list[str]:
+    """Comunas con variantes de escritura como las que llegan desde formularios."""
+    rnd = random.Random(seed)
+    comunas = [c for r in regiones for c in r["comunas"]]
+    salida = []
+
+    for _ in range(n):
+        if rnd.random() < porcentaje_desconocidas:
+            salida.append(f"Comuna Inexistente {rnd.randint(1, 999)}")
+            continue
+
+        comuna = rnd.choice(comunas)
+        formato = rnd.random()
+        if formato < 0.5:
+            salida.append(comuna)
+        elif formato < 0.7:
+            salida.append(comuna.upper())
+        elif formato < 0.9:
+            salida.append(_sin_tildes(comuna).lower())
+        else:
+            salida.append(f"  {comuna}  ")
+
+    return salida
+
+
+def _medir(fn, entradas, repeticiones: int = 3):
+    mejor = None
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        for comuna in entradas:
+            fn(comuna)
+        dt = time.perf_counter() - t0
+        mejor = dt if mejor is None else min(mejor, dt)
+    return mejor
+
+
+def run(n: int = 100_000, seed: int = 42):
+    """Devuelve tiempos (segundos) y comunas por segundo de ambos caminos."""
+
+    # -------------------------------------------------
+    # 1. Equivalencia con la búsqueda original (comunas exactas)
+    # -------------------------------------------------
+    for r in regiones:
+        for comuna in r["comunas"]:
+            if get_region_from_comuna(comuna) != _region_lineal(comuna):
+                raise AssertionError(f"get_region_from_comuna no coincide para '{comuna}'.")
+
+    # -------------------------------------------------
+    # 2. Throughput con entradas mixtas
+    # -------------------------------------------------
+    comunas = generar_comunas(n, seed=seed)
+
+    lineal_s = _medir(_region_lineal, comunas)
+    indice_s = _medir(get_region_from_comuna, comunas)
+
+    resultado = {
+        "n": n,
+        "no_encontradas": sum(1 for c in comunas if not get_region_from_comuna(c)),
+        "lineal_s": round(lineal_s, 6),
+        "indice_s": round(indice_s, 6),
+        "lineal_comunas_por_seg": round(n / lineal_s),
+        "indice_comunas_por_seg": round(n / indice_s),
+    }
+
+    print(f"⏱ {n:,} comunas — lineal: {resultado['lineal_comunas_por_seg']:,}/s, "
+          f"índice: {resultado['indice_comunas_por_seg']:,}/s")
+
+    return resultado
@@ -0,0 +1,174 @@
+# File: chile_custom/benchmarks/rut.py
+# ---------------------------------------------------------
+# Benchmark de validación de RUT:
+#   - run():    camino escalar (normalize_rut con try/except por fila, como
+#               en los validate hooks) vs batch (normalize_ruts).
+#   - run_dv(): calculate_dv vs las 3 implementaciones anteriores del DV
+#               (utils/rut, employee_creator, customer_creator). La
+#               equivalencia entre todas la verifica tests/test_rut.py.
+#
+# Para ejecutarlo:
+#     bench --site [site] execute chile_custom.benchmarks.rut.run
+#     bench --site [site] execute chile_custom.benchmarks.rut.run_dv
+# ---------------------------------------------------------
+
+import random
+import time
+
+from chile_custom.utils.rut import _normalize, calculate_dv, normalize_rut, normalize_ruts
+
+
+def generar_ruts(n: int, porcentaje_invalidos: float = 0.05, seed: int = 42) -> list[str]:
+    """RUTs en formatos mixtos (con/sin puntos, con/sin guion, dv en minúscula)."""
+    rnd = random.Random(seed)
+    ruts = []
+
+    for _ in range(n):
+        cuerpo = str(rnd.randint(1_000_000, 99_999_999))
+        dv = calculate_dv(cuerpo)
+
+        if rnd.random() < porcentaje_invalidos:
+            dv = "0" if dv != "0" else "1"
+
+        formato = rnd.random()
+        if formato < 0.4:
+            con_puntos = f"{int(cuerpo):,}".replace(",", ".")
+            ruts.append(f"{con_puntos}-{dv.lower()}")
+        elif formato < 0.8:
+            ruts.append(f"{cuerpo}-{dv}")
+        else:
+            ruts.append(f" {cuerpo}{dv} ")
+
+    return ruts
+
+
+# ---------------------------------------------------------
+# Implementaciones anteriores del DV (referencia)
+# ---------------------------------------------------------
+
+def _dv_utils_rut(cuerpo) -> str:
+    suma = 0
+    factor = 2
+    for c in reversed(str(cuerpo)):
+        suma += int(c) * factor
+        factor = 2 if factor == 7 else factor + 1
+    dv = 11 - (suma % 11)
+    if dv == 11:
+        return "0"
+    if dv == 10:
+        return "K"
+    return str(dv)
+
+
+def _dv_employee_creator(number) -> str:
+    s = 0
+    multiplier = 2
+    for d in reversed(str(number)):
+        s += int(d) * multiplier
+        multiplier += 1
+        if multiplier > 7:
+            multiplier = 2
+    remainder = 11 - (s % 11)
+    if remainder == 11:
+        return "0"
+    if remainder == 10:
+        return "K"
+    return str(remainder)
+
+
+def _dv_customer_creator(rut) -> str:
+    rut = str(rut)
+    reversed_digits = map(int, reversed(rut))
+    factors = [2, 3, 4, 5, 6, 7]
+    s = sum(d * factors[i % 6] for i, d in enumerate(reversed_digits))
+    dv = 11 - (s % 11)
+    if dv == 11:
+        return "0"
+    if dv == 10:
+        return "K"
+    return str(dv)
+
+
+def _escalar(ruts):
+    valores = []
+    errores = []
+    for rut in ruts:
+        try:
+            valores.append(normalize_rut(rut))
+            errores.append(None)
+        except Exception as e:
+            valores.append(None)
+            errores.append(str(e))
+    return valores, errores
+
+
+def _medir(fn, *args, repeticiones: int = 3, setup=None):
+    mejor = None
+    resultado = None
+    for _ in range(repeticiones):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        resultado = fn(*args)
+        dt = time.perf_counter() - t0
+        mejor = dt if mejor is None else min(mejor, dt)
+    return mejor, resultado
+
+
+def run(n: int = 50_000, seed: int = 42):
+    """Devuelve tiempos (s) y throughput (RUT/s) de ambos caminos."""
+    ruts = generar_ruts(n, seed=seed)
+
+    # sin memo: se limpia el cache antes de cada repetición
+    clear = _normalize.cache_clear
+    escalar_s, (valores_escalar, _) = _medir(_escalar, ruts, setup=clear)
+    batch_s, (valores_batch, errores_batch) = _medir(normalize_ruts, ruts, setup=clear)
+
+    if valores_escalar != valores_batch:
+        raise AssertionError("normalize_ruts no coincide con normalize_rut.")
+
+    # import típico: pocos RUTs distintos repetidos muchas veces
+    rnd = random.Random(seed)
+    repetidos = [rnd.choice(ruts[: max(1, n // 50)]) for _ in range(n)]
+    memo_s, _ = _medir(normalize_ruts, repetidos, setup=clear)
+
+    resultado = {
+        "n": n,
+        "invalidos": sum(1 for e in errores_batch if e),
+        "escalar_s": round(escalar_s, 6),
+        "batch_s": round(batch_s, 6),
+        "batch_repetidos_s": round(memo_s, 6),
+        "escalar_ruts_por_seg": round(n / escalar_s),
+        "batch_ruts_por_seg": round(n / batch_s),
+        "batch_repetidos_ruts_por_seg": round(n / memo_s),
+    }
+
+    print(f"⏱ {n:,} RUTs — escalar: {resultado['escalar_ruts_por_seg']:,} RUT/s, "
+          f"batch: {resultado['batch_ruts_por_seg']:,} RUT/s, "
+          f"batch con repetidos: {resultado['batch_repetidos_ruts_por_seg']:,} RUT/s")
+
+    return resultado
+
+
+def run_dv(n: int = 200_000, seed: int = 42):
+    """Microbenchmark del DV: calculate_dv vs las 3 implementaciones anteriores."""
+    rnd = random.Random(seed)
+    cuerpos = [str(rnd.randint(1_000_000, 99_999_999)) for _ in range(n)]
+
+    def _todos(fn):
+        return [fn(c) for c in cuerpos]
+
+    tiempos = {
+        "utils_rut_anterior_s": _medir(_todos, _dv_utils_rut)[0],
+        "employee_creator_anterior_s": _medir(_todos, _dv_employee_creator)[0],
+        "customer_creator_anterior_s": _medir(_todos, _dv_customer_creator)[0],
+        "calculate_dv_s": _medir(_todos, calculate_dv)[0],
+    }
+
+    resultado = {"n": n}
+    resultado.update({k: round(v, 6) for k, v in tiempos.items()})
+
+    for nombre, t in tiempos.items():
+        print(f"⏱ {nombre}: {n / t:,.0f} DV/s")
+
+    return resultado
@@ -0,0 +1,192 @@
+# File: chile_custom/benchmarks/suite.py
+# ---------------------------------------------------------
+# Suite de benchmarks de los caminos críticos de chile_custom, con datasets
+# sintéticos de semilla fija en tres tamaños (small / medium / large) y
+# salida JSON para seguir regresiones entre versiones.
+#
+# Cubre:
+#   - normalize_rut / normalize_ruts             (benchmarks.rut)
+#   - get_region_from_comuna                     (benchmarks.regiones)
+#   - motor del Net Profit Timeline              (benchmarks.net_profit_timeline.run)
+#   - JSON filas vs columnar del Net Profit Timeline (benchmarks.net_profit_timeline.run_payload)
+#   - execute() del Net Profit Timeline          (benchmarks.net_profit_timeline.run_execute) *
+#   - execute() del Net Profit Timeline por Project (run_execute(por="project")) *
+#   - facturas_pinv_por_fecha                    (benchmarks.pinv_por_fecha) *
+#   - ranking_proveedores_pinv                   (benchmarks.pinv_ranking) *
+#   - docs/s de los creadores demo               (benchmarks.creadores) **
+#
+#   *  requieren BD; insertan datos sintéticos y hacen ROLLBACK
+#   ** sólo si se entrega company + project_name; DEJAN los documentos creados
+#
+# Para ejecutarlo:
+#     bench --site [site] execute chile_custom.benchmarks.suite.run --kwargs "{'size': 'medium', 'output': '/tmp/bench_medium.json'}"
+#
+# Comparar contra una corrida anterior:
+#     bench --site [site] execute chile_custom.benchmarks.suite.comparar --kwargs "{'base': '/tmp/bench_v1.json', 'actual': '/tmp/bench_v2.json'}"
+# ---------------------------------------------------------
+
+import json
+import platform
+from datetime import datetime
+
+# Tamaño de cada dataset sintético
+SIZES = {
+    "small": {
+        "ruts": 10_000,
+        "comunas": 10_000,
+        "timeline": {"days": 90, "cost_centers": 20},
+        "timeline_execute": {"days": 90, "cost_centers": 20},
+        "timeline_project": {"days": 90, "cost_centers": 20},
+        "pinv_por_fecha": 10_000,
+        "pinv_ranking": 50_000,
+    },
+    "medium": {
+        "ruts": 50_000,
+        "comunas": 100_000,
+        "timeline": {"days": 730, "cost_centers": 100},
+        "timeline_execute": {"days": 730, "cost_centers": 100},
+        "timeline_project": {"days": 730, "cost_centers": 100},
+        "pinv_por_fecha": 100_000,
+        "pinv_ranking": 250_000,
+    },
+    "large": {
+        "ruts": 200_000,
+        "comunas": 500_000,
+        "timeline": {"days": 1095, "cost_centers": 500},
+        "timeline_execute": {"days": 1095, "cost_centers": 300},
+        "timeline_project": {"days": 1095, "cost_centers": 300},
+        "pinv_por_fecha": 1_000_000,
+        "pinv_ranking": 1_000_000,
+    },
+}
+
+# Métricas que compara comparar(). Throughput (mayor es mejor) se revisa
+# antes que tiempo (menor es mejor): "_por_s" (nombre antiguo de
+# "_por_seg", en JSON de corridas previas) también termina en "_s".
+SUFIJOS_THROUGHPUT = ("_por_seg", "_por_s")
+SUFIJOS_TIEMPO = ("_s", "_ms")
+
+
+def run(
+    size: str = "small",
+    output: str | None = None,
+    seed: int = 42,
+    con_bd: bool = True,
+    company: str | None = None,
+    project_name: str | None = None,
+    cuenta_gasto_rem: str | None = None,
+    cuenta_banco: str | None = None,
+):
+    """
+    Corre la suite y devuelve {size, seed, fecha, python, resultados}.
+    Si se entrega `output`, además lo escribe como JSON.
+    """
+
+    # sólo run() necesita frappe: comparar() funciona sin un site
+    import frappe
+
+    from chile_custom.benchmarks import creadores, net_profit_timeline, pinv_por_fecha, pinv_ranking, regiones, rut
+
+    if size not in SIZES:
+        frappe.throw(f"Tamaño inválido: {size}. Use uno de {', '.join(SIZES)}.")
+
+    cfg = SIZES[size]
+    resultados = {}
+
+    print(f"\n🧪 Suite de benchmarks ({size}, seed={seed})")
+
+    resultados["rut"] = rut.run(n=cfg["ruts"], seed=seed)
+    resultados["regiones"] = regiones.run(n=cfg["comunas"], seed=seed)
+    resultados["net_profit_timeline"] = net_profit_timeline.run(seed=seed, **cfg["timeline"])
+    resultados["net_profit_timeline_payload"] = net_profit_timeline.run_payload(seed=seed, **cfg["timeline"])
+
+    if con_bd:
+        resultados["net_profit_timeline_execute"] = net_profit_timeline.run_execute(
+            seed=seed, **cfg["timeline_execute"]
+        )
+        resultados["net_profit_timeline_project"] = net_profit_timeline.run_execute(
+            seed=seed, por="project", **cfg["timeline_project"]
+        )
+        resultados["pinv_por_fecha"] = pinv_por_fecha.run(n_facturas=cfg["pinv_por_fecha"], seed=seed)
+        resultados["pinv_ranking"] = pinv_ranking.run(n_facturas=cfg["pinv_ranking"], seed=seed)
+
+        if company and project_name:
+            resultados["creadores"] = creadores.run(
+                company,
+                project_name,
+                cuenta_gasto_rem=cuenta_gasto_rem,
+                cuenta_banco=cuenta_banco,
+                seed=seed,
+            )
+
+    reporte = {
+        "size": size,
+        "seed": seed,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "resultados": resultados,
+    }
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, indent=2, ensure_ascii=False, default=str)
+        print(f"✔ Resultados guardados en {output}")
+
+    return reporte
+
+
+def comparar(base: str, actual: str, tolerancia: float = 0.20):
+    """
+    Compara dos JSON de run() y lista las métricas que empeoraron más de
+    `tolerancia` (20% por defecto): tiempos que subieron o throughput que
+    bajó. Devuelve la lista de regresiones.
+    """
+
+    with open(base, encoding="utf-8") as f:
+        base_res = json.load(f)["resultados"]
+    with open(actual, encoding="utf-8") as f:
+        actual_res = json.load(f)["resultados"]
+
+    regresiones = []
+
+    for bench, metricas in actual_res.items():
+        anteriores = {nombre: valor for nombre, valor, _ in _metricas(base_res.get(bench, {}))}
+
+        for metrica, valor, mayor_es_mejor in _metricas(metricas):
+            anterior = anteriores.get(metrica)
+            if not anterior or valor is None:
+                continue
+
+            cambio = (valor - anterior) / anterior
+            empeoro = -cambio if mayor_es_mejor else cambio
+            if empeoro > tolerancia:
+                regresiones.append({
+                    "benchmark": bench,
+                    "metrica": metrica,
+                    "base": anterior,
+                    "actual": valor,
+                    "cambio": round(cambio, 3),
+                })
+                print(f"⚠️ {bench}.{metrica}: {anterior} → {valor} ({cambio:+.0%})")
+
+    if not regresiones:
+        print("✔ Sin regresiones.")
+
+    return regresiones
+
+
+def _metricas(metricas: dict, prefijo: str = ""):
+    """
+    (nombre, valor, mayor_es_mejor) de las métricas de throughput y de
+    tiempo, aplanando dicts anidados.
+    """
+    for clave, valor in metricas.items():
+        nombre = f"{prefijo}{clave}"
+        if isinstance(valor, dict):
+            yield from _metricas(valor, f"{nombre}.")
+        elif not isinstance(valor, (int, float)) or isinstance(valor, bool):
+            continue
+        elif nombre.endswith(SUFIJOS_THROUGHPUT):
+            yield nombre, valor, True
+        elif nombre.endswith(SUFIJOS_TIEMPO):
+            yield nombre, valor, False
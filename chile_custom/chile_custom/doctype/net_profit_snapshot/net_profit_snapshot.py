@@ -0,0 +1,278 @@
+# File: chile_custom/chile_custom/doctype/net_profit_snapshot/net_profit_snapshot.py
+# ---------------------------------------------------------
+# Snapshot diario de net profit por (company, cost_center, project, posting_date).
+#
+# Se mantiene de forma incremental desde el on_submit de GL Entry (ver
+# hooks.py) y lo leen los reportes "Net Profit Timeline por Cost Center" y
+# "Net Profit Timeline por Project", que así no re-agregan tabGL Entry.
+#
+# ERPNext no cancela GL Entries: al cancelar un documento somete GL Entries
+# inversos, que pasan por el mismo on_submit. Los reposts (repost_gl_entries,
+# Repost Item Valuation) en cambio BORRAN GL Entries con SQL directo antes
+# de someter los nuevos, sin ningún hook: esas diferencias las corrige
+# reconcile_net_profit_snapshot (diario, ver scheduler_events en hooks.py),
+# que compara el snapshot con tabGL Entry por (company, cost center, mes) y
+# reconstruye sólo los meses que no cuadran.
+#
+# Reconstrucción completa (o por company / rango de fechas):
+#     bench --site [site] execute chile_custom.chile_custom.doctype.net_profit_snapshot.net_profit_snapshot.rebuild_net_profit_snapshot
+#
+# Conciliación a pedido (p.ej. después de un repost):
+#     bench --site [site] execute chile_custom.chile_custom.doctype.net_profit_snapshot.net_profit_snapshot.reconcile_net_profit_snapshot --kwargs "{'company': '...', 'from_date': '2024-01-01'}"
+# ---------------------------------------------------------
+
+import hashlib
+from datetime import timedelta
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt, getdate, now
+
+from chile_custom.chile_custom.report.net_profit_timeline_por_cost_center.net_profit_timeline_por_cost_center import (
+    CACHE_NAMESPACE,
+)
+from chile_custom.utils import cache
+from chile_custom.utils.timeline import bucket_sql
+
+ROOT_TYPES = ("Income", "Expense")
+
+# diferencia (en moneda de la company) desde la que un mes se reconstruye
+RECONCILE_TOLERANCE = 0.01
+
+
+class NetProfitSnapshot(Document):
+    pass
+
+
+def snapshot_name(company: str, cost_center: str, posting_date, project: str | None = None) -> str:
+    """
+    Nombre determinístico de la fila: el mismo que calcula MD5(CONCAT_WS(...))
+    en rebuild_net_profit_snapshot, para que el upsert caiga siempre en la misma fila.
+    Como es la PK, también garantiza una sola fila por (company, cost_center, project, día).
+    """
+    key = "|".join([company, cost_center, str(getdate(posting_date)), project or ""])
+    return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------
+# doc_events de GL Entry
+# ---------------------------------------------------------
+
+def update_snapshot_on_submit(doc, method):
+    """Suma (credit - debit) del GL Entry al snapshot del día."""
+    _apply_gl_entry(doc)
+
+
+def _apply_gl_entry(doc):
+    # Mismo criterio que el reporte: sólo cuentas de resultado y con cost center
+    if not doc.cost_center or not doc.account:
+        return
+
+    root_type = frappe.get_cached_value("Account", doc.account, "root_type")
+    if root_type not in ROOT_TYPES:
+        return
+
+    delta = flt(doc.credit) - flt(doc.debit)
+    if not delta:
+        return
+
+    upsert_snapshot(doc.company, doc.cost_center, doc.posting_date, delta, doc.project)
+
+
+def upsert_snapshot(company: str, cost_center: str, posting_date, delta: float, project: str | None = None):
+    """Suma `delta` a la fila (company, cost_center, project, posting_date), creándola si no existe."""
+    timestamp = now()
+
+    frappe.db.sql(
+        """
+        INSERT INTO `tabNet Profit Snapshot`
+            (name, creation, modified, modified_by, owner, docstatus, idx,
+             company, cost_center, project, posting_date, net_profit)
+        VALUES
+            (%(name)s, %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+             %(company)s, %(cost_center)s, %(project)s, %(posting_date)s, %(delta)s)
+        ON DUPLICATE KEY UPDATE
+            net_profit = net_profit + VALUES(net_profit),
+            modified = VALUES(modified)
+        """,
+        {
+            "name": snapshot_name(company, cost_center, posting_date, project),
+            "now": timestamp,
+            "user": frappe.session.user,
+            "company": company,
+            "cost_center": cost_center,
+            "project": project or None,
+            "posting_date": getdate(posting_date),
+            "delta": delta,
+        },
+    )
+
+
+# ---------------------------------------------------------
+# Reconstrucción
+# ---------------------------------------------------------
+
+def rebuild_net_profit_snapshot(company: str | None = None, from_date=None, to_date=None):
+    """
+    Recalcula el snapshot desde tabGL Entry en una sola sentencia
+    INSERT ... SELECT. Sin parámetros reconstruye toda la tabla.
+
+    Ej:
+        rebuild_net_profit_snapshot("Constructora Horizonte SpA", "2024-01-01", "2025-12-31")
+    """
+
+    delete_sql, insert_sql, params = rebuild_queries(company, from_date, to_date)
+
+    frappe.db.sql(delete_sql, params)
+    frappe.db.sql(insert_sql, params)
+
+    frappe.db.commit()
+    cache.invalidate(CACHE_NAMESPACE)
+
+    total = frappe.db.count("Net Profit Snapshot")
+    print(f"🏁 Net Profit Snapshot reconstruido: {total} filas.")
+    return total
+
+
+def reconcile_net_profit_snapshot(company: str | None = None, from_date=None, to_date=None) -> list[tuple]:
+    """
+    Compara el snapshot con tabGL Entry por (company, cost center, mes) y
+    reconstruye (rebuild_net_profit_snapshot) cada (company, mes) que no
+    cuadra. Corrige lo que el on_submit de GL Entry no ve: GL Entries
+    borrados con SQL directo por los reposts.
+
+    Devuelve [(company, mes)] reconstruidos.
+    """
+
+    conditions = ""
+    gl_conditions = ""
+    params = {"root_types": ROOT_TYPES}
+
+    if company:
+        conditions += " AND company = %(company)s"
+        gl_conditions += " AND gle.company = %(company)s"
+        params["company"] = company
+
+    if from_date:
+        conditions += " AND posting_date >= %(from_date)s"
+        gl_conditions += " AND gle.posting_date >= %(from_date)s"
+        params["from_date"] = getdate(from_date)
+
+    if to_date:
+        conditions += " AND posting_date <= %(to_date)s"
+        gl_conditions += " AND gle.posting_date <= %(to_date)s"
+        params["to_date"] = getdate(to_date)
+
+    esperado = {
+        (r.company, r.cost_center, getdate(r.month)): flt(r.net_profit)
+        for r in frappe.db.sql(
+            f"""
+            SELECT
+                gle.company,
+                gle.cost_center,
+                {bucket_sql("gle.posting_date", "month")} AS month,
+                SUM(gle.credit - gle.debit) AS net_profit
+            FROM `tabGL Entry` gle
+            INNER JOIN `tabAccount` acc
+                ON gle.account = acc.name
+            WHERE
+                acc.root_type IN %(root_types)s
+                AND gle.cost_center IS NOT NULL
+                {gl_conditions}
+            GROUP BY gle.company, gle.cost_center, month
+            """,
+            params,
+            as_dict=True,
+        )
+    }
+
+    actual = {
+        (r.company, r.cost_center, getdate(r.month)): flt(r.net_profit)
+        for r in frappe.db.sql(
+            f"""
+            SELECT
+                company,
+                cost_center,
+                {bucket_sql("posting_date", "month")} AS month,
+                SUM(net_profit) AS net_profit
+            FROM `tabNet Profit Snapshot`
+            WHERE 1=1 {conditions}
+            GROUP BY company, cost_center, month
+            """,
+            params,
+            as_dict=True,
+        )
+    }
+
+    descuadrados = sorted({
+        (key[0], key[2])
+        for key in esperado.keys() | actual.keys()
+        if abs(esperado.get(key, 0) - actual.get(key, 0)) > RECONCILE_TOLERANCE
+    })
+
+    for company_mes, month in descuadrados:
+        fin_mes = (month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        print(f"⚠️ Snapshot descuadrado: {company_mes} {month:%Y-%m}, reconstruyendo")
+        rebuild_net_profit_snapshot(company_mes, month, fin_mes)
+
+    if not descuadrados:
+        print("✔ Net Profit Snapshot cuadra con GL Entry.")
+
+    return descuadrados
+
+
+def rebuild_queries(company: str | None = None, from_date=None, to_date=None):
+    """
+    (delete_sql, insert_sql, params) de rebuild_net_profit_snapshot. El
+    INSERT ... SELECT también lo revisa check_indexes
+    (chile_custom.custom.indexes).
+    """
+
+    conditions = ""
+    gl_conditions = ""
+    params = {
+        "root_types": ROOT_TYPES,
+        "now": now(),
+        "user": frappe.session.user,
+    }
+
+    if company:
+        conditions += " AND company = %(company)s"
+        gl_conditions += " AND gle.company = %(company)s"
+        params["company"] = company
+
+    if from_date:
+        conditions += " AND posting_date >= %(from_date)s"
+        gl_conditions += " AND gle.posting_date >= %(from_date)s"
+        params["from_date"] = getdate(from_date)
+
+    if to_date:
+        conditions += " AND posting_date <= %(to_date)s"
+        gl_conditions += " AND gle.posting_date <= %(to_date)s"
+        params["to_date"] = getdate(to_date)
+
+    delete_sql = f"DELETE FROM `tabNet Profit Snapshot` WHERE 1=1 {conditions}"
+
+    insert_sql = f"""
+        INSERT INTO `tabNet Profit Snapshot`
+            (name, creation, modified, modified_by, owner, docstatus, idx,
+             company, cost_center, project, posting_date, net_profit)
+        SELECT
+            MD5(CONCAT_WS('|', gle.company, gle.cost_center, gle.posting_date, IFNULL(gle.project, ''))),
+            %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+            gle.company,
+            gle.cost_center,
+            NULLIF(IFNULL(gle.project, ''), ''),
+            gle.posting_date,
+            SUM(gle.credit - gle.debit)
+        FROM `tabGL Entry` gle
+        INNER JOIN `tabAccount` acc
+            ON gle.account = acc.name
+        WHERE
+            acc.root_type IN %(root_types)s
+            AND gle.cost_center IS NOT NULL
+            {gl_conditions}
+        GROUP BY gle.company, gle.cost_center, gle.posting_date, IFNULL(gle.project, '')
+    """
+
+    return delete_sql, insert_sql, params
@@ -0,0 +1,167 @@
+# File: chile_custom/chile_custom/doctype/rut_party_index/rut_party_index.py
+# ---------------------------------------------------------
+# Índice de RUT normalizado → party, para Supplier, Customer, Employee y
+# Shareholder.
+#
+# - Una fila por (party_type, rut): el name es "<party_type>::<rut>", así
+#   la primary key es la que garantiza un solo party por RUT.
+# - Lo mantienen los validate hooks de chile_custom.validations
+#   (sync_rut_index) y los on_trash de cada DocType.
+# - find_party_by_rut (chile_custom.api) busca por el índice sobre `rut`.
+#
+# Reconstrucción completa:
+#     bench --site [site] execute chile_custom.chile_custom.doctype.rut_party_index.rut_party_index.rebuild_rut_party_index
+# ---------------------------------------------------------
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now
+
+from chile_custom.validations.rut_import import RUT_FIELDS
+
+
+class RUTPartyIndex(Document):
+    pass
+
+
+def index_name(party_type: str, rut: str) -> str:
+    return f"{party_type}::{rut}"
+
+
+def sync_rut_index(doc, rut: str | None):
+    """
+    Registra el RUT (ya normalizado) del documento en el índice.
+    Lanza error si otro documento del mismo DocType ya usa ese RUT.
+    Con rut vacío sólo elimina las entradas previas del documento.
+
+    La unicidad la garantiza la primary key ("<party_type>::<rut>"): se
+    inserta directo y, si la fila ya existe, se lee con bloqueo a quién
+    pertenece. Nunca se re-asigna un RUT de otro party.
+    """
+    party_type = doc.doctype
+
+    # Entradas anteriores del documento (RUT cambiado o borrado)
+    if not doc.is_new():
+        frappe.db.sql(
+            """
+            DELETE FROM `tabRUT Party Index`
+            WHERE party_type = %(party_type)s AND party = %(party)s AND rut != %(rut)s
+            """,
+            {"party_type": party_type, "party": doc.name, "rut": rut or ""},
+        )
+
+    if not rut:
+        return
+
+    name = index_name(party_type, rut)
+    timestamp = now()
+
+    try:
+        frappe.db.sql(
+            """
+            INSERT INTO `tabRUT Party Index`
+                (name, creation, modified, modified_by, owner, docstatus, idx,
+                 rut, party_type, party)
+            VALUES
+                (%(name)s, %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+                 %(rut)s, %(party_type)s, %(party)s)
+            """,
+            {
+                "name": name,
+                "now": timestamp,
+                "user": frappe.session.user,
+                "rut": rut,
+                "party_type": party_type,
+                "party": doc.name,
+            },
+        )
+    except Exception as e:
+        if not frappe.db.is_duplicate_entry(e):
+            raise
+
+        # Lectura con bloqueo: ve la fila confirmada más reciente (no el
+        # snapshot de la transacción) y la retiene hasta el commit
+        existente = frappe.db.sql(
+            "SELECT party FROM `tabRUT Party Index` WHERE name = %s FOR UPDATE",
+            name,
+        )
+        existente = existente[0][0] if existente else None
+
+        if existente != doc.name:
+            frappe.throw(
+                f"El RUT {rut} ya está registrado en {party_type} {existente}.",
+                frappe.DuplicateEntryError,
+            )
+
+
+def remove_from_rut_index(doc, method):
+    """doc_event on_trash: elimina las entradas del documento borrado."""
+    frappe.db.delete("RUT Party Index", {"party_type": doc.doctype, "party": doc.name})
+
+
+def find_parties(rut: str) -> list[dict]:
+    """[{party_type, party}] con ese RUT normalizado (una consulta por índice)."""
+    return frappe.db.sql(
+        """
+        SELECT party_type, party
+        FROM `tabRUT Party Index`
+        WHERE rut = %(rut)s
+        ORDER BY party_type
+        """,
+        {"rut": rut},
+        as_dict=True,
+    )
+
+
+def rebuild_rut_party_index():
+    """
+    Reconstruye el índice desde los 4 DocTypes. Los RUT ya normalizados en BD
+    se copian tal cual; si hay duplicados dentro de un DocType se conserva el
+    primero (por creation) y se informan los demás.
+    """
+
+    frappe.db.sql("DELETE FROM `tabRUT Party Index`")
+
+    params = {"now": now(), "user": frappe.session.user}
+    duplicados = []
+
+    for party_type, fieldname in RUT_FIELDS.items():
+        if not frappe.db.has_column(party_type, fieldname):
+            continue
+
+        frappe.db.sql(
+            f"""
+            INSERT IGNORE INTO `tabRUT Party Index`
+                (name, creation, modified, modified_by, owner, docstatus, idx,
+                 rut, party_type, party)
+            SELECT
+                CONCAT(%(party_type)s, '::', `{fieldname}`),
+                %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+                `{fieldname}`, %(party_type)s, name
+            FROM `tab{party_type}`
+            WHERE IFNULL(`{fieldname}`, '') != ''
+            ORDER BY creation
+            """,
+            {**params, "party_type": party_type},
+        )
+
+        duplicados += frappe.db.sql(
+            f"""
+            SELECT %(party_type)s AS party_type, `{fieldname}` AS rut, COUNT(*) AS n
+            FROM `tab{party_type}`
+            WHERE IFNULL(`{fieldname}`, '') != ''
+            GROUP BY `{fieldname}`
+            HAVING COUNT(*) > 1
+            """,
+            {"party_type": party_type},
+            as_dict=True,
+        )
+
+    frappe.db.commit()
+
+    total = frappe.db.count("RUT Party Index")
+    print(f"🏁 RUT Party Index reconstruido: {total} filas.")
+    for d in duplicados:
+        print(f"⚠️ RUT duplicado en {d.party_type}: {d.rut} ({d.n} registros)")
+
+    return total
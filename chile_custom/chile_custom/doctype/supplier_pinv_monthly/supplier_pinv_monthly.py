@@ -0,0 +1,399 @@
+# File: chile_custom/chile_custom/doctype/supplier_pinv_monthly/supplier_pinv_monthly.py
+# ---------------------------------------------------------
+# Agregados mensuales de Purchase Invoices submitted, base de
+# chile_custom.api.ranking_proveedores_pinv (top-N con filtros):
+#
+# - Supplier PINV Monthly:         (company, mes, supplier)
+# - Supplier PINV Project Monthly: (company, mes, supplier, project), sólo
+#   facturas con proyecto; se lee únicamente al filtrar por proyecto.
+#
+# El grano diario (con proyecto) quedaba casi a nivel de factura: 1M PINV
+# sintéticas daban ~925k filas agregadas. Por mes: ~117k filas en la tabla
+# principal (~58k por company) y ~9k por proyecto.
+#
+# Los rangos de fechas que no calzan con meses completos se resuelven
+# así: meses completos desde el agregado + los días sueltos de los
+# extremos (a lo más ~2 meses) directo desde tabPurchase Invoice.
+#
+# En la tabla por proyecto una factura cuenta una vez en CADA proyecto de
+# sus ítems (los ítems sin proyecto toman el del parent), con el
+# grand_total repartido según el amount de los ítems de cada proyecto. Así
+# el filtro por proyecto no pierde las facturas con ítems de varios
+# proyectos; por lo mismo, sumar el ranking de todos los proyectos puede
+# dar más facturas que el ranking sin filtro.
+#
+# supplier_group se guarda al momento del submit; si se reasigna el grupo
+# de un proveedor, correr la reconstrucción:
+#     bench --site [site] execute chile_custom.chile_custom.doctype.supplier_pinv_monthly.supplier_pinv_monthly.rebuild_supplier_pinv_monthly
+# ---------------------------------------------------------
+
+import hashlib
+from datetime import timedelta
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import cint, flt, getdate, now
+
+from chile_custom.utils import cache
+from chile_custom.utils.timeline import bucket_sql
+
+CACHE_NAMESPACE = "ranking_proveedores_pinv"
+CACHE_TTL = 60  # segundos
+
+ORDER_BY = {
+    "count": "total_facturas",
+    "amount": "monto_total",
+}
+
+
+class SupplierPINVMonthly(Document):
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_index("Supplier PINV Monthly", ["company", "month"])
+    frappe.db.add_index("Supplier PINV Monthly", ["month"])
+    frappe.db.add_index("Supplier PINV Monthly", ["supplier_group", "month"])
+
+
+def month_start(posting_date):
+    """Primer día del mes de posting_date (la columna `month`)."""
+    return getdate(posting_date).replace(day=1)
+
+
+def monthly_name(company: str, month, supplier: str, project: str | None = None) -> str:
+    """Mismo valor que MD5(CONCAT_WS('|', ...)) en rebuild_supplier_pinv_monthly."""
+    parts = [company, str(getdate(month)), supplier]
+    if project:
+        parts.append(project)
+    return hashlib.md5("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def get_invoice_project_amounts(doc) -> dict[str, float]:
+    """
+    {proyecto: parte del grand_total} de una factura: los ítems sin
+    proyecto toman el del parent y el grand_total se reparte según el
+    amount de los ítems de cada proyecto.
+    """
+    montos = {}
+    for it in doc.items:
+        project = it.project or doc.get("project")
+        if project:
+            montos[project] = montos.get(project, 0) + flt(it.amount)
+
+    total = flt(doc.total)
+    return {
+        project: flt(doc.grand_total) * monto / total if total else 0
+        for project, monto in montos.items()
+    }
+
+
+def facturas_sql(conditions: str = "") -> str:
+    """
+    PINV submitted con su mes. Lo usan la reconstrucción y los extremos de
+    rango del ranking. `conditions` se agrega al WHERE sobre `pi`.
+    """
+    return f"""
+        SELECT
+            pi.company,
+            pi.posting_date,
+            {bucket_sql("pi.posting_date", "month")} AS month,
+            pi.supplier,
+            pi.grand_total
+        FROM `tabPurchase Invoice` pi
+        WHERE pi.docstatus = 1 {conditions}
+    """
+
+
+def facturas_proyecto_sql(conditions: str = "") -> str:
+    """
+    Una fila por (PINV submitted, proyecto de sus ítems), con la parte del
+    grand_total de ese proyecto (mismo reparto que
+    get_invoice_project_amounts). `conditions` se agrega al WHERE sobre `pi`.
+    """
+    project = "COALESCE(NULLIF(pii.project, ''), NULLIF(pi.project, ''))"
+    return f"""
+        SELECT
+            pi.company,
+            pi.posting_date,
+            {bucket_sql("pi.posting_date", "month")} AS month,
+            pi.supplier,
+            {project} AS project,
+            pi.grand_total * IFNULL(SUM(pii.amount) / NULLIF(pi.total, 0), 0) AS grand_total
+        FROM `tabPurchase Invoice` pi
+        INNER JOIN `tabPurchase Invoice Item` pii
+            ON pii.parent = pi.name
+        WHERE pi.docstatus = 1
+            AND {project} IS NOT NULL
+            {conditions}
+        GROUP BY pi.name, {project}
+    """
+
+
+# ---------------------------------------------------------
+# doc_events de Purchase Invoice
+# ---------------------------------------------------------
+
+def update_monthly_on_submit(doc, method):
+    _upsert_monthly(doc, 1)
+
+
+def update_monthly_on_cancel(doc, method):
+    _upsert_monthly(doc, -1)
+
+
+def _upsert_monthly(doc, sign: int):
+    month = month_start(doc.posting_date)
+    params = {
+        "now": now(),
+        "user": frappe.session.user,
+        "company": doc.company,
+        "month": month,
+        "supplier": doc.supplier,
+        "supplier_group": frappe.get_cached_value("Supplier", doc.supplier, "supplier_group"),
+        "delta_facturas": sign,
+        "delta_monto": sign * flt(doc.grand_total),
+    }
+
+    frappe.db.sql(
+        """
+        INSERT INTO `tabSupplier PINV Monthly`
+            (name, creation, modified, modified_by, owner, docstatus, idx,
+             company, month, supplier, supplier_group, total_facturas, monto_total)
+        VALUES
+            (%(name)s, %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+             %(company)s, %(month)s, %(supplier)s, %(supplier_group)s,
+             %(delta_facturas)s, %(delta_monto)s)
+        ON DUPLICATE KEY UPDATE
+            total_facturas = total_facturas + VALUES(total_facturas),
+            monto_total = monto_total + VALUES(monto_total),
+            modified = VALUES(modified)
+        """,
+        {**params, "name": monthly_name(doc.company, month, doc.supplier)},
+    )
+
+    for project, monto in get_invoice_project_amounts(doc).items():
+        frappe.db.sql(
+            """
+            INSERT INTO `tabSupplier PINV Project Monthly`
+                (name, creation, modified, modified_by, owner, docstatus, idx,
+                 company, month, supplier, supplier_group, project, total_facturas, monto_total)
+            VALUES
+                (%(name)s, %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+                 %(company)s, %(month)s, %(supplier)s, %(supplier_group)s, %(project)s,
+                 %(delta_facturas)s, %(delta_monto)s)
+            ON DUPLICATE KEY UPDATE
+                total_facturas = total_facturas + VALUES(total_facturas),
+                monto_total = monto_total + VALUES(monto_total),
+                modified = VALUES(modified)
+            """,
+            {
+                **params,
+                "name": monthly_name(doc.company, month, doc.supplier, project),
+                "project": project,
+                "delta_monto": sign * monto,
+            },
+        )
+
+    cache.invalidate_after_commit(CACHE_NAMESPACE)
+
+
+# ---------------------------------------------------------
+# Ranking
+# ---------------------------------------------------------
+
+def get_supplier_ranking(
+    top_n: int = 10,
+    order_by: str = "count",
+    company: str | None = None,
+    from_date=None,
+    to_date=None,
+    project: str | None = None,
+    supplier_group: str | None = None,
+) -> list[dict]:
+    """Top-N proveedores por cantidad ("count") o monto ("amount"), con filtros."""
+
+    if order_by not in ORDER_BY:
+        frappe.throw(f"order_by debe ser uno de: {', '.join(ORDER_BY)}")
+
+    top_n = min(max(cint(top_n) or 10, 1), 1000)
+    from_date = getdate(from_date) if from_date else None
+    to_date = getdate(to_date) if to_date else None
+
+    return cache.get_or_set(
+        CACHE_NAMESPACE,
+        (top_n, order_by, company, from_date, to_date, project, supplier_group),
+        lambda: _query_ranking(top_n, order_by, company, from_date, to_date, project, supplier_group),
+        ttl=CACHE_TTL,
+    )
+
+
+def split_rango(from_date=None, to_date=None):
+    """
+    Divide [from_date, to_date] (extremos opcionales) en:
+        - meses: (primer mes completo, último mes completo), con None =
+          sin límite, o None si el rango no cubre ningún mes completo
+        - extremos: [(desde, hasta), ...] días sueltos fuera de esos meses
+    """
+    desde_mes = None
+    if from_date:
+        desde_mes = from_date if from_date.day == 1 else month_start(from_date.replace(day=28) + timedelta(days=4))
+
+    hasta_mes = None
+    if to_date:
+        siguiente = to_date + timedelta(days=1)
+        # to_date es fin de mes → su mes entra completo
+        hasta_mes = month_start(to_date) if siguiente.day == 1 else month_start(month_start(to_date) - timedelta(days=1))
+
+    if desde_mes and hasta_mes and desde_mes > hasta_mes:
+        # no hay ningún mes completo: todo el rango son días sueltos
+        return None, [(from_date, to_date)]
+
+    extremos = []
+    if from_date and from_date < desde_mes:
+        extremos.append((from_date, desde_mes - timedelta(days=1)))
+    if to_date and hasta_mes:
+        fin_meses = month_start(hasta_mes.replace(day=28) + timedelta(days=4)) - timedelta(days=1)
+        if to_date > fin_meses:
+            extremos.append((fin_meses + timedelta(days=1), to_date))
+
+    return (desde_mes, hasta_mes), extremos
+
+
+def build_ranking_query(top_n, order_by, company, from_date, to_date, project, supplier_group):
+    """
+    (sql, params) del ranking. Meses completos desde el agregado mensual
+    (la tabla por proyecto si se filtra por proyecto) + días sueltos de los
+    extremos desde tabPurchase Invoice, sumados por proveedor.
+    """
+    meses, extremos = split_rango(from_date, to_date)
+    params = {"top_n": top_n}
+    partes = []
+
+    if company:
+        params["company"] = company
+    if project:
+        params["project"] = project
+    if supplier_group:
+        params["supplier_group"] = supplier_group
+
+    # 1. Meses completos desde el agregado
+    if meses:
+        tabla = "Supplier PINV Project Monthly" if project else "Supplier PINV Monthly"
+        conditions = ""
+
+        if company:
+            conditions += " AND company = %(company)s"
+        if meses[0]:
+            conditions += " AND month >= %(mes_desde)s"
+            params["mes_desde"] = meses[0]
+        if meses[1]:
+            conditions += " AND month <= %(mes_hasta)s"
+            params["mes_hasta"] = meses[1]
+        if project:
+            conditions += " AND project = %(project)s"
+        if supplier_group:
+            conditions += " AND supplier_group = %(supplier_group)s"
+
+        partes.append(f"""
+            SELECT supplier, total_facturas, monto_total
+            FROM `tab{tabla}`
+            WHERE 1=1 {conditions}
+        """)
+
+    # 2. Días sueltos de los extremos desde las facturas
+    for i, (desde, hasta) in enumerate(extremos):
+        params[f"desde_{i}"] = desde
+        params[f"hasta_{i}"] = hasta
+
+        inner = f" AND pi.posting_date BETWEEN %(desde_{i})s AND %(hasta_{i})s"
+        if company:
+            inner += " AND pi.company = %(company)s"
+
+        outer = ""
+        if project:
+            outer += " AND inv.project = %(project)s"
+        if supplier_group:
+            outer += " AND sup.supplier_group = %(supplier_group)s"
+
+        fuente = facturas_proyecto_sql(inner) if project else facturas_sql(inner)
+        partes.append(f"""
+            SELECT inv.supplier, 1 AS total_facturas, inv.grand_total AS monto_total
+            FROM ({fuente}) inv
+            LEFT JOIN `tabSupplier` sup ON sup.name = inv.supplier
+            WHERE 1=1 {outer}
+        """)
+
+    sql = f"""
+        SELECT
+            supplier,
+            SUM(total_facturas) AS total_facturas,
+            SUM(monto_total) AS monto_total
+        FROM ({" UNION ALL ".join(partes)}) r
+        GROUP BY supplier
+        HAVING SUM(total_facturas) > 0
+        ORDER BY {ORDER_BY[order_by]} DESC
+        LIMIT %(top_n)s
+    """
+    return sql, params
+
+
+def _query_ranking(top_n, order_by, company, from_date, to_date, project, supplier_group):
+    sql, params = build_ranking_query(top_n, order_by, company, from_date, to_date, project, supplier_group)
+    return frappe.db.sql(sql, params, as_dict=True)
+
+
+# ---------------------------------------------------------
+# Reconstrucción
+# ---------------------------------------------------------
+
+def rebuild_supplier_pinv_monthly():
+    """Recalcula ambos agregados desde Purchase Invoice / Item (un INSERT ... SELECT cada uno)."""
+
+    params = {"now": now(), "user": frappe.session.user}
+
+    frappe.db.sql("DELETE FROM `tabSupplier PINV Monthly`")
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tabSupplier PINV Monthly`
+            (name, creation, modified, modified_by, owner, docstatus, idx,
+             company, month, supplier, supplier_group, total_facturas, monto_total)
+        SELECT
+            MD5(CONCAT_WS('|', inv.company, inv.month, inv.supplier)),
+            %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+            inv.company, inv.month, inv.supplier, sup.supplier_group,
+            COUNT(*), SUM(inv.grand_total)
+        FROM ({facturas_sql()}) inv
+        LEFT JOIN `tabSupplier` sup
+            ON sup.name = inv.supplier
+        GROUP BY inv.company, inv.month, inv.supplier, sup.supplier_group
+        """,
+        params,
+    )
+
+    frappe.db.sql("DELETE FROM `tabSupplier PINV Project Monthly`")
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tabSupplier PINV Project Monthly`
+            (name, creation, modified, modified_by, owner, docstatus, idx,
+             company, month, supplier, supplier_group, project, total_facturas, monto_total)
+        SELECT
+            MD5(CONCAT_WS('|', inv.company, inv.month, inv.supplier, inv.project)),
+            %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+            inv.company, inv.month, inv.supplier, sup.supplier_group, inv.project,
+            COUNT(*), SUM(inv.grand_total)
+        FROM ({facturas_proyecto_sql()}) inv
+        LEFT JOIN `tabSupplier` sup
+            ON sup.name = inv.supplier
+        GROUP BY inv.company, inv.month, inv.supplier, inv.project, sup.supplier_group
+        """,
+        params,
+    )
+
+    frappe.db.commit()
+    cache.invalidate(CACHE_NAMESPACE)
+
+    total = frappe.db.count("Supplier PINV Monthly")
+    por_proyecto = frappe.db.count("Supplier PINV Project Monthly")
+    print(f"🏁 Supplier PINV Monthly reconstruido: {total} filas ({por_proyecto} por proyecto).")
+    return total
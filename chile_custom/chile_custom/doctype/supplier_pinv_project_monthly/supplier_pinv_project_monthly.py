@@ -0,0 +1,16 @@
+# File: chile_custom/chile_custom/doctype/supplier_pinv_project_monthly/supplier_pinv_project_monthly.py
+# ---------------------------------------------------------
+# Agregado mensual por (company, mes, supplier, project). Lo mantiene y lo
+# lee chile_custom.chile_custom.doctype.supplier_pinv_monthly.
+# ---------------------------------------------------------
+
+import frappe
+from frappe.model.document import Document
+
+
+class SupplierPINVProjectMonthly(Document):
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_index("Supplier PINV Project Monthly", ["project", "month"])
@@ -0,0 +1,144 @@
+# File: chile_custom/chile_custom/doctype/supplier_pinv_summary/supplier_pinv_summary.py
+# ---------------------------------------------------------
+# Agregado materializado por proveedor de las Purchase Invoice submitted
+# (cantidad y SUM(grand_total)). Lo mantienen los doc_events on_submit /
+# on_cancel de Purchase Invoice y lo lee chile_custom.api.top_proveedores_pinv.
+# before_rename / after_rename de Supplier lo mantienen al renombrar o
+# fusionar proveedores (el name de la fila es el supplier).
+#
+# Reconstrucción completa:
+#     bench --site [site] execute chile_custom.chile_custom.doctype.supplier_pinv_summary.supplier_pinv_summary.rebuild_supplier_pinv_summary
+# ---------------------------------------------------------
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt, now
+
+from chile_custom.utils import cache
+
+# Cache de respuesta de top_proveedores_pinv
+CACHE_NAMESPACE = "top_proveedores_pinv"
+CACHE_TTL = 30  # segundos
+
+
+class SupplierPINVSummary(Document):
+    pass
+
+
+def update_summary_on_submit(doc, method):
+    _upsert_summary(doc.supplier, 1, flt(doc.grand_total))
+
+
+def update_summary_on_cancel(doc, method):
+    _upsert_summary(doc.supplier, -1, -flt(doc.grand_total))
+
+
+def _upsert_summary(supplier: str, delta_facturas: int, delta_monto: float):
+    timestamp = now()
+
+    frappe.db.sql(
+        """
+        INSERT INTO `tabSupplier PINV Summary`
+            (name, creation, modified, modified_by, owner, docstatus, idx,
+             supplier, total_facturas, monto_total)
+        VALUES
+            (%(supplier)s, %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+             %(supplier)s, %(delta_facturas)s, %(delta_monto)s)
+        ON DUPLICATE KEY UPDATE
+            total_facturas = total_facturas + VALUES(total_facturas),
+            monto_total = monto_total + VALUES(monto_total),
+            modified = VALUES(modified)
+        """,
+        {
+            "supplier": supplier,
+            "now": timestamp,
+            "user": frappe.session.user,
+            "delta_facturas": delta_facturas,
+            "delta_monto": delta_monto,
+        },
+    )
+
+    cache.invalidate_after_commit(CACHE_NAMESPACE)
+
+
+def before_rename_supplier(doc, method, old, new, merge=False):
+    """
+    doc_event before_rename de Supplier: borra la fila del nombre anterior
+    (y la del destino si es una fusión) antes de que frappe actualice los
+    Link, que chocarían con la unicidad de `supplier`.
+    """
+    frappe.db.delete("Supplier PINV Summary", {"name": ("in", [old, new])})
+
+
+def after_rename_supplier(doc, method, old, new, merge=False):
+    """
+    doc_event after_rename de Supplier: recalcula la fila del nuevo nombre
+    desde tabPurchase Invoice (ya con el supplier renombrado / fusionado).
+    """
+    frappe.db.sql(
+        """
+        INSERT INTO `tabSupplier PINV Summary`
+            (name, creation, modified, modified_by, owner, docstatus, idx,
+             supplier, total_facturas, monto_total)
+        SELECT
+            supplier, %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+            supplier, COUNT(*), SUM(grand_total)
+        FROM `tabPurchase Invoice`
+        WHERE docstatus = 1 AND supplier = %(supplier)s
+        GROUP BY supplier
+        """,
+        {"now": now(), "user": frappe.session.user, "supplier": new},
+    )
+
+    cache.invalidate_after_commit(CACHE_NAMESPACE)
+
+
+def get_top_suppliers(limit: int = 10) -> list[dict]:
+    """Top proveedores por cantidad de facturas, desde el agregado (cacheado)."""
+    return cache.get_or_set(
+        CACHE_NAMESPACE,
+        (limit,),
+        lambda: frappe.db.sql(
+            """
+            SELECT
+                supplier,
+                total_facturas,
+                monto_total
+            FROM `tabSupplier PINV Summary`
+            WHERE total_facturas > 0
+            ORDER BY total_facturas DESC
+            LIMIT %(limit)s
+            """,
+            {"limit": limit},
+            as_dict=True,
+        ),
+        ttl=CACHE_TTL,
+    )
+
+
+def rebuild_supplier_pinv_summary():
+    """Recalcula el agregado completo desde tabPurchase Invoice."""
+
+    frappe.db.sql("DELETE FROM `tabSupplier PINV Summary`")
+
+    frappe.db.sql(
+        """
+        INSERT INTO `tabSupplier PINV Summary`
+            (name, creation, modified, modified_by, owner, docstatus, idx,
+             supplier, total_facturas, monto_total)
+        SELECT
+            supplier, %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+            supplier, COUNT(*), SUM(grand_total)
+        FROM `tabPurchase Invoice`
+        WHERE docstatus = 1
+        GROUP BY supplier
+        """,
+        {"now": now(), "user": frappe.session.user},
+    )
+
+    frappe.db.commit()
+    cache.invalidate(CACHE_NAMESPACE)
+
+    total = frappe.db.count("Supplier PINV Summary")
+    print(f"🏁 Supplier PINV Summary reconstruido: {total} proveedores.")
+    return total
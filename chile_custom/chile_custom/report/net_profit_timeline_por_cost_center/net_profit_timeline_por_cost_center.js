@@ -15,6 +15,34 @@ frappe.query_reports["Net Profit Timeline por Cost Center"] = {
             reqd: 1,
             // Fecha actual
             default: frappe.datetime.get_today()
+        },
+        {
+            fieldname: "company",
+            label: "Company",
+            fieldtype: "Link",
+            options: "Company"
+        },
+        {
+            fieldname: "granularity",
+            label: "Granularity",
+            fieldtype: "Select",
+            options: "Day\nWeek\nMonth",
+            // Week / Month: menos filas para rangos largos (~105 / ~25 vs ~730 diarias en 2 años)
+            default: "Day"
+        },
+        {
+            fieldname: "rollup",
+            label: "Totales por grupo (árbol)",
+            fieldtype: "Check",
+            default: 0
+        },
+        {
+            fieldname: "columnar",
+            label: "Respuesta columnar",
+            fieldtype: "Check",
+            // Sólo gráfico: la respuesta trae fechas + un arreglo de valores
+            // por serie (chart.columnar) en vez de una fila por fecha
+            default: 0
         }
     ]
 };
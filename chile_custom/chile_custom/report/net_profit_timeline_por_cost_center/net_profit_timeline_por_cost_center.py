@@ -1,107 +1,172 @@
 import frappe
 from frappe.utils import flt
-from datetime import timedelta
+
+from chile_custom.utils import cache
+from chile_custom.utils.timeline import (
+    bucket_range,
+    bucket_sql,
+    build_report,
+    normalize_granularity,
+    report_result,
+)
+
+CACHE_NAMESPACE = "net_profit_timeline"
+CACHE_TTL = 60 * 60  # 1 hora
 
 
 def execute(filters=None):
+    columns, data = get_data(filters)
+
+    # gráfico con a lo más CHART_MAX_POINTS puntos (downsampling); con el
+    # filtro "Respuesta columnar" viaja el formato columnar en vez de filas
+    return report_result(columns, data, columnar=bool((filters or {}).get("columnar")))
+
+
+def get_data(filters=None):
+    """(columns, data) del reporte, desde el cache si está disponible."""
     if not filters:
         filters = {}
 
     from_date = filters.get("from_date")
     to_date = filters.get("to_date")
+    company = filters.get("company")
+    rollup = 1 if filters.get("rollup") else 0
 
     if not from_date or not to_date:
         frappe.throw("Debe seleccionar From Date y To Date")
 
+    try:
+        granularity = normalize_granularity(filters.get("granularity"))
+    except ValueError as e:
+        frappe.throw(str(e))
+
     # ------------------------------------------------------------
-    # 1. Traer GL Entries
+    # 0. Cache por filtros. El reporte sólo lee el snapshot, así que
+    #    basta invalidar cuando éste cambia: hooks de GL Entry (después
+    #    del commit) y rebuild_net_profit_snapshot
     # ------------------------------------------------------------
-    rows = frappe.db.sql(
-        """
-        SELECT 
-            gle.posting_date AS day,
-            gle.cost_center,
-            SUM(gle.credit - gle.debit) AS net_profit
-        FROM `tabGL Entry` gle
-        INNER JOIN `tabAccount` acc
-            ON gle.account = acc.name
-        WHERE
-            gle.posting_date BETWEEN %(from_date)s AND %(to_date)s
-            AND acc.root_type IN ('Income', 'Expense')
-            AND gle.cost_center IS NOT NULL
-        GROUP BY gle.posting_date, gle.cost_center
-        ORDER BY gle.posting_date
-        """,
-        {"from_date": from_date, "to_date": to_date},
-        as_dict=True,
+    return cache.get_or_set(
+        CACHE_NAMESPACE,
+        (str(from_date), str(to_date), company, rollup, granularity),
+        lambda: get_timeline(from_date, to_date, company, rollup, granularity),
+        ttl=CACHE_TTL,
     )
 
-    if not rows:
-        return [], []
 
+def clear_cache(doc=None, method=None):
+    """
+    Invalida los resultados cacheados del reporte. Como doc_event de GL
+    Entry la invalidación queda para después del commit (una vez por
+    transacción): invalidar antes deja que un lector concurrente vuelva a
+    cachear el snapshot sin las filas aún no confirmadas.
+    """
+    if doc is not None:
+        cache.invalidate_after_commit(CACHE_NAMESPACE)
+        return
+
+    cache.invalidate(CACHE_NAMESPACE)
+
+
+def get_timeline(from_date, to_date, company=None, rollup=0, granularity="day"):
     # ------------------------------------------------------------
-    # 2. Agrupar por cost center y calcular acumulado
+    # 1. Traer net profit por bucket (día / semana / mes) desde el
+    #    snapshot (pre-agregado desde GL Entry, ver Net Profit Snapshot)
     # ------------------------------------------------------------
-    data_by_cc = {}
+    sql, params = timeline_query(from_date, to_date, company, rollup, granularity)
+    rows = frappe.db.sql(sql, params, as_dict=True)
+
+    if not rows:
+        return [], []
+
+    if rollup:
+        return get_timeline_rollup(rows, from_date, to_date, granularity)
+
     for r in rows:
-        cc = r.cost_center
-        data_by_cc.setdefault(cc, [])
-        data_by_cc[cc].append((r.day, flt(r.net_profit)))
-
-    # Calcular acumulado por centro de costo
-    for cc, values in data_by_cc.items():
-        total = 0
-        acumulated = []
-        for d, np in values:
-            total += np
-            acumulated.append((d, total))
-        data_by_cc[cc] = dict(acumulated)
+        r.net_profit = flt(r.net_profit)
 
     # ------------------------------------------------------------
-    # 3. Crear lista COMPLETA de fechas (sin saltos)
+    # 2. Lista COMPLETA de buckets (sin saltos) + columnas por cost
+    #    center + acumulado con forward fill (utils.timeline)
     # ------------------------------------------------------------
-    start = frappe.utils.getdate(from_date)
-    end = frappe.utils.getdate(to_date)
+    all_dates = bucket_range(frappe.utils.getdate(from_date), frappe.utils.getdate(to_date), granularity)
 
-    all_dates = []
-    current = start
-    while current <= end:
-        all_dates.append(current)
-        current += timedelta(days=1)
+    columns, data = build_report(rows, all_dates, "cost_center")
+    return columns, data
 
-    # ------------------------------------------------------------
-    # 4. Construir columnas
-    # ------------------------------------------------------------
-    columns = [{"label": "Fecha", "fieldname": "day", "fieldtype": "Date"}]
 
-    for cc in data_by_cc:
-        columns.append({
-            "label": cc,
-            "fieldname": cc.replace(" ", "_").lower(),
-            "fieldtype": "Float"
-        })
+def timeline_query(from_date, to_date, company=None, rollup=0, granularity="day"):
+    """
+    (sql, params) de la lectura del snapshot. La usan get_timeline y
+    check_indexes (chile_custom.custom.indexes).
+
+    Con rollup se resuelve en UNA consulta con el nested set de Cost
+    Center: cada fila del snapshot se cruza con todos sus ancestros
+    (anc.lft <= cc.lft AND anc.rgt >= cc.rgt, que incluye al propio cost
+    center) y se agrupa por ancestro, así el navegador no tiene que sumar
+    columnas.
+    """
+    conditions = ""
+    params = {"from_date": from_date, "to_date": to_date}
+
+    if company:
+        conditions += " AND nps.company = %(company)s"
+        params["company"] = company
+
+    bucket = bucket_sql("nps.posting_date", granularity)
+
+    if not rollup:
+        return f"""
+            SELECT
+                {bucket} AS day,
+                nps.cost_center,
+                SUM(nps.net_profit) AS net_profit
+            FROM `tabNet Profit Snapshot` nps
+            WHERE
+                nps.posting_date BETWEEN %(from_date)s AND %(to_date)s
+                {conditions}
+            GROUP BY day, nps.cost_center
+            ORDER BY day
+        """, params
+
+    return f"""
+        SELECT
+            {bucket} AS day,
+            anc.name AS cost_center,
+            anc.lft,
+            anc.is_group,
+            SUM(nps.net_profit) AS net_profit
+        FROM `tabNet Profit Snapshot` nps
+        INNER JOIN `tabCost Center` cc ON cc.name = nps.cost_center
+        INNER JOIN `tabCost Center` anc ON anc.lft <= cc.lft AND anc.rgt >= cc.rgt
+        WHERE
+            nps.posting_date BETWEEN %(from_date)s AND %(to_date)s
+            {conditions}
+        GROUP BY day, anc.name, anc.lft, anc.is_group
+        ORDER BY day
+    """, params
+
+
+def get_timeline_rollup(rows, from_date, to_date, granularity="day"):
+    """
+    Modo árbol: además de cada cost center hoja, una columna por cada cost
+    center grupo con la suma de todos sus descendientes (filas de
+    timeline_query con rollup).
+    """
+
+    labels = {}
+    posiciones = {}
+    for r in rows:
+        r.net_profit = flt(r.net_profit)
+        posiciones[r.cost_center] = r.lft
+        if r.is_group:
+            labels[r.cost_center] = f"{r.cost_center} (total)"
 
     # ------------------------------------------------------------
-    # 5. Construir filas con FORWARD FILL
+    # 2. Columnas en orden de árbol (lft): cada grupo antes que
+    #    sus hijos
     # ------------------------------------------------------------
-    data = []
-    for d in all_dates:
-        row = {"day": d}
-        for cc in data_by_cc:
-            cc_field = cc.replace(" ", "_").lower()
-            valores = data_by_cc[cc]
-
-            if d in valores:
-                row[cc_field] = valores[d]
-            else:
-                # obtener último valor previo: forward fill
-                prev_dates = [x for x in valores.keys() if x < d]
-                if prev_dates:
-                    last_date = max(prev_dates)
-                    row[cc_field] = valores[last_date]
-                else:
-                    row[cc_field] = 0
-
-        data.append(row)
+    order = sorted(posiciones, key=posiciones.get)
+    all_dates = bucket_range(frappe.utils.getdate(from_date), frappe.utils.getdate(to_date), granularity)
 
+    columns, data = build_report(rows, all_dates, "cost_center", labels, order)
     return columns, data
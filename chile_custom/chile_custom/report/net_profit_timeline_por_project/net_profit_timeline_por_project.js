@@ -0,0 +1,42 @@
+frappe.query_reports["Net Profit Timeline por Project"] = {
+    "filters": [
+        {
+            fieldname: "from_date",
+            label: "From Date",
+            fieldtype: "Date",
+            reqd: 1,
+            // Hoy menos 24 meses
+            default: frappe.datetime.add_months(frappe.datetime.get_today(), -24)
+        },
+        {
+            fieldname: "to_date",
+            label: "To Date",
+            fieldtype: "Date",
+            reqd: 1,
+            // Fecha actual
+            default: frappe.datetime.get_today()
+        },
+        {
+            fieldname: "company",
+            label: "Company",
+            fieldtype: "Link",
+            options: "Company"
+        },
+        {
+            fieldname: "granularity",
+            label: "Granularity",
+            fieldtype: "Select",
+            options: "Day\nWeek\nMonth",
+            // Week / Month: menos filas para rangos largos (~105 / ~25 vs ~730 diarias en 2 años)
+            default: "Day"
+        },
+        {
+            fieldname: "columnar",
+            label: "Respuesta columnar",
+            fieldtype: "Check",
+            // Sólo gráfico: la respuesta trae fechas + un arreglo de valores
+            // por serie (chart.columnar) en vez de una fila por fecha
+            default: 0
+        }
+    ]
+};
@@ -0,0 +1,118 @@
+import frappe
+from frappe.utils import flt
+
+from chile_custom.chile_custom.report.net_profit_timeline_por_cost_center.net_profit_timeline_por_cost_center import (
+    CACHE_NAMESPACE,
+    CACHE_TTL,
+)
+from chile_custom.utils import cache
+from chile_custom.utils.timeline import (
+    bucket_range,
+    bucket_sql,
+    build_report,
+    normalize_granularity,
+    report_result,
+)
+
+
+def execute(filters=None):
+    columns, data = get_data(filters)
+
+    # gráfico con a lo más CHART_MAX_POINTS puntos (downsampling); con el
+    # filtro "Respuesta columnar" viaja el formato columnar en vez de filas
+    return report_result(columns, data, columnar=bool((filters or {}).get("columnar")))
+
+
+def get_data(filters=None):
+    """(columns, data) del reporte, desde el cache si está disponible."""
+    if not filters:
+        filters = {}
+
+    from_date = filters.get("from_date")
+    to_date = filters.get("to_date")
+    company = filters.get("company")
+
+    if not from_date or not to_date:
+        frappe.throw("Debe seleccionar From Date y To Date")
+
+    try:
+        granularity = normalize_granularity(filters.get("granularity"))
+    except ValueError as e:
+        frappe.throw(str(e))
+
+    # ------------------------------------------------------------
+    # 0. Cache compartido con el reporte por Cost Center (mismo
+    #    namespace: los hooks de GL Entry y la reconstrucción del
+    #    snapshot invalidan ambos)
+    # ------------------------------------------------------------
+    return cache.get_or_set(
+        CACHE_NAMESPACE,
+        ("project", str(from_date), str(to_date), company, granularity),
+        lambda: get_timeline(from_date, to_date, company, granularity),
+        ttl=CACHE_TTL,
+    )
+
+
+def get_timeline(from_date, to_date, company=None, granularity="day"):
+    # ------------------------------------------------------------
+    # 1. Net profit por bucket (día / semana / mes) y project desde
+    #    el snapshot (que ya trae el project del GL Entry)
+    # ------------------------------------------------------------
+    sql, params = timeline_query(from_date, to_date, company, granularity)
+    rows = frappe.db.sql(sql, params, as_dict=True)
+
+    if not rows:
+        return [], []
+
+    for r in rows:
+        r.net_profit = flt(r.net_profit)
+
+    # ------------------------------------------------------------
+    # 2. Etiquetas "PROJ-0003 · Nombre del proyecto" (una consulta)
+    # ------------------------------------------------------------
+    projects = {r.project for r in rows}
+    labels = {
+        p.name: f"{p.name} · {p.project_name}" if p.project_name and p.project_name != p.name else p.name
+        for p in frappe.get_all(
+            "Project",
+            filters={"name": ["in", list(projects)]},
+            fields=["name", "project_name"],
+        )
+    }
+
+    # ------------------------------------------------------------
+    # 3. Buckets completos + columnas por project + acumulado con
+    #    forward fill (mismo núcleo que el reporte por Cost Center)
+    # ------------------------------------------------------------
+    all_dates = bucket_range(frappe.utils.getdate(from_date), frappe.utils.getdate(to_date), granularity)
+
+    columns, data = build_report(rows, all_dates, "project", labels)
+    return columns, data
+
+
+def timeline_query(from_date, to_date, company=None, granularity="day"):
+    """
+    (sql, params) de la lectura del snapshot por project. La usan
+    get_timeline y check_indexes (chile_custom.custom.indexes).
+    """
+    conditions = ""
+    params = {"from_date": from_date, "to_date": to_date}
+
+    if company:
+        conditions += " AND nps.company = %(company)s"
+        params["company"] = company
+
+    bucket = bucket_sql("nps.posting_date", granularity)
+    return f"""
+        SELECT
+            {bucket} AS day,
+            nps.project,
+            SUM(nps.net_profit) AS net_profit
+        FROM `tabNet Profit Snapshot` nps
+        WHERE
+            nps.posting_date BETWEEN %(from_date)s AND %(to_date)s
+            AND nps.project IS NOT NULL
+            {conditions}
+        GROUP BY day, nps.project
+        ORDER BY day
+    """, params
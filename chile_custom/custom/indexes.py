@@ -0,0 +1,201 @@
+import frappe
+from frappe.utils import getdate
+
+
+# Índices compuestos que usan los reportes / endpoints de la app.
+# (doctype, columnas, nombre del índice)
+INDEXES = [
+    # facturas_pinv_por_fecha: filtro docstatus + rango de fecha (+ supplier)
+    ("Purchase Invoice", ["docstatus", "posting_date", "supplier"], "idx_pinv_docstatus_posting_supplier"),
+    # pagos / cobros por proyecto: facturas cuyos ítems son de un proyecto
+    ("Purchase Invoice Item", ["project", "parent"], "idx_pinv_item_project_parent"),
+    ("Sales Invoice Item", ["project", "parent"], "idx_sinv_item_project_parent"),
+    # Net Profit Timeline: lectura del snapshot por rango (+ company), cubriente
+    ("Net Profit Snapshot", ["posting_date", "cost_center", "net_profit"], "idx_nps_posting_cc_profit"),
+    ("Net Profit Snapshot", ["company", "posting_date", "cost_center", "net_profit"], "idx_nps_company_posting_cc_profit"),
+    ("Net Profit Snapshot", ["posting_date", "project", "net_profit"], "idx_nps_posting_project_profit"),
+    ("Net Profit Snapshot", ["company", "posting_date", "project", "net_profit"], "idx_nps_company_posting_project_profit"),
+]
+# Sin índices extra en GL Entry / Account: sólo los usarían la
+# reconstrucción y la conciliación del snapshot (scans ocasionales), y cada
+# índice de GL Entry encarece todos los submits.
+
+
+# Valores de ejemplo para los EXPLAIN
+EXPLAIN_PARAMS = {
+    "company": "_",
+    "from_date": "2024-01-01",
+    "to_date": "2024-12-31",
+    "supplier": "_",
+    "project": "_",
+}
+
+
+def get_explain_checks():
+    """
+    Consultas que NO deben hacer full scan (revisadas con check_indexes).
+    Se arman con las MISMAS funciones que usan los reportes / endpoints
+    (con valores de ejemplo), así no pueden desviarse del código real.
+
+    Devuelve [{"nombre", "tablas", "query": (sql, params)}]; `tablas` =
+    alias (columna `table` del EXPLAIN) que se revisan.
+    """
+
+    # imports locales: este módulo se carga en after_migrate
+    from chile_custom.api import pinv_page_query
+    from chile_custom.chile_custom.doctype.supplier_pinv_monthly.supplier_pinv_monthly import build_ranking_query
+    from chile_custom.chile_custom.report.net_profit_timeline_por_cost_center import (
+        net_profit_timeline_por_cost_center as timeline_cc,
+    )
+    from chile_custom.chile_custom.report.net_profit_timeline_por_project import (
+        net_profit_timeline_por_project as timeline_project,
+    )
+    from chile_custom.utils.demodata_creator.transactional_data.project_utils import facturas_por_proyecto_query
+
+    p = EXPLAIN_PARAMS
+    desde, hasta = p["from_date"], p["to_date"]
+    campos_factura = ["name", "posting_date", "outstanding_amount"]
+    tablas_factura = ["inv", "otro"]
+
+    return [
+        {
+            "nombre": "Net Profit Timeline (company, día)",
+            "tablas": ["nps"],
+            "query": timeline_cc.timeline_query(desde, hasta, p["company"], 0, "day"),
+        },
+        {
+            "nombre": "Net Profit Timeline (sin company, mes)",
+            "tablas": ["nps"],
+            "query": timeline_cc.timeline_query(desde, hasta, None, 0, "month"),
+        },
+        {
+            "nombre": "Net Profit Timeline con totales por grupo (company, semana)",
+            "tablas": ["nps"],
+            "query": timeline_cc.timeline_query(desde, hasta, p["company"], 1, "week"),
+        },
+        {
+            "nombre": "Net Profit Timeline con totales por grupo (sin company, día)",
+            "tablas": ["nps"],
+            "query": timeline_cc.timeline_query(desde, hasta, None, 1, "day"),
+        },
+        {
+            # cc por PK; anc por rango sobre los índices lft / rgt del nested set
+            "nombre": "Net Profit Timeline con totales por grupo (join lft / rgt de Cost Center)",
+            "tablas": ["cc", "anc"],
+            "query": timeline_cc.timeline_query(desde, hasta, p["company"], 1, "day"),
+        },
+        {
+            "nombre": "Net Profit Timeline por Project (company, día)",
+            "tablas": ["nps"],
+            "query": timeline_project.timeline_query(desde, hasta, p["company"], "day"),
+        },
+        {
+            "nombre": "Net Profit Timeline por Project (sin company, mes)",
+            "tablas": ["nps"],
+            "query": timeline_project.timeline_query(desde, hasta, None, "month"),
+        },
+        {
+            "nombre": "facturas_pinv_por_fecha (rango + supplier)",
+            "tablas": ["tabPurchase Invoice"],
+            "query": pinv_page_query(desde, hasta, p["supplier"]),
+        },
+        {
+            "nombre": "facturas_pinv_por_fecha_paginado (rango + cursor)",
+            "tablas": ["tabPurchase Invoice"],
+            "query": pinv_page_query(desde, hasta, cursor=f"{hasta}|_"),
+        },
+        {
+            "nombre": "get_facturas_por_proyecto (Purchase Invoice, un proyecto)",
+            "tablas": ["tabPurchase Invoice Item", *tablas_factura],
+            "query": facturas_por_proyecto_query("Purchase Invoice", campos_factura, project_name=p["project"]),
+        },
+        {
+            "nombre": "get_facturas_por_proyecto (Sales Invoice, un proyecto)",
+            "tablas": ["tabSales Invoice Item", *tablas_factura],
+            "query": facturas_por_proyecto_query("Sales Invoice", campos_factura, project_name=p["project"]),
+        },
+        {
+            "nombre": "get_facturas_agrupadas_por_proyecto (Purchase Invoice, todos, company)",
+            "tablas": ["tabPurchase Invoice Item", *tablas_factura],
+            "query": facturas_por_proyecto_query("Purchase Invoice", campos_factura, company=p["company"]),
+        },
+        {
+            "nombre": "get_facturas_agrupadas_por_proyecto (Sales Invoice, todos, sin company)",
+            "tablas": ["tabSales Invoice Item", *tablas_factura],
+            "query": facturas_por_proyecto_query("Sales Invoice", campos_factura),
+        },
+        {
+            "nombre": "ranking_proveedores_pinv (company + meses completos)",
+            "tablas": ["tabSupplier PINV Monthly"],
+            "query": build_ranking_query(10, "count", p["company"], getdate(desde), getdate(hasta), None, None),
+        },
+        {
+            "nombre": "ranking_proveedores_pinv (proyecto + rango parcial)",
+            "tablas": ["tabSupplier PINV Project Monthly", "pi"],
+            "query": build_ranking_query(10, "amount", None, getdate("2024-01-15"), getdate("2024-12-20"), p["project"], None),
+        },
+    ]
+
+
+def create_indexes():
+    """
+    Crea (si no existen) los índices de INDEXES. Es idempotente: se ejecuta
+    en cada migrate.
+
+    Para ejecutarlo:
+        bench --site [site] execute chile_custom.custom.indexes.create_indexes
+    """
+
+    for doctype, fields, index_name in INDEXES:
+        frappe.db.add_index(doctype, fields, index_name=index_name)
+
+
+def check_indexes(min_rows: int = 1000):
+    """
+    Corre EXPLAIN sobre cada consulta de get_explain_checks() y falla si
+    alguna vuelve a hacer full scan (type = ALL) sobre sus tablas.
+
+    Limitación: en tablas chicas (menos de `min_rows` filas estimadas) el
+    optimizador puede preferir un scan, así que esos casos NO se evalúan
+    (se informan como "no evaluado"). Un resultado limpio en un sitio con
+    pocos datos no garantiza el plan en producción: correrlo en un sitio
+    con datos.
+
+    Para ejecutarlo:
+        bench --site [site] execute chile_custom.custom.indexes.check_indexes
+    """
+
+    full_scans = []
+    no_evaluados = []
+
+    for check in get_explain_checks():
+        sql, params = check["query"]
+        plan = frappe.db.sql(f"EXPLAIN {sql}", params, as_dict=True)
+
+        for row in plan:
+            if row.get("table") not in check["tablas"]:
+                continue
+
+            rows = row.get("rows") or 0
+            extra = row.get("Extra") or ""
+            if row.get("type") != "ALL":
+                print(f"✔ {check['nombre']}: {row.get('type')} con {row.get('key') or '-'} en {row['table']}")
+            elif "Range checked for each record" in extra:
+                # join por rango (lft / rgt): type ALL, pero elige índice por fila
+                print(f"✔ {check['nombre']}: rango por fila en {row['table']} ({extra})")
+            elif rows >= min_rows:
+                full_scans.append(f"{check['nombre']}: full scan en {row['table']} (~{rows:,} filas)")
+                print(f"❌ {check['nombre']}: full scan en {row['table']} (~{rows:,} filas)")
+            else:
+                no_evaluados.append(f"{check['nombre']} ({row['table']})")
+                print(f"⚪ {check['nombre']}: full scan en {row['table']} con ~{rows:,} filas "
+                      f"(< {min_rows:,}): no evaluado")
+
+    if no_evaluados:
+        print(f"⚠️ {len(no_evaluados)} planes no evaluados por tener menos de {min_rows:,} filas estimadas; "
+              "con más datos el plan puede cambiar. Repetir en un sitio con datos reales.")
+
+    if full_scans:
+        frappe.throw("Consultas con full scan:<br>" + "<br>".join(full_scans))
+
+    return True
@@ -49,8 +49,8 @@ app_license = "mit"
 # doctype_calendar_js = {"doctype" : "public/js/doctype_calendar.js"}
 
 doctype_js = {
-    "Address": "public/js/address_region.js",
-     "Project": "public/js/project_region.js"
+    "Address": ["public/js/regiones_map.js", "public/js/address_region.js"],
+    "Project": ["public/js/regiones_map.js", "public/js/project_region.js"],
 }
 
 
@@ -154,16 +154,41 @@ doctype_js = {
 
 doc_events = {
     "Supplier": {
-        "validate": "chile_custom.validations.tax_id.validate_tax_id"
+        "validate": "chile_custom.validations.tax_id.validate_tax_id",
+        "on_trash": "chile_custom.chile_custom.doctype.rut_party_index.rut_party_index.remove_from_rut_index",
+        "before_rename": "chile_custom.chile_custom.doctype.supplier_pinv_summary.supplier_pinv_summary.before_rename_supplier",
+        "after_rename": "chile_custom.chile_custom.doctype.supplier_pinv_summary.supplier_pinv_summary.after_rename_supplier",
     },
     "Customer": {
-        "validate": "chile_custom.validations.tax_id.validate_tax_id"
+        "validate": "chile_custom.validations.tax_id.validate_tax_id",
+        "on_trash": "chile_custom.chile_custom.doctype.rut_party_index.rut_party_index.remove_from_rut_index",
     },
     "Employee": {
         "validate": "chile_custom.validations.employee_rut.validate_employee_rut",
+        "on_trash": "chile_custom.chile_custom.doctype.rut_party_index.rut_party_index.remove_from_rut_index",
     },
     "Shareholder": {
         "validate": "chile_custom.validations.shareholder_rut.validate_shareholder_rut",
+        "on_trash": "chile_custom.chile_custom.doctype.rut_party_index.rut_party_index.remove_from_rut_index",
+    },
+    "Data Import": {
+        "validate": "chile_custom.validations.rut_import.validate_data_import",
+    },
+    "Purchase Invoice": {
+        "on_submit": [
+            "chile_custom.chile_custom.doctype.supplier_pinv_summary.supplier_pinv_summary.update_summary_on_submit",
+            "chile_custom.chile_custom.doctype.supplier_pinv_monthly.supplier_pinv_monthly.update_monthly_on_submit",
+        ],
+        "on_cancel": [
+            "chile_custom.chile_custom.doctype.supplier_pinv_summary.supplier_pinv_summary.update_summary_on_cancel",
+            "chile_custom.chile_custom.doctype.supplier_pinv_monthly.supplier_pinv_monthly.update_monthly_on_cancel",
+        ],
+    },
+    "GL Entry": {
+        "on_submit": [
+            "chile_custom.chile_custom.doctype.net_profit_snapshot.net_profit_snapshot.update_snapshot_on_submit",
+            "chile_custom.chile_custom.report.net_profit_timeline_por_cost_center.net_profit_timeline_por_cost_center.clear_cache",
+        ],
     }
 }
 
@@ -176,12 +201,20 @@ after_migrate = [
     "chile_custom.custom.shareholder_custom_fields.create_shareholder_custom_fields",
     "chile_custom.custom.warehouse_custom_fields.create_warehouse_project_field",
     "chile_custom.custom.location_custom_fields.create_location_custom_project_field",
-    "chile_custom.custom.expenseclaimdetail_custom_fields.create_campos_comprobante_tributario"
+    "chile_custom.custom.expenseclaimdetail_custom_fields.create_campos_comprobante_tributario",
+    "chile_custom.custom.indexes.create_indexes",
 ]
 
 # Scheduled Tasks
 # ---------------
 
+scheduler_events = {
+    "daily_long": [
+        # corrige el snapshot tras reposts (borran GL Entries sin hooks)
+        "chile_custom.chile_custom.doctype.net_profit_snapshot.net_profit_snapshot.reconcile_net_profit_snapshot",
+    ],
+}
+
 # scheduler_events = {
 # 	"all": [
 # 		"chile_custom.tasks.all"
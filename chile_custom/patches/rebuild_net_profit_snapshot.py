@@ -0,0 +1,9 @@
+from chile_custom.chile_custom.doctype.net_profit_snapshot.net_profit_snapshot import (
+    rebuild_net_profit_snapshot,
+)
+
+
+def execute():
+    # Carga inicial del snapshot (company, cost_center, project, día) con
+    # todo el GL existente
+    rebuild_net_profit_snapshot()
@@ -0,0 +1,8 @@
+from chile_custom.chile_custom.doctype.rut_party_index.rut_party_index import (
+    rebuild_rut_party_index,
+)
+
+
+def execute():
+    # Carga inicial del índice con los RUT ya existentes
+    rebuild_rut_party_index()
@@ -0,0 +1,8 @@
+from chile_custom.chile_custom.doctype.supplier_pinv_monthly.supplier_pinv_monthly import (
+    rebuild_supplier_pinv_monthly,
+)
+
+
+def execute():
+    # Carga inicial de los agregados mensuales con las PINV existentes
+    rebuild_supplier_pinv_monthly()
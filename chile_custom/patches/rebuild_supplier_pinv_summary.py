@@ -0,0 +1,8 @@
+from chile_custom.chile_custom.doctype.supplier_pinv_summary.supplier_pinv_summary import (
+    rebuild_supplier_pinv_summary,
+)
+
+
+def execute():
+    # Carga inicial del agregado con las PINV existentes
+    rebuild_supplier_pinv_summary()
@@ -2,15 +2,11 @@ frappe.ui.form.on("Address", {
     comuna(frm) {
         if (!frm.doc.comuna) return;
 
-        frappe.call({
-            method: "chile_custom.api.get_region_from_comuna",
-            args: { comuna: frm.doc.comuna },
-            callback(r) {
-                if (r.message) {
-                    frm.set_value("region", r.message.region);
-                    frm.set_value("region_numero", r.message.numero);
-                }
-            }
-        });
+        // Resolución local con el mapa de public/js/regiones_map.js (sin RPC)
+        const r = chile_custom.regiones.get_region_from_comuna(frm.doc.comuna);
+        if (r.region) {
+            frm.set_value("region", r.region);
+            frm.set_value("region_numero", r.numero);
+        }
     }
 });
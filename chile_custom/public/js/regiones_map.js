@@ -0,0 +1,23 @@
+// Generado desde chile_custom/constants/regiones.py — NO EDITAR A MANO.
+// Regenerar tras cambiar las regiones: python -m chile_custom.utils.regiones
+frappe.provide("chile_custom");
+
+chile_custom.regiones = Object.assign({"comunas":{"aisen":14,"algarrobo":5,"alhue":6,"alto biobio":10,"alto del carmen":3,"alto hospicio":1,"ancud":13,"andacollo":4,"angol":11,"antartica":15,"antofagasta":2,"antuco":10,"arauco":10,"arica":0,"buin":6,"bulnes":9,"cabildo":5,"cabo de hornos (ex navarino)":15,"cabrero":10,"calama":2,"calbuco":13,"caldera":3,"calera":5,"calera de tango":6,"calle larga":5,"camarones":0,"camina":1,"canela":4,"canete":10,"carahue":11,"cartagena":5,"casablanca":5,"castro":13,"catemu":5,"cauquenes":8,"cerrillos":6,"cerro navia":6,"chaiten":13,"chanaral":3,"chanco":8,"chepica":7,"chiguayante":10,"chile chico":14,"chillan":9,"chillan viejo":9,"chimbarongo":7,"cholchol":11,"chonchi":13,"cisnes":14,"cobquecura":9,"cochamo":13,"cochrane":14,"codegua":7,"coelemu":9,"coihaique":14,"coihueco":9,"coinco":7,"colbun":8,"colchane":1,"colina":6,"collipulli":11,"coltauco":7,"combarbala":4,"concepcion":10,"conchali":6,"concon":5,"constitucion":8,"contulmo":10,"copiapo":3,"coquimbo":4,"coronel":10,"corral":12,"cunco":11,"curacautin":11,"curacavi":6,"curaco de velez":13,"curanilahue":10,"curarrehue":11,"curepto":8,"curico":8,"dalcahue":13,"diego de almagro":3,"donihue":7,"el bosque":6,"el carmen":9,"el monte":6,"el quisco":5,"el tabo":5,"empedrado":8,"ercilla":11,"estacion central":6,"florida":10,"freire":11,"freirina":3,"fresia":13,"frutillar":13,"futaleufu":13,"futrono":12,"galvarino":11,"general lagos":0,"gorbea":11,"graneros":7,"guaitecas":14,"hijuelas":5,"hualaihue":13,"hualane":8,"hualpen":10,"hualqui":10,"huara":1,"huasco":3,"huechuraba":6,"illapel":4,"independencia":6,"iquique":1,"isla de maipo":6,"isla de pascua":5,"juan fernandez":5,"la cisterna":6,"la cruz":5,"la estrella":7,"la florida":6,"la granja":6,"la higuera":4,"la ligua":5,"la pintana":6,"la reina":6,"la serena":4,"la union":12,"lago ranco":12,"lago verde":14,"laguna blanca":15,"laja":10,"lampa":6,"lanco":12,"las cabras":7,"las condes":6,"lautaro":11,"lebu":10,"licanten":8,"limache":5,"linares":8,"litueche":7,"llaillay":5,"llanquihue":13,"lo barnechea":6,"lo espejo":6,"lo prado":6,"lolol":7,"loncoche":11,"longavi":8,"lonquimay":11,"los alamos":10,"los andes":5,"los angeles":10,"los lagos":12,"los muermos":13,"los sauces":11,"los vilos":4,"lota":10,"lumaco":11,"machali":7,"macul":6,"mafil":12,"maipu":6,"malloa":7,"marchihue":7,"maria elena":2,"maria pinto":6,"mariquina":12,"maule":8,"maullin":13,"mejillones":2,"melipeuco":11,"melipilla":6,"molina":8,"monte patria":4,"mulchen":10,"nacimiento":10,"nancagua":7,"natales":15,"navidad":7,"negrete":10,"ninhue":9,"niquen":9,"nogales":5,"nueva imperial":11,"nunoa":6,"olivar":7,"ollague":2,"olmue":5,"osorno":13,"ovalle":4,"o’higgins":14,"padre hurtado":6,"padre las casas":11,"paiguano":4,"paillaco":12,"paine":6,"palena":13,"palmilla":7,"panguipulli":12,"panquehue":5,"papudo":5,"paredones":7,"parral":8,"pedro aguirre cerda":6,"pelarco":8,"pelluhue":8,"pemuco":9,"penaflor":6,"penalolen":6,"pencahue":8,"penco":10,"peralillo":7,"perquenco":11,"petorca":5,"peumo":7,"pica":1,"pichidegua":7,"pichilemu":7,"pinto":9,"pirque":6,"pitrufquen":11,"placilla":7,"portezuelo":9,"porvenir":15,"pozo almonte":1,"primavera":15,"providencia":6,"puchuncavi":5,"pucon":11,"pudahuel":6,"puente alto":6,"puerto montt":13,"puerto octay":13,"puerto varas":13,"pumanque":7,"punitaqui":4,"punta arenas":15,"puqueldon":13,"puren":11,"purranque":13,"putaendo":5,"putre":0,"puyehue":13,"queilen":13,"quellon":13,"quemchi":13,"quilaco":10,"quilicura":6,"quilleco":10,"quillon":9,"quillota":5,"quilpue":5,"quinchao":13,"quinta de tilcoco":7,"quinta normal":6,"quintero":5,"quirihue":9,"rancagua":7,"ranquil":9,"rauco":8,"recoleta":6,"renaico":11,"renca":6,"rengo":7,"requinoa":7,"retiro":8,"rinconada":5,"rio bueno":12,"rio claro":8,"rio hurtado":4,"rio ibanez":14,"rio negro":13,"rio verde":15,"romeral":8,"saavedra":11,"sagrada familia":8,"salamanca":4,"san antonio":5,"san bernardo":6,"san carlos":9,"san clemente":8,"san esteban":5,"san fabian":9,"san felipe":5,"san fernando":7,"san francisco de mostazal":7,"san gregorio":15,"san ignacio":9,"san javier de loncomilla":8,"san joaquin":6,"san jose de maipo":6,"san juan de la costa":13,"san miguel":6,"san nicolas":9,"san pablo":13,"san pedro":6,"san pedro de atacama":2,"san pedro de la paz":10,"san rafael":8,"san ramon":6,"san rosendo":10,"san vicente de tagua tagua":7,"santa barbara":10,"santa cruz":7,"santa juana":10,"santa maria":5,"santiago":6,"santo domingo":5,"sierra gorda":2,"talagante":6,"talca":8,"talcahuano":10,"taltal":2,"temuco":11,"teno":8,"teodoro schmidt":11,"tierra amarilla":3,"tiltil":6,"timaukel":15,"tirua":10,"tocopilla":2,"tolten":11,"tome":10,"torres del paine":15,"tortel":14,"traiguen":11,"treguaco":9,"tucapel":10,"valdivia":12,"vallenar":3,"valparaiso":5,"vichuquen":8,"victoria":11,"vicuna":4,"vilcun":11,"villa alegre":8,"villa alemana":5,"villarrica":11,"vina del mar":5,"vitacura":6,"yerbas buenas":8,"yumbel":10,"yungay":9,"zapallar":5},"regiones":[["XV Región de Arica y Parinacota","XV"],["I Región de Tarapacá","I"],["II Región de Antofagasta","II"],["III Región de Atacama","III"],["IV Región de Coquimbo","IV"],["V Región de Valparaíso","V"],["XIII Región Metropolitana de Santiago","XIII"],["VI Región del Libertador General Bernardo O’Higgins","VI"],["VII Región del Maule","VII"],["XVI Región de Ñuble","XVI"],["VIII Región del Biobío","VIII"],["IX Región de La Araucanía","IX"],["XIV Región de Los Ríos","XIV"],["X Región de Los Lagos","X"],["XI Región Aysén del General Carlos Ibáñez del Campo","XI"],["XII Región de Magallanes y Antártica Chilena","XII"]]}, {
+    normalizar(nombre) {
+        return (nombre || "")
+            .normalize("NFKD")
+            .replace(/[\u0300-\u036f]/g, "")
+            .toLowerCase()
+            .split(/\s+/)
+            .filter(Boolean)
+            .join(" ");
+    },
+
+    // Mismo formato que chile_custom.api.get_region_from_comuna
+    get_region_from_comuna(comuna) {
+        const idx = this.comunas[this.normalizar(comuna)];
+        if (idx === undefined) return {};
+        const [region, numero] = this.regiones[idx];
+        return { region, numero };
+    }
+});
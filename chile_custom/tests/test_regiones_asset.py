@@ -0,0 +1,16 @@
+import unittest
+
+from chile_custom.utils.regiones import REGIONES_ASSET_PATH, build_regiones_js
+
+
+class TestRegionesAsset(unittest.TestCase):
+    def test_asset_al_dia_con_el_generador(self):
+        """public/js/regiones_map.js debe ser exactamente lo que genera build_regiones_js()."""
+        with open(REGIONES_ASSET_PATH, encoding="utf-8") as f:
+            versionado = f.read()
+
+        self.assertEqual(
+            versionado,
+            build_regiones_js(),
+            "regiones_map.js desactualizado: correr `python -m chile_custom.utils.regiones` y commitear.",
+        )
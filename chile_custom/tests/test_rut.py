@@ -0,0 +1,50 @@
+import random
+import unittest
+
+from chile_custom.benchmarks.rut import (
+    _dv_customer_creator,
+    _dv_employee_creator,
+    _dv_utils_rut,
+    generar_ruts,
+)
+from chile_custom.utils.rut import RUT_ERROR_DV, RUT_ERROR_FORMATO, calculate_dv, normalize_ruts
+
+
+class TestCalculateDv(unittest.TestCase):
+    def test_equivale_a_las_implementaciones_anteriores(self):
+        """
+        Property-based: para cuerpos aleatorios (1 a 30 dígitos, como int y
+        como str) calculate_dv coincide con las 3 versiones anteriores.
+        """
+        rnd = random.Random(42)
+        casos = [0, 1, 9, 10, 11, 1_000_000, 99_999_999]
+        casos += [rnd.randint(0, 10 ** rnd.randint(1, 30)) for _ in range(20_000)]
+
+        for numero in casos:
+            for cuerpo in (numero, str(numero)):
+                esperado = _dv_utils_rut(cuerpo)
+                self.assertEqual(calculate_dv(cuerpo), esperado, cuerpo)
+                self.assertEqual(_dv_employee_creator(cuerpo), esperado, cuerpo)
+                self.assertEqual(_dv_customer_creator(cuerpo), esperado, cuerpo)
+
+
+class TestNormalizeRuts(unittest.TestCase):
+    def test_formatos_mixtos(self):
+        ruts = generar_ruts(2_000, porcentaje_invalidos=0.1)
+        valores, errores = normalize_ruts(ruts)
+
+        for rut, valor, error in zip(ruts, valores, errores):
+            if error is not None:
+                self.assertEqual(error, RUT_ERROR_DV, rut)
+                continue
+
+            cuerpo, dv = valor.split("-")
+            self.assertEqual(dv, calculate_dv(cuerpo), rut)
+            self.assertEqual("".join(c for c in rut if c.isalnum()).upper(), cuerpo + dv, rut)
+
+    def test_errores_por_fila(self):
+        valores, errores = normalize_ruts(["12345678-5", "no-es-rut", 123, None, "11111111-1"])
+
+        self.assertEqual(valores[0], "12345678-5")
+        self.assertEqual(errores[1], RUT_ERROR_FORMATO)
+        self.assertEqual(errores[4], None)
@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+
+from chile_custom.benchmarks.suite import _metricas, comparar
+
+
+class TestComparar(unittest.TestCase):
+    def _comparar(self, base, actual, **kwargs):
+        with tempfile.TemporaryDirectory() as tmp:
+            rutas = []
+            for nombre, resultados in (("base", base), ("actual", actual)):
+                ruta = os.path.join(tmp, f"{nombre}.json")
+                with open(ruta, "w", encoding="utf-8") as f:
+                    json.dump({"resultados": resultados}, f)
+                rutas.append(ruta)
+
+            return comparar(*rutas, **kwargs)
+
+    def test_throughput_no_es_metrica_de_tiempo(self):
+        """*_por_seg y *_por_s (JSON antiguos) son mayor-es-mejor aunque terminen en _s."""
+        metricas = dict((n, m) for n, _, m in _metricas({
+            "rut": {"batch_ruts_por_seg": 1, "batch_ruts_por_s": 1, "batch_s": 1, "query_ms": 1},
+        }))
+
+        self.assertEqual(metricas, {
+            "rut.batch_ruts_por_seg": True,
+            "rut.batch_ruts_por_s": True,
+            "rut.batch_s": False,
+            "rut.query_ms": False,
+        })
+
+    def test_caida_de_throughput_es_regresion(self):
+        regresiones = self._comparar(
+            {"rut": {"batch_ruts_por_seg": 1000, "batch_s": 1.0}},
+            {"rut": {"batch_ruts_por_seg": 500, "batch_s": 1.0}},
+        )
+
+        self.assertEqual([r["metrica"] for r in regresiones], ["batch_ruts_por_seg"])
+        self.assertEqual(regresiones[0]["cambio"], -0.5)
+
+    def test_alza_de_throughput_no_es_regresion(self):
+        regresiones = self._comparar(
+            {"rut": {"batch_ruts_por_seg": 1000}},
+            {"rut": {"batch_ruts_por_seg": 2000}},
+        )
+
+        self.assertEqual(regresiones, [])
+
+    def test_alza_de_tiempo_es_regresion(self):
+        regresiones = self._comparar(
+            {"pinv_ranking": {"top10_count_company_ms": 40.0}, "creadores": {"pinv": {"total_s": 10.0}}},
+            {"pinv_ranking": {"top10_count_company_ms": 80.0}, "creadores": {"pinv": {"total_s": 11.0}}},
+        )
+
+        self.assertEqual([r["metrica"] for r in regresiones], ["top10_count_company_ms"])
@@ -0,0 +1,37 @@
+import unittest
+from datetime import date, timedelta
+
+from chile_custom.utils.timeline import CHART_MAX_POINTS, CHART_MAX_SERIES, report_result
+
+
+class TestReportResult(unittest.TestCase):
+    def setUp(self):
+        n_fechas, n_series = 1000, 30
+        self.columns = [{"fieldname": "day", "label": "Date"}] + [
+            {"fieldname": f"cc_{i}", "label": f"CC {i}"} for i in range(n_series)
+        ]
+        inicio = date(2024, 1, 1)
+        self.data = [
+            {"day": inicio + timedelta(days=d), **{f"cc_{i}": float(d * i) for i in range(n_series)}}
+            for d in range(n_fechas)
+        ]
+
+    def test_por_defecto_trae_filas_y_grafico_reducido(self):
+        columns, data, _, chart = report_result(self.columns, self.data)
+
+        self.assertIs(data, self.data)
+        self.assertNotIn("columnar", chart)
+        self.assertEqual(len(chart["data"]["labels"]), CHART_MAX_POINTS)
+        self.assertEqual(len(chart["data"]["datasets"]), CHART_MAX_SERIES)
+
+    def test_columnar_sin_filas_y_mismo_grafico(self):
+        _, _, _, chart_filas = report_result(self.columns, self.data)
+        columns, data, _, chart = report_result(self.columns, self.data, columnar=True)
+
+        self.assertEqual(data, [])
+        self.assertEqual(chart["data"], chart_filas["data"])
+        self.assertEqual(len(chart["columnar"]["dates"]), len(self.data))
+        self.assertEqual(len(chart["columnar"]["series"]), len(self.columns) - 1)
+
+    def test_columnar_sin_datos(self):
+        self.assertEqual(report_result(self.columns, [], columnar=True), (self.columns, [], None, None))
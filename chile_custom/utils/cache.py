@@ -0,0 +1,84 @@
+# File: chile_custom/utils/cache.py
+# ---------------------------------------------------------
+# Cache de resultados en Redis (frappe.cache) con TTL e invalidación
+# explícita por "generación".
+#
+# Cada namespace tiene una generación guardada en cache. La key de cada
+# resultado incluye esa generación, así invalidar todo el namespace es un
+# solo SET (no hay que recorrer keys).
+# ---------------------------------------------------------
+
+import hashlib
+import json
+
+import frappe
+
+
+def _generation_key(namespace: str) -> str:
+    return f"chile_custom|{namespace}|generation"
+
+
+def get_generation(namespace: str) -> str:
+    generation = frappe.cache().get_value(_generation_key(namespace))
+    if not generation:
+        generation = invalidate(namespace)
+    return generation
+
+
+def invalidate(namespace: str) -> str:
+    """Invalida todos los resultados cacheados del namespace."""
+    generation = frappe.generate_hash(length=10)
+    frappe.cache().set_value(_generation_key(namespace), generation)
+    return generation
+
+
+def invalidate_after_commit(namespace: str):
+    """
+    Invalida el namespace DESPUÉS del commit de la transacción en curso (una
+    sola vez por transacción). Invalidar antes del commit deja una ventana
+    en que un lector concurrente vuelve a llenar el cache con datos viejos.
+    """
+    pendientes = frappe.flags.cache_invalidate_after_commit
+    if pendientes is None:
+        pendientes = frappe.flags.cache_invalidate_after_commit = set()
+
+    if namespace in pendientes:
+        return
+
+    if not pendientes:
+        frappe.db.after_commit.add(_flush_pending_invalidations)
+        frappe.db.after_rollback.add(_clear_pending_invalidations)
+
+    pendientes.add(namespace)
+
+
+def _flush_pending_invalidations():
+    for namespace in _clear_pending_invalidations():
+        invalidate(namespace)
+
+
+def _clear_pending_invalidations() -> set:
+    pendientes = frappe.flags.cache_invalidate_after_commit or set()
+    frappe.flags.cache_invalidate_after_commit = None
+    return pendientes
+
+
+def make_key(namespace: str, *parts) -> str:
+    raw = json.dumps(parts, default=str, sort_keys=True)
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return f"chile_custom|{namespace}|{get_generation(namespace)}|{digest}"
+
+
+def get_or_set(namespace: str, parts, generator, ttl: int):
+    """
+    Devuelve el valor cacheado para (namespace, parts) o lo calcula con
+    generator() y lo guarda por `ttl` segundos.
+    """
+    key = make_key(namespace, *parts)
+
+    value = frappe.cache().get_value(key)
+    if value is None:
+        value = generator()
+        frappe.cache().set_value(key, value, expires_in_sec=ttl)
+
+    return value
@@ -17,6 +17,8 @@ import random
 import unicodedata
 import frappe
 
+from chile_custom.utils.rut import calculate_dv
+
 # Probabilidades para tipo de cliente
 PROB_COMERCIAL = 0.90
 PROB_GOBIERNO  = 0.10
@@ -74,21 +76,10 @@ DOMINIOS_FAKE = [
 # -----------------------------------------------------------
 # UTILIDADES
 # -----------------------------------------------------------
-def calcular_dv(rut):
-    rut = str(rut)
-    reversed_digits = map(int, reversed(rut))
-    factors = [2,3,4,5,6,7]
-    s = sum(d * factors[i % 6] for i, d in enumerate(reversed_digits))
-    dv = 11 - (s % 11)
-    if dv == 11: return "0"
-    if dv == 10: return "K"
-    return str(dv)
-
-
 def generar_rut_unico(usados):
     while True:
         base = random.randint(90000000, 99999999)
-        dv = calcular_dv(base)
+        dv = calculate_dv(base)
         rut = f"{base}-{dv}"
         if rut not in usados:
             usados.add(rut)
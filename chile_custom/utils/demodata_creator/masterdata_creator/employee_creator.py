@@ -235,10 +235,8 @@ MARITAL_STATUSES = ["Single", "Married", "Divorced", "Widowed"]
 
 COMPANY_START_DATE = date(2013, 1, 1)
 
-try:
-    from chile_custom.constants.regiones import regiones
-except Exception:
-    regiones = {}
+from chile_custom.utils.regiones import COMUNAS_POR_REGION, NOMBRES_REGIONES
+from chile_custom.utils.rut import calculate_dv
 
 fake = Faker("es_CL")
 
@@ -261,30 +259,13 @@ def generate_rut(existing_ruts: set, min_num=60000000, max_num=99999999) -> str:
     """
     while True:
         base = random.randint(min_num, max_num)
-        dv = calculate_rut_dv(base)
+        dv = calculate_dv(base)
         rut = f"{base}-{dv}"
         if rut not in existing_ruts:
             existing_ruts.add(rut)
             return rut
 
 
-def calculate_rut_dv(number: int) -> str:
-    """Cálculo estándar módulo 11 para DV de RUT."""
-    s = 0
-    multiplier = 2
-    for d in reversed(str(number)):
-        s += int(d) * multiplier
-        multiplier += 1
-        if multiplier > 7:
-            multiplier = 2
-    remainder = 11 - (s % 11)
-    if remainder == 11:
-        return "0"
-    if remainder == 10:
-        return "K"
-    return str(remainder)
-
-
 def generate_gender() -> str:
     # 65% male, 35% female
     return "Male" if random.random() < 0.65 else "Female"
@@ -490,48 +471,14 @@ def generate_personal_email(first_name: str, last_name: str) -> str:
 
 def random_region_and_city() -> tuple[str, str]:
     """
-    Devuelve (city, region), compatible con estructuras como:
-
-    regiones = [
-        {
-            "region": "II Región de Antofagasta",
-            "numero": "II",
-            "comunas": ["Antofagasta", "Calama", ...]
-        },
-        ...
-    ]
+    Devuelve (city, region) usando los índices precalculados de
+    chile_custom.utils.regiones (región al azar y luego una de sus comunas).
     """
-
-    # Caso: lista de dicts con clave 'region' y 'comunas'
-    if isinstance(regiones, list) and regiones and isinstance(regiones[0], dict):
-        entry = random.choice(regiones)
-        region_name = entry.get("region") or "Región sin nombre"
-
-        comunas = entry.get("comunas") or []
-        if comunas:
-            comuna = random.choice(comunas)
-        else:
-            comuna = region_name
-
-        return comuna, region_name
-
-    # Caso: dict clásico {"Región": ["comunas"]}
-    if isinstance(regiones, dict) and regiones:
-        region_name = random.choice(list(regiones.keys()))
-        comunas = regiones.get(region_name) or []
-        if comunas:
-            return random.choice(comunas), region_name
-        return region_name, region_name
-
-    # Fallback si regiones viene vacío
-    regiones_demo = {
-        "Región Metropolitana": ["Santiago", "Ñuñoa", "Providencia"],
-        "Biobío": ["Concepción", "Talcahuano"],
-    }
-
-    region_name = random.choice(list(regiones_demo.keys()))
-    comuna = random.choice(regiones_demo[region_name])
-    return comuna, region_name
+    region_name = random.choice(NOMBRES_REGIONES)
+    comunas = COMUNAS_POR_REGION[region_name]
+    if comunas:
+        return random.choice(comunas), region_name
+    return region_name, region_name
 
 
 
@@ -0,0 +1,158 @@
+# File: chile_custom/utils/demodata_creator/transactional_data/cache_ejecucion.py
+# ---------------------------------------------------------
+# Cache en memoria para UNA ejecución de los creadores de facturas demo
+# (pinv_proyecto_creator / sinv_proyecto_creator).
+#
+# Cada factura necesitaba la plantilla de impuestos (get_doc + copiar y
+# limpiar cada fila), los datos de cada ítem (standard_rate, stock_uom, ...)
+# y datos de la Company; aquí se leen una sola vez por ejecución. Los ítems
+# se cargan en una sola consulta (snapshot del maestro de Item).
+#
+# Vive en frappe.local (por request / job) y se reinicia al comenzar cada
+# creador con reiniciar(). Para compartirlo entre varias llamadas (p. ej.
+# PINV y SINV de muchos proyectos en la misma sesión) usar:
+#
+#     with cache_ejecucion.ejecucion():
+#         crear_pinv_para_proyecto(...)
+#         crear_facturas_venta_proyecto(...)
+# ---------------------------------------------------------
+
+from contextlib import contextmanager
+
+import frappe
+
+# Metadatos de la fila de la plantilla que no deben copiarse a la factura
+TAX_ROW_SKIP_FIELDS = ("name", "parent", "parenttype", "parentfield", "idx", "doctype")
+
+# Campos del snapshot de Item
+ITEM_SNAPSHOT_FIELDS = [
+    "name",
+    "item_name",
+    "standard_rate",
+    "stock_uom",
+    "is_stock_item",
+    "item_group",
+    "disabled",
+    "is_purchase_item",
+    "is_fixed_asset",
+]
+
+
+def reiniciar():
+    """
+    Vacía el cache (al comienzo de cada ejecución). Dentro de un bloque
+    ejecucion() no hace nada: el cache se comparte hasta que el bloque termina.
+    """
+    if getattr(frappe.local, "demo_cache_compartido", False):
+        return
+
+    frappe.local.demo_cache_ejecucion = {}
+
+
+@contextmanager
+def ejecucion():
+    """Comparte un mismo cache entre todas las llamadas a creadores del bloque."""
+    frappe.local.demo_cache_ejecucion = {}
+    frappe.local.demo_cache_compartido = True
+    try:
+        yield
+    finally:
+        frappe.local.demo_cache_compartido = False
+        frappe.local.demo_cache_ejecucion = {}
+
+
+def _cache() -> dict:
+    cache = getattr(frappe.local, "demo_cache_ejecucion", None)
+    if cache is None:
+        cache = frappe.local.demo_cache_ejecucion = {}
+    return cache
+
+
+def get_tax_template(template_doctype: str, company: str):
+    """
+    Devuelve (nombre de la plantilla default de la compañía, filas de impuesto).
+
+    Las filas vienen ya limpias (sin name/parent/idx/...) y son copias nuevas
+    en cada llamada, listas para doc.append("taxes", fila).
+    """
+
+    cache = _cache()
+    key = ("tax_template", template_doctype, company)
+
+    if key not in cache:
+        template_name = frappe.db.get_value(
+            template_doctype,
+            {"is_default": 1, "company": company},
+            "name",
+        )
+
+        rows = []
+        if template_name:
+            template = frappe.get_doc(template_doctype, template_name)
+            for t in template.taxes:
+                row = t.as_dict()
+                for field in TAX_ROW_SKIP_FIELDS:
+                    row.pop(field, None)
+                rows.append(row)
+
+        cache[key] = (template_name, rows)
+
+    template_name, rows = cache[key]
+    return template_name, [dict(row) for row in rows]
+
+
+def get_item_snapshot() -> dict:
+    """
+    Snapshot del maestro de Item: {item_code: fila con ITEM_SNAPSHOT_FIELDS},
+    cargado en UNA consulta por ejecución (mismo orden que frappe.get_all).
+    """
+    cache = _cache()
+
+    if "items" not in cache:
+        cache["items"] = {
+            item.name: item
+            for item in frappe.get_all("Item", fields=ITEM_SNAPSHOT_FIELDS)
+        }
+
+    return cache["items"]
+
+
+def get_item(item_code: str):
+    """Fila del snapshot para item_code (o None si no existe)."""
+    return get_item_snapshot().get(item_code)
+
+
+def get_item_stock_uom(item_code: str) -> str | None:
+    """stock_uom del ítem (desde el snapshot)."""
+    item = get_item(item_code)
+    return item.stock_uom if item else None
+
+
+def find_item_code(item_name: str) -> str | None:
+    """
+    Item.name cuyo item_name es `item_name` (sin distinguir mayúsculas);
+    si no hay, el primero cuyo item_name lo contenga (como el LIKE %...%).
+    """
+    buscado = item_name.casefold()
+    items = get_item_snapshot().values()
+
+    for item in items:
+        if (item.item_name or "").casefold() == buscado:
+            return item.name
+
+    for item in items:
+        if buscado in (item.item_name or "").casefold():
+            return item.name
+
+    return None
+
+
+def get_company_value(company: str, fieldname: str):
+    """Campo de la Company, p. ej. default_currency (memoizado)."""
+    cache = _cache()
+    key = ("company", company, fieldname)
+
+    if key not in cache:
+        cache[key] = frappe.db.get_value("Company", company, fieldname)
+
+    return cache[key]
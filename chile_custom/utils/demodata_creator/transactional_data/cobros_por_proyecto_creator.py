@@ -2,6 +2,14 @@ import frappe
 from datetime import timedelta
 import random
 
+from chile_custom.utils.demodata_creator.transactional_data.project_utils import (
+    get_facturas_agrupadas_por_proyecto,
+    get_facturas_por_proyecto,
+)
+
+
+SINV_FIELDS = ["name", "customer", "posting_date", "grand_total", "outstanding_amount"]
+
 
 def crear_cobros_para_proyecto(
     company: str,
@@ -25,45 +33,117 @@ def crear_cobros_para_proyecto(
     - Outstanding real siempre correcto
     """
 
-    if seed is not None:
-        random.seed(seed)
-
     # -------------------------------------------------
-    # 1. Obtener SINV submitted
+    # 1. SINV submitted del proyecto (según el proyecto de sus ítems),
+    #    con outstanding incluido, en una sola consulta
     # -------------------------------------------------
-    sinv_all = frappe.get_all(
-        "Sales Invoice",
-        filters={"docstatus": 1},
-        fields=["name", "customer", "posting_date", "grand_total"],
-        order_by="posting_date asc"
+    sinv = get_facturas_por_proyecto("Sales Invoice", project_name, SINV_FIELDS)
+
+    if not sinv:
+        print(f"⚠️ No se encontraron SINV para proyecto '{project_name}' usando ítems.")
+        return []
+
+    # cuenta por cobrar desde Company (una sola vez)
+    cuenta_por_cobrar = frappe.db.get_value(
+        "Company", company, "default_receivable_account"
     )
 
-    sinv = []
+    return _crear_cobros(
+        company,
+        project_name,
+        sinv,
+        cuenta_banco,
+        cuenta_por_cobrar,
+        seed,
+        porcentaje_30_dias,
+        porcentaje_contado,
+        porcentaje_60_dias,
+        porcentaje_sin_cobrar,
+    )
 
-    # -------------------------------------------------
-    # 2. Filtrar por proyecto desde los ítems
-    # -------------------------------------------------
-    for inv in sinv_all:
-        items = frappe.get_all(
-            "Sales Invoice Item",
-            filters={"parent": inv.name},
-            fields=["project"]
+
+def crear_cobros_todos_los_proyectos(
+    company: str,
+    cuenta_banco: str,
+    seed: int | None = 42,
+    seeds: dict | None = None,
+    projects: list[str] | None = None,
+    porcentaje_30_dias: float = 0.7,
+    porcentaje_contado: float = 0.2,
+    porcentaje_60_dias: float = 0.1,
+    porcentaje_sin_cobrar: float = 0.10,
+):
+    """
+    Igual que crear_cobros_para_proyecto pero para TODOS los proyectos (o los
+    de `projects`) en una sola pasada: las SINV se leen con UNA consulta y se
+    particionan por el proyecto de sus ítems.
+
+    Cada proyecto se siembra con seeds.get(proyecto, seed), igual que si se
+    llamara a crear_cobros_para_proyecto proyecto a proyecto.
+
+    Devuelve {proyecto: [Payment Entries creados]}.
+
+    Para ejecutarlo:
+        bench --site [site] execute chile_custom.utils.demodata_creator.transactional_data.cobros_por_proyecto_creator.crear_cobros_todos_los_proyectos --kwargs "{'company': '...', 'cuenta_banco': '...'}"
+    """
+
+    sinv_por_proyecto = get_facturas_agrupadas_por_proyecto(
+        "Sales Invoice", SINV_FIELDS, company=company, projects=projects
+    )
+
+    if not sinv_por_proyecto:
+        print("⚠️ No se encontraron SINV con proyecto en sus ítems.")
+        return {}
+
+    cuenta_por_cobrar = frappe.db.get_value(
+        "Company", company, "default_receivable_account"
+    )
+
+    seeds = seeds or {}
+    creados = {}
+
+    for project_name in sorted(sinv_por_proyecto):
+        print(f"\n📁 Proyecto {project_name}")
+        creados[project_name] = _crear_cobros(
+            company,
+            project_name,
+            sinv_por_proyecto[project_name],
+            cuenta_banco,
+            cuenta_por_cobrar,
+            seeds.get(project_name, seed),
+            porcentaje_30_dias,
+            porcentaje_contado,
+            porcentaje_60_dias,
+            porcentaje_sin_cobrar,
         )
 
-        if not items:
-            continue
+    total = sum(len(v) for v in creados.values())
+    print(f"\n🏁 COBROS TODOS LOS PROYECTOS: {total} Payment Entries en {len(creados)} proyectos.")
+    return creados
 
-        project_item = next((it.project for it in items if it.project), None)
 
-        if project_item == project_name:
-            sinv.append(inv)
+def _crear_cobros(
+    company: str,
+    project_name: str,
+    sinv: list,
+    cuenta_banco: str,
+    cuenta_por_cobrar: str | None,
+    seed: int | None,
+    porcentaje_30_dias: float,
+    porcentaje_contado: float,
+    porcentaje_60_dias: float,
+    porcentaje_sin_cobrar: float,
+):
+    """
+    Crea los cobros de las SINV (ya filtradas y ordenadas por fecha) de UN
+    proyecto. Núcleo común del modo por proyecto y del modo masivo.
+    """
 
-    if not sinv:
-        print(f"⚠️ No se encontraron SINV para proyecto '{project_name}' usando ítems.")
-        return []
+    if seed is not None:
+        random.seed(seed)
 
     # -------------------------------------------------
-    # 3. Sin cobrar (las últimas)
+    # 2. Sin cobrar (las últimas)
     # -------------------------------------------------
     n_total = len(sinv)
     n_sin_cobrar = int(n_total * porcentaje_sin_cobrar)
@@ -82,19 +162,20 @@ def crear_cobros_para_proyecto(
     p0  = porcentaje_contado   / total_p
     p60 = porcentaje_60_dias  / total_p
 
+    if not cuenta_por_cobrar and sinv_a_cobrar:
+        raise Exception(
+            f"La compañía {company} no tiene configurada default_receivable_account."
+        )
+
     creados = []
 
     # -------------------------------------------------
-    # 4. Crear Payment Entries de cobro
+    # 3. Crear Payment Entries de cobro
     # -------------------------------------------------
     for inv in sinv_a_cobrar:
 
-        # outstanding real
-        outstanding = frappe.db.get_value(
-            "Sales Invoice",
-            inv.name,
-            "outstanding_amount"
-        )
+        # outstanding real (cada cobro sólo afecta a su propia factura)
+        outstanding = inv.outstanding_amount
 
         if not outstanding or outstanding <= 0:
             print(f"⚠️ SINV {inv.name} ya está cobrada, saltando…")
@@ -111,16 +192,6 @@ def crear_cobros_para_proyecto(
 
         posting_date = inv.posting_date + timedelta(days=dias)
 
-        # cuenta por cobrar desde Company
-        cuenta_por_cobrar = frappe.db.get_value(
-            "Company", company, "default_receivable_account"
-        )
-
-        if not cuenta_por_cobrar:
-            raise Exception(
-                f"La compañía {company} no tiene configurada default_receivable_account."
-            )
-
         # -------------------------------------------------
         # Crear Payment Entry (Receive)
         # -------------------------------------------------
@@ -0,0 +1,347 @@
+# File: chile_custom/utils/demodata_creator/transactional_data/orquestador.py
+# ---------------------------------------------------------
+# Orquestador de la generación de datos transaccionales demo.
+#
+# Reparte la generación por proyecto en jobs RQ (frappe.enqueue): cada
+# worker tiene su propia conexión a la BD, así varios proyectos se generan
+# en paralelo en vez de correr horas en una sola sesión de bench console.
+#
+# Respeta las dependencias en dos fases:
+#   1. Facturas de compra / venta, remuneraciones y rendiciones de gastos
+#   2. Pagos (PINV), cobros (SINV) y pago de sueldos
+# La fase 2 sólo se encola cuando TODOS los jobs de la fase 1 terminaron OK.
+# La espera de cada fase tiene un plazo (timeout_fase) y un máximo de jobs
+# fallidos (max_fallidos): al superarlos se cancelan los jobs aún en cola y
+# se informan los que quedaron sin terminar.
+#
+# Cada job se encola con job_id estable y deduplicate=True: re-ejecutar el
+# orquestador mientras un proyecto sigue en cola o corriendo no lo encola
+# de nuevo, sino que espera el job existente.
+#
+# Para ejecutarlo:
+#   bench --site [site] execute chile_custom.utils.demodata_creator.transactional_data.orquestador.generar_datos_demo --kwargs "{'company': '...', 'proyectos': [...], 'cuenta_banco': '...'}"
+# ---------------------------------------------------------
+
+import time
+
+import frappe
+from frappe.utils.background_jobs import get_job
+
+from chile_custom.utils.demodata_creator.transactional_data import cache_ejecucion
+
+
+MODULO = "chile_custom.utils.demodata_creator.transactional_data"
+
+QUEUE = "long"
+JOB_TIMEOUT = 4 * 3600
+POLL_INTERVAL = 5
+PHASE_TIMEOUT = JOB_TIMEOUT + 1800
+MAX_FALLIDOS = 0
+
+ESTADOS_FINALES = ("finished", "failed", "stopped", "canceled")
+
+
+def generar_datos_demo(
+    company: str,
+    proyectos: list[dict],
+    cuenta_banco: str | None = None,
+    cuenta_gasto_rem: str | None = None,
+    cuenta_sueldos_por_pagar: str = "02.01.03.01 - Sueldos por Pagar - CH",
+    seed: int | None = 42,
+    modo: str = "rq",
+    queue: str = QUEUE,
+    poll_interval: int = POLL_INTERVAL,
+    timeout_fase: int = PHASE_TIMEOUT,
+    max_fallidos: int = MAX_FALLIDOS,
+):
+    """
+    Genera los datos transaccionales demo de varios proyectos.
+
+    `proyectos` es una lista de dicts, uno por proyecto. Sólo se generan los
+    documentos cuyos parámetros vienen informados:
+
+        {
+            "project": "PROJ-0003",
+            "presupuesto_compras": 200_000_000,         # → crear_pinv_para_proyecto
+            "n_pinv": 30,
+            "presupuesto_ventas": 260_000_000,          # → crear_facturas_venta_proyecto
+            "presupuesto_remuneraciones": 120_000_000,  # → crear_remuneraciones_para_proyecto
+            "expense_claims": 20,                       # → crear_expense_claims_para_proyecto
+            "seed": 7,                                  # opcional, por defecto `seed`
+        }
+
+    Los pagos / cobros de la fase 2 requieren `cuenta_banco`.
+
+    modo:
+        - "rq":     un job por (proyecto, generador) en la cola `queue`
+        - "serial": todo en este mismo proceso (útil para depurar)
+
+    En modo "rq" la espera de cada fase se corta a los `timeout_fase`
+    segundos o cuando fallan más de `max_fallidos` jobs.
+
+    Devuelve {fase: {job: resultado o estado}}.
+    """
+
+    if modo not in ("rq", "serial"):
+        frappe.throw(f"Modo inválido: {modo}. Use 'rq' o 'serial'.")
+
+    fases = _armar_fases(
+        company,
+        proyectos,
+        cuenta_banco,
+        cuenta_gasto_rem,
+        cuenta_sueldos_por_pagar,
+        seed,
+    )
+
+    resultados = {}
+    inicio = time.perf_counter()
+
+    for nombre_fase, tareas in fases:
+        if not tareas:
+            continue
+
+        print(f"\n🚀 {nombre_fase}: {len(tareas)} jobs ({modo})")
+
+        if modo == "serial":
+            resultados[nombre_fase] = _ejecutar_serial(tareas)
+        else:
+            resultados[nombre_fase] = _ejecutar_rq(tareas, queue, poll_interval, timeout_fase, max_fallidos)
+
+    print(f"\n🏁 Datos demo generados para {len(proyectos)} proyectos "
+          f"en {time.perf_counter() - inicio:,.0f}s.")
+    return resultados
+
+
+# ---------------------------------------------------------
+# Armado de tareas
+# ---------------------------------------------------------
+
+def _armar_fases(
+    company: str,
+    proyectos: list[dict],
+    cuenta_banco: str | None,
+    cuenta_gasto_rem: str | None,
+    cuenta_sueldos_por_pagar: str,
+    seed: int | None,
+):
+    """
+    Devuelve [(nombre_fase, [(job_name, método, kwargs)])] en orden de
+    dependencia.
+    """
+
+    documentos = []
+    pagos = []
+
+    for p in proyectos:
+        project = p["project"]
+        project_seed = p.get("seed", seed)
+
+        if p.get("presupuesto_compras"):
+            documentos.append((
+                f"PINV {project}",
+                f"{MODULO}.pinv_proyecto_creator.crear_pinv_para_proyecto",
+                {
+                    "company": company,
+                    "project_name": project,
+                    "presupuesto_total": p["presupuesto_compras"],
+                    "n_pinv": p.get("n_pinv", 20),
+                    "seed": project_seed,
+                },
+            ))
+
+        if p.get("presupuesto_ventas"):
+            documentos.append((
+                f"SINV {project}",
+                f"{MODULO}.sinv_proyecto_creator.crear_facturas_venta_proyecto",
+                {
+                    "project_name": project,
+                    "presupuesto_total": p["presupuesto_ventas"],
+                    "seed": project_seed,
+                },
+            ))
+
+        if p.get("presupuesto_remuneraciones"):
+            if not cuenta_gasto_rem:
+                frappe.throw("Falta cuenta_gasto_rem para generar remuneraciones.")
+
+            documentos.append((
+                f"Remuneraciones {project}",
+                f"{MODULO}.remuneraciones_proyecto_creator.crear_remuneraciones_para_proyecto",
+                {
+                    "company": company,
+                    "project_name": project,
+                    "presupuesto_total": p["presupuesto_remuneraciones"],
+                    "cuenta_gasto_rem": cuenta_gasto_rem,
+                    "cuenta_sueldos_por_pagar": cuenta_sueldos_por_pagar,
+                    "seed": project_seed,
+                },
+            ))
+
+        if p.get("expense_claims"):
+            documentos.append((
+                f"Expense Claims {project}",
+                f"{MODULO}.expenseclaim_creator.crear_expense_claims_para_proyecto",
+                {
+                    "project_name": project,
+                    "company": company,
+                    "cantidad": p["expense_claims"],
+                },
+            ))
+
+        if not cuenta_banco:
+            continue
+
+        if p.get("presupuesto_compras"):
+            pagos.append((
+                f"Pagos {project}",
+                f"{MODULO}.pagos_por_proyecto_creator.crear_pagos_para_proyecto",
+                {"company": company, "project_name": project, "cuenta_banco": cuenta_banco, "seed": project_seed},
+            ))
+
+        if p.get("presupuesto_ventas"):
+            pagos.append((
+                f"Cobros {project}",
+                f"{MODULO}.cobros_por_proyecto_creator.crear_cobros_para_proyecto",
+                {"company": company, "project_name": project, "cuenta_banco": cuenta_banco, "seed": project_seed},
+            ))
+
+        if p.get("presupuesto_remuneraciones"):
+            pagos.append((
+                f"Sueldos {project}",
+                f"{MODULO}.pago_sueldos_por_proyecto.pagar_sueldos_por_proyecto",
+                {
+                    "company": company,
+                    "project_name": project,
+                    "cuenta_sueldos_por_pagar": cuenta_sueldos_por_pagar,
+                    "cuenta_banco": cuenta_banco,
+                    "seed": project_seed,
+                },
+            ))
+
+    return [
+        ("Fase 1 (facturas, remuneraciones, gastos)", documentos),
+        ("Fase 2 (pagos y cobros)", pagos),
+    ]
+
+
+# ---------------------------------------------------------
+# Ejecución
+# ---------------------------------------------------------
+
+def _ejecutar_serial(tareas):
+    """Ejecuta las tareas una a una en este proceso, compartiendo el cache de ejecución."""
+
+    resultados = {}
+
+    # un solo snapshot de Item / plantillas para todos los proyectos
+    with cache_ejecucion.ejecucion():
+        for i, (job_name, metodo, kwargs) in enumerate(tareas, start=1):
+            resultados[job_name] = frappe.get_attr(metodo)(**kwargs)
+            print(f"⏱ {i}/{len(tareas)} — {job_name} ✔")
+
+    return resultados
+
+
+def _ejecutar_rq(
+    tareas,
+    queue: str,
+    poll_interval: int,
+    timeout_fase: int = PHASE_TIMEOUT,
+    max_fallidos: int = MAX_FALLIDOS,
+):
+    """
+    Encola una tarea por job y espera a que terminen todas, informando el
+    avance. Deja de esperar al vencer `timeout_fase` o cuando fallan más de
+    `max_fallidos` jobs; en ese caso cancela los jobs que siguen en cola.
+    Si alguna falla o queda sin terminar se detiene aquí (las fases
+    siguientes dependen de ésta).
+    """
+
+    jobs = {}
+    for job_name, metodo, kwargs in tareas:
+        # job_id estable por tarea (job_name incluye el proyecto)
+        job_id = f"demodata::{job_name}"
+        job = frappe.enqueue(
+            metodo,
+            queue=queue,
+            timeout=JOB_TIMEOUT,
+            job_id=job_id,
+            deduplicate=True,
+            **kwargs,
+        )
+        if job is None:
+            # ya estaba en cola o corriendo (re-ejecución del orquestador):
+            # se espera el job existente en vez de encolar otro
+            job = get_job(job_id)
+            print(f"⚠️ {job_name}: ya estaba encolado, se espera el job existente")
+        jobs[job_name] = job
+
+    estados = {}
+    fallidos = []
+    limite = time.monotonic() + timeout_fase
+
+    while len(estados) < len(jobs):
+        if time.monotonic() >= limite:
+            print(f"⌛ Plazo de {timeout_fase:,}s vencido")
+            break
+        if len(fallidos) > max_fallidos:
+            print(f"⛔ {len(fallidos)} jobs con error (máximo {max_fallidos})")
+            break
+
+        time.sleep(poll_interval)
+
+        for job_name, job in jobs.items():
+            if job_name in estados:
+                continue
+
+            estado = job.get_status(refresh=True)
+            if estado in ESTADOS_FINALES:
+                estados[job_name] = estado
+                if estado != "finished":
+                    fallidos.append(job_name)
+                    print(f"❌ {job_name}: {estado}")
+
+        print(f"⏱ {len(estados)}/{len(jobs)} jobs terminados ({len(fallidos)} con error)")
+
+    pendientes = _cancelar_pendientes(jobs, estados)
+
+    errores = []
+    if fallidos:
+        errores.append("Jobs con error: " + ", ".join(fallidos))
+    if pendientes:
+        errores.append(
+            "Jobs sin terminar: "
+            + ", ".join(f"{name} ({estado})" for name, estado in pendientes.items())
+        )
+    if errores:
+        frappe.throw("<br>".join(errores) + "<br>Revise RQ Job / Error Log.")
+
+    return estados
+
+
+def _cancelar_pendientes(jobs, estados):
+    """
+    Cancela los jobs que siguen en cola (los que ya están corriendo no se
+    pueden detener desde aquí) y devuelve {job_name: estado} de todos los
+    que no terminaron.
+    """
+
+    pendientes = {}
+    for job_name, job in jobs.items():
+        if job_name in estados:
+            continue
+
+        estado = job.get_status(refresh=True)
+        if estado == "finished":
+            # terminó después del último poll
+            estados[job_name] = estado
+            continue
+        if estado == "queued":
+            job.cancel()
+            estado = "canceled"
+
+        pendientes[job_name] = estado
+        print(f"⚠️ {job_name}: {estado}")
+
+    return pendientes
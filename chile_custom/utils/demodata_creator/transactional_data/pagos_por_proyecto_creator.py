@@ -2,6 +2,14 @@ import frappe
 from datetime import timedelta
 import random
 
+from chile_custom.utils.demodata_creator.transactional_data.project_utils import (
+    get_facturas_agrupadas_por_proyecto,
+    get_facturas_por_proyecto,
+)
+
+
+PINV_FIELDS = ["name", "supplier", "posting_date", "bill_no", "grand_total", "outstanding_amount"]
+
 
 def crear_pagos_para_proyecto(
     company: str,
@@ -26,46 +34,118 @@ def crear_pagos_para_proyecto(
     - Outstanding siempre correcto
     """
 
-    if seed is not None:
-        random.seed(seed)
-
     # -------------------------------------------------
-    # 1. Obtener todas las PINV (docstatus=1)
+    # 1. PINV submitted del proyecto (según el proyecto de sus ítems),
+    #    con outstanding incluido, en una sola consulta
     # -------------------------------------------------
-    pinvs_all = frappe.get_all(
-        "Purchase Invoice",
-        filters={"docstatus": 1},
-        fields=["name", "supplier", "posting_date", "bill_no", "grand_total"],
-        order_by="posting_date asc"  # <= importante para saber cuáles son las últimas
+    pinvs = get_facturas_por_proyecto("Purchase Invoice", project_name, PINV_FIELDS)
+
+    if not pinvs:
+        print(f"⚠️ No se encontraron PINV para proyecto '{project_name}' usando ítems.")
+        return []
+
+    # cuenta por pagar desde Company (una sola vez)
+    cuenta_por_pagar = frappe.db.get_value(
+        "Company", company, "default_payable_account"
     )
 
-    pinvs = []
+    return _crear_pagos(
+        company,
+        project_name,
+        pinvs,
+        cuenta_banco,
+        cuenta_por_pagar,
+        seed,
+        porcentaje_30_dias,
+        porcentaje_contado,
+        porcentaje_60_dias,
+        porcentaje_sin_pagar,
+    )
 
-    # -------------------------------------------------
-    # 2. Filtrar solo las PINV cuyos ítems coinciden con el proyecto
-    # -------------------------------------------------
-    for inv in pinvs_all:
-        items = frappe.get_all(
-            "Purchase Invoice Item",
-            filters={"parent": inv.name},
-            fields=["project"]
+
+def crear_pagos_todos_los_proyectos(
+    company: str,
+    cuenta_banco: str,
+    seed: int | None = 42,
+    seeds: dict | None = None,
+    projects: list[str] | None = None,
+    porcentaje_30_dias: float = 0.7,
+    porcentaje_contado: float = 0.2,
+    porcentaje_60_dias: float = 0.1,
+    porcentaje_sin_pagar: float = 0.10,
+):
+    """
+    Igual que crear_pagos_para_proyecto pero para TODOS los proyectos (o los
+    de `projects`) en una sola pasada: las PINV se leen con UNA consulta y se
+    particionan por el proyecto de sus ítems.
+
+    Reproducibilidad: cada proyecto se siembra por separado con
+    seeds.get(proyecto, seed), así el resultado de cada proyecto es el mismo
+    que llamando a crear_pagos_para_proyecto con esa semilla.
+
+    Devuelve {proyecto: [Payment Entries creados]}.
+
+    Para ejecutarlo:
+        bench --site [site] execute chile_custom.utils.demodata_creator.transactional_data.pagos_por_proyecto_creator.crear_pagos_todos_los_proyectos --kwargs "{'company': '...', 'cuenta_banco': '...'}"
+    """
+
+    pinvs_por_proyecto = get_facturas_agrupadas_por_proyecto(
+        "Purchase Invoice", PINV_FIELDS, company=company, projects=projects
+    )
+
+    if not pinvs_por_proyecto:
+        print("⚠️ No se encontraron PINV con proyecto en sus ítems.")
+        return {}
+
+    cuenta_por_pagar = frappe.db.get_value(
+        "Company", company, "default_payable_account"
+    )
+
+    seeds = seeds or {}
+    creados = {}
+
+    for project_name in sorted(pinvs_por_proyecto):
+        print(f"\n📁 Proyecto {project_name}")
+        creados[project_name] = _crear_pagos(
+            company,
+            project_name,
+            pinvs_por_proyecto[project_name],
+            cuenta_banco,
+            cuenta_por_pagar,
+            seeds.get(project_name, seed),
+            porcentaje_30_dias,
+            porcentaje_contado,
+            porcentaje_60_dias,
+            porcentaje_sin_pagar,
         )
 
-        if not items:
-            continue
+    total = sum(len(v) for v in creados.values())
+    print(f"\n🏁 PAGOS TODOS LOS PROYECTOS: {total} Payment Entries en {len(creados)} proyectos.")
+    return creados
 
-        # primer project válido que aparezca en los ítems
-        project_item = next((it.project for it in items if it.project), None)
 
-        if project_item == project_name:
-            pinvs.append(inv)
+def _crear_pagos(
+    company: str,
+    project_name: str,
+    pinvs: list,
+    cuenta_banco: str,
+    cuenta_por_pagar: str | None,
+    seed: int | None,
+    porcentaje_30_dias: float,
+    porcentaje_contado: float,
+    porcentaje_60_dias: float,
+    porcentaje_sin_pagar: float,
+):
+    """
+    Crea los Payment Entries de las PINV (ya filtradas y ordenadas por fecha)
+    de UN proyecto. Núcleo común del modo por proyecto y del modo masivo.
+    """
 
-    if not pinvs:
-        print(f"⚠️ No se encontraron PINV para proyecto '{project_name}' usando ítems.")
-        return []
+    if seed is not None:
+        random.seed(seed)
 
     # -------------------------------------------------
-    # 3. Calcular cuántas facturas dejar SIN pagar
+    # 2. Calcular cuántas facturas dejar SIN pagar
     # -------------------------------------------------
     n_total = len(pinvs)
     n_sin_pagar = int(n_total * porcentaje_sin_pagar)
@@ -84,19 +164,20 @@ def crear_pagos_para_proyecto(
     p0  = porcentaje_contado   / total_p
     p60 = porcentaje_60_dias  / total_p
 
+    if not cuenta_por_pagar and pinvs_a_pagar:
+        raise Exception(
+            f"La compañía {company} no tiene configurada default_payable_account."
+        )
+
     creados = []
 
     # -------------------------------------------------
-    # 4. Procesar las PINV que SÍ se pagarán
+    # 3. Procesar las PINV que SÍ se pagarán
     # -------------------------------------------------
     for inv in pinvs_a_pagar:
 
-        # outstanding real
-        outstanding = frappe.db.get_value(
-            "Purchase Invoice",
-            inv.name,
-            "outstanding_amount"
-        )
+        # outstanding real (cada pago sólo afecta a su propia factura)
+        outstanding = inv.outstanding_amount
 
         if not outstanding or outstanding <= 0:
             print(f"⚠️ PINV {inv.name} ya está pagada, saltando…")
@@ -113,16 +194,6 @@ def crear_pagos_para_proyecto(
 
         posting_date = inv.posting_date + timedelta(days=dias)
 
-        # cuenta por pagar desde Company
-        cuenta_por_pagar = frappe.db.get_value(
-            "Company", company, "default_payable_account"
-        )
-
-        if not cuenta_por_pagar:
-            raise Exception(
-                f"La compañía {company} no tiene configurada default_payable_account."
-            )
-
         # -------------------------------------------------
         # Crear Payment Entry
         # -------------------------------------------------
@@ -3,6 +3,7 @@ from datetime import date, timedelta
 
 import frappe
 from frappe.utils import getdate
+from chile_custom.utils.demodata_creator.transactional_data import cache_ejecucion
 from chile_custom.utils.demodata_creator.transactional_data.project_utils import get_project_info
 
 
@@ -65,19 +66,15 @@ def _get_items_by_groups(item_groups: list[str] | None, is_stock: bool | None):
     - stock / no stock (según parámetro)
     - item_group (si se especifica)
     """
-    filters = {
-        "disabled": 0,
-        "is_purchase_item": 1,
-        "is_fixed_asset": 0,       # <-- EXCLUYE ACTIVOS FIJOS
-    }
-
-    if item_groups:
-        filters["item_group"] = ["in", item_groups]
-
-    if is_stock is not None:
-        filters["is_stock_item"] = 1 if is_stock else 0
-
-    items = frappe.get_all("Item", filters=filters, pluck="name")
+    items = [
+        code
+        for code, item in cache_ejecucion.get_item_snapshot().items()
+        if not item.disabled
+        and item.is_purchase_item
+        and not item.is_fixed_asset       # <-- EXCLUYE ACTIVOS FIJOS
+        and (not item_groups or item.item_group in item_groups)
+        and (is_stock is None or bool(item.is_stock_item) == is_stock)
+    ]
     return items
 
 
@@ -138,7 +135,8 @@ def _split_budget(total: float, n: int):
 
 
 def _get_standard_rate(item_code: str) -> float:
-    rate = frappe.db.get_value("Item", item_code, "standard_rate")
+    item = cache_ejecucion.get_item(item_code)
+    rate = item.standard_rate if item else None
     if rate and rate > 0:
         return float(rate)
     return float(random.randint(10_000, 800_000))
@@ -174,11 +172,9 @@ def _crear_pinv_material_obra(
     remaining = max(monto_aprox, 50_000)
     items = []
     
-    # plantilla de impuestos POR EMPRESA
-    tax_template_name = frappe.db.get_value(
-        "Purchase Taxes and Charges Template",
-        {"is_default": 1, "company": company},
-        "name",
+    # plantilla de impuestos POR EMPRESA (filas ya limpias, cacheadas por ejecución)
+    tax_template_name, tax_rows = cache_ejecucion.get_tax_template(
+        "Purchase Taxes and Charges Template", company
     )
 
     for idx, code in enumerate(item_codes, start=1):
@@ -195,7 +191,7 @@ def _crear_pinv_material_obra(
             "item_code": code,
             "qty": qty,
             "rate": rate,
-            "uom": frappe.db.get_value("Item", code, "stock_uom") or "Nos",
+            "uom": cache_ejecucion.get_item_stock_uom(code) or "Nos",
             "warehouse": warehouse,
             "project": project_name,
             "cost_center": cost_center,
@@ -214,7 +210,7 @@ def _crear_pinv_material_obra(
         "supplier": supplier,
         "conversion_rate": 1.0,
         "bill_no": bill_no,
-        "currency": frappe.db.get_value("Company", company, "default_currency") or "CLP",
+        "currency": cache_ejecucion.get_company_value(company, "default_currency") or "CLP",
         "items": items,
     })
     
@@ -222,18 +218,10 @@ def _crear_pinv_material_obra(
     pinv.taxes = []
 
     if tax_template_name:
-        template = frappe.get_doc("Purchase Taxes and Charges Template", tax_template_name)
-
-        if not template.taxes:
+        if not tax_rows:
             print(f"⚠️ La plantilla de impuestos '{tax_template_name}' no tiene filas de impuestos.")
         else:
-            for t in template.taxes:
-                # copiamos los campos relevantes desde la plantilla
-                tax_row = t.as_dict().copy()
-                # limpiamos metadatos que no deben ir en la nueva fila
-                for key in ("name", "parent", "parenttype", "parentfield", "idx", "doctype"):
-                    tax_row.pop(key, None)
-
+            for tax_row in tax_rows:
                 pinv.append("taxes", tax_row)
 
     # por si acaso, aseguramos que ningún item tenga apply_tds = 1
@@ -272,11 +260,9 @@ def _crear_pinv_subcontrato_obra(
     items = []
     
         
-    # plantilla de impuestos POR EMPRESA
-    tax_template_name = frappe.db.get_value(
-        "Purchase Taxes and Charges Template",
-        {"is_default": 1, "company": company},
-        "name",
+    # plantilla de impuestos POR EMPRESA (filas ya limpias, cacheadas por ejecución)
+    tax_template_name, tax_rows = cache_ejecucion.get_tax_template(
+        "Purchase Taxes and Charges Template", company
     )
     
     for idx, code in enumerate(item_codes, start=1):
@@ -292,7 +278,7 @@ def _crear_pinv_subcontrato_obra(
             "item_code": code,
             "qty": qty,
             "rate": rate,
-            "uom": frappe.db.get_value("Item", code, "stock_uom") or "Nos",
+            "uom": cache_ejecucion.get_item_stock_uom(code) or "Nos",
             "project": project_name,
             "cost_center": cost_center,
             # sin warehouse → servicio / no stock
@@ -310,7 +296,7 @@ def _crear_pinv_subcontrato_obra(
         "bill_no": bill_no,
         "supplier": supplier,
         "conversion_rate": 1.0,
-        "currency": frappe.db.get_value("Company", company, "default_currency") or "CLP",
+        "currency": cache_ejecucion.get_company_value(company, "default_currency") or "CLP",
         "items": items,
     })
     
@@ -318,18 +304,10 @@ def _crear_pinv_subcontrato_obra(
     pinv.taxes = []
 
     if tax_template_name:
-        template = frappe.get_doc("Purchase Taxes and Charges Template", tax_template_name)
-
-        if not template.taxes:
+        if not tax_rows:
             print(f"⚠️ La plantilla de impuestos '{tax_template_name}' no tiene filas de impuestos.")
         else:
-            for t in template.taxes:
-                # copiamos los campos relevantes desde la plantilla
-                tax_row = t.as_dict().copy()
-                # limpiamos metadatos que no deben ir en la nueva fila
-                for key in ("name", "parent", "parenttype", "parentfield", "idx", "doctype"):
-                    tax_row.pop(key, None)
-
+            for tax_row in tax_rows:
                 pinv.append("taxes", tax_row)
 
     # por si acaso, aseguramos que ningún item tenga apply_tds = 1
@@ -363,6 +341,12 @@ def crear_pinv_para_proyecto(
     - Las compras comienzan hasta 15 días antes de la fecha de inicio.
     - Reparte el presupuesto_total entre n_pinv facturas.
     - Mezcla materiales de obra (stock) y subcontratos (no stock).
+    - Hace commit después de cada factura: el submit actualiza las filas de
+      Supplier PINV Summary / Monthly del proveedor, que se comparten con
+      los demás jobs del orquestador. Con un solo commit al final cada job
+      retendría esos locks durante toda su ejecución (lock wait timeouts y
+      deadlocks); con un commit por factura cada transacción toca un solo
+      proveedor y libera sus locks enseguida.
 
     Ejemplo desde bench console:
 
@@ -380,6 +364,8 @@ def crear_pinv_para_proyecto(
     if seed is not None:
         random.seed(seed)
 
+    cache_ejecucion.reiniciar()
+
     proj, start, end, cost_center, customer = get_project_info(project_name)
     warehouses = _get_warehouses_for_project(company, project_name)
 
@@ -493,7 +479,9 @@ def crear_pinv_para_proyecto(
         if nombre:
             creados.append(nombre)
 
-    frappe.db.commit()
+        # libera los locks de las filas agregadas del proveedor
+        frappe.db.commit()
+
     print(
         f"🎯 Proyecto {project_name}: PINV creadas = {len(creados)} "
         f"(presupuesto aprox: {presupuesto_total:,.0f} CLP)"
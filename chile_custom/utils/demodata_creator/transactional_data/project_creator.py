@@ -53,6 +53,7 @@ import frappe
 from faker import Faker
 from datetime import datetime, timedelta
 from chile_custom.constants.regiones import regiones
+from chile_custom.utils.regiones import get_comuna_info
 
 
 fake = Faker("es_CL")
@@ -334,11 +335,9 @@ def fix_project_lat_lon():
     
     
 def get_region_by_comuna(comuna):
-    """Busca la región según la comuna, usando regiones.py."""
-    for r in regiones:
-        if comuna in r["comunas"]:
-            return r["region"]
-    return None
+    """Busca la región según la comuna, usando el índice de utils.regiones."""
+    info = get_comuna_info(comuna)
+    return info["region"] if info else None
 
 
 def build_address(comuna, region):
@@ -74,6 +74,115 @@ def get_project_info(project_name: str):
 
 
 
+def get_facturas_por_proyecto(doctype: str, project_name: str, fields: list[str]):
+    """
+    Devuelve las facturas submitted (Purchase / Sales Invoice) cuyo proyecto
+    es `project_name`, en UNA sola consulta.
+
+    Criterio (el mismo que usaban los creadores de pagos/cobros): el proyecto
+    de la factura es el del primer ítem (por idx) que tenga proyecto.
+    Usa el índice (project, parent) de la tabla de ítems
+    (chile_custom.custom.indexes).
+
+    Ordenadas por posting_date asc (importa para saber cuáles son las últimas).
+    """
+
+    return _query_facturas_por_proyecto(doctype, fields, project_name=project_name)
+
+
+def get_facturas_agrupadas_por_proyecto(
+    doctype: str,
+    fields: list[str],
+    company: str | None = None,
+    projects: list[str] | None = None,
+) -> dict:
+    """
+    Igual que get_facturas_por_proyecto pero para TODOS los proyectos a la vez:
+    una sola consulta, particionada en Python.
+
+    Devuelve {proyecto: [facturas ordenadas por posting_date asc]}.
+    Si se entrega `projects`, sólo se devuelven esos proyectos.
+    """
+
+    rows = _query_facturas_por_proyecto(doctype, fields, company=company)
+    solo = set(projects) if projects else None
+
+    por_proyecto = {}
+    for row in rows:
+        if solo is not None and row.project not in solo:
+            continue
+        por_proyecto.setdefault(row.project, []).append(row)
+
+    return por_proyecto
+
+
+def _query_facturas_por_proyecto(
+    doctype: str,
+    fields: list[str],
+    project_name: str | None = None,
+    company: str | None = None,
+):
+    """
+    Consulta común: facturas submitted + proyecto de su primer ítem con
+    proyecto (columna `project`). Una factura aparece una sola vez.
+    """
+
+    sql, values = facturas_por_proyecto_query(doctype, fields, project_name, company)
+    return frappe.db.sql(sql, values, as_dict=True)
+
+
+def facturas_por_proyecto_query(
+    doctype: str,
+    fields: list[str],
+    project_name: str | None = None,
+    company: str | None = None,
+):
+    """
+    (sql, values) de _query_facturas_por_proyecto. También la usa
+    check_indexes (chile_custom.custom.indexes).
+    """
+
+    item_doctype = f"{doctype} Item"
+    columns = ", ".join(f"inv.`{f}`" for f in fields)
+
+    # project > '' (excluye NULL y '') en vez de IFNULL(...): así el modo
+    # "todos los proyectos" también puede usar el índice (project, parent)
+    item_conditions = ["project > ''"]
+    conditions = ["inv.docstatus = 1"]
+    values = {}
+
+    if project_name:
+        item_conditions.append("project = %(project)s")
+        values["project"] = project_name
+
+    if company:
+        conditions.append("inv.company = %(company)s")
+        values["company"] = company
+
+    return f"""
+        SELECT {columns}, it.project AS project
+        FROM `tab{doctype}` inv
+        INNER JOIN (
+            SELECT parent, project, MIN(idx) AS first_idx
+            FROM `tab{item_doctype}`
+            WHERE {" AND ".join(item_conditions)}
+            GROUP BY parent, project
+        ) it ON it.parent = inv.name
+        WHERE
+            {" AND ".join(conditions)}
+            AND NOT EXISTS (
+                SELECT 1
+                FROM `tab{item_doctype}` otro
+                WHERE otro.parent = inv.name
+                  AND otro.idx < it.first_idx
+                  AND IFNULL(otro.project, '') NOT IN ('', it.project)
+            )
+        ORDER BY inv.posting_date ASC, inv.name ASC
+    """, values
+
+
+
+
 def asignar_cost_center_por_prefijo():
     """
     Recorre todos los proyectos y asigna automáticamente un Cost Center
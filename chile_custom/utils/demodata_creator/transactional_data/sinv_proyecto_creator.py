@@ -4,6 +4,7 @@ from datetime import timedelta
 import frappe
 from frappe.utils import getdate, add_months
 
+from chile_custom.utils.demodata_creator.transactional_data import cache_ejecucion
 from chile_custom.utils.demodata_creator.transactional_data.project_utils import get_project_info
 
 
@@ -17,17 +18,8 @@ def resolve_item_code(item_label: str):
     No crea nada. Solo busca.
     """
 
-    # Primero exact match por item_name
-    code = frappe.db.get_value("Item", {"item_name": item_label}, "name")
-    if code:
-        return code
-
-    # Si no, buscar parecido
-    code = frappe.db.get_value(
-        "Item",
-        {"item_name": ["like", f"%{item_label}%"]},
-        "name"
-    )
+    # Exact match por item_name y, si no, parecido (snapshot de Item)
+    code = cache_ejecucion.find_item_code(item_label)
     if code:
         return code
 
@@ -58,6 +50,8 @@ def crear_facturas_venta_proyecto(
     if seed is not None:
         random.seed(seed)
 
+    cache_ejecucion.reiniciar()
+
     # ---------------------------
     # 1) Obtener info del Proyecto
     # ---------------------------
@@ -192,7 +186,7 @@ def _crear_sinv(
                 "item_code": resolve_item_code(item),
                 "qty": 1,
                 "rate": amount,
-                "income_account": frappe.db.get_value("Company", company, "default_income_account"),
+                "income_account": cache_ejecucion.get_company_value(company, "default_income_account"),
                 "cost_center": cost_center,
                 "project": project_name
             }
@@ -204,23 +198,16 @@ def _crear_sinv(
     # -----------------------------
     sinv.taxes = []
 
-    # Obtener plantilla default de ventas por empresa
-    tax_template_name = frappe.db.get_value(
-        "Sales Taxes and Charges Template",
-        {"is_default": 1, "company": company},
-        "name",
+    # Plantilla default de ventas por empresa (filas ya limpias, cacheadas por ejecución)
+    tax_template_name, tax_rows = cache_ejecucion.get_tax_template(
+        "Sales Taxes and Charges Template", company
     )
 
     if tax_template_name:
-        template = frappe.get_doc("Sales Taxes and Charges Template", tax_template_name)
-
-        if not template.taxes:
+        if not tax_rows:
             print(f"⚠️ La plantilla de impuestos '{tax_template_name}' no tiene filas.")
         else:
-            for t in template.taxes:
-                row = t.as_dict().copy()
-                for key in ("name", "parent", "parenttype", "parentfield", "idx", "doctype"):
-                    row.pop(key, None)
+            for row in tax_rows:
                 sinv.append("taxes", row)
 
     # evitar TDS
@@ -0,0 +1,144 @@
+# File: chile_custom/utils/regiones.py
+# ---------------------------------------------------------
+# Índices precalculados sobre chile_custom.constants.regiones.
+#
+# Se construyen UNA vez al importar el módulo (cada worker los comparte
+# durante toda su vida) y quedan congelados (MappingProxyType / tuplas).
+# La búsqueda por comuna es O(1) e insensible a mayúsculas y tildes:
+#     "ñuñoa", "NUNOA" y "Ñuñoa" encuentran la misma comuna.
+# ---------------------------------------------------------
+
+import json
+import os
+import unicodedata
+from types import MappingProxyType
+
+from chile_custom.constants.regiones import regiones
+
+
+def normalizar_comuna(nombre: str) -> str:
+    """Clave de búsqueda: sin tildes, en minúsculas y con espacios colapsados."""
+    if not nombre:
+        return ""
+    texto = unicodedata.normalize("NFKD", nombre)
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(texto.casefold().split())
+
+
+def _build_comuna_index():
+    index = {}
+    for r in regiones:
+        for comuna in r["comunas"]:
+            index[normalizar_comuna(comuna)] = MappingProxyType({
+                "region": r["region"],
+                "numero": r["numero"],
+                "comuna": comuna,
+            })
+    return MappingProxyType(index)
+
+
+# { comuna normalizada: {"region", "numero", "comuna" (nombre oficial)} }
+COMUNA_INDEX = _build_comuna_index()
+
+# Nombres de región en el orden de constants.regiones
+NOMBRES_REGIONES = tuple(r["region"] for r in regiones)
+
+# { región: (comunas, ...) }
+COMUNAS_POR_REGION = MappingProxyType({r["region"]: tuple(r["comunas"]) for r in regiones})
+
+
+def get_comuna_info(comuna: str):
+    """Devuelve el registro congelado de la comuna o None si no existe."""
+    return COMUNA_INDEX.get(normalizar_comuna(comuna))
+
+
+def get_region_from_comuna(comuna: str) -> dict:
+    """
+    Devuelve {"region", "numero"} de la comuna, o {} si no existe.
+    Mismo formato que chile_custom.api.get_region_from_comuna.
+    """
+    info = get_comuna_info(comuna)
+    if not info:
+        return {}
+    return {"region": info["region"], "numero": info["numero"]}
+
+
+# ---------------------------------------------------------
+# Asset estático para el cliente (public/js/regiones_map.js)
+# ---------------------------------------------------------
+
+REGIONES_ASSET_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "public", "js", "regiones_map.js",
+)
+
+
+def build_regiones_js() -> str:
+    """
+    Genera el JS con el mapa comuna → región para los form scripts.
+    Formato compacto: lista de [región, número] + {comuna normalizada: índice}.
+
+    El archivo generado se versiona en el repo (no se escribe en migrate);
+    chile_custom/tests/test_regiones_asset.py verifica que esté al día.
+    """
+    lista_regiones = [[r["region"], r["numero"]] for r in regiones]
+    comunas = {
+        normalizar_comuna(c): i
+        for i, r in enumerate(regiones)
+        for c in r["comunas"]
+    }
+
+    payload = json.dumps(
+        {"regiones": lista_regiones, "comunas": comunas},
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+    return f"""// Generado desde chile_custom/constants/regiones.py — NO EDITAR A MANO.
+// Regenerar tras cambiar las regiones: python -m chile_custom.utils.regiones
+frappe.provide("chile_custom");
+
+chile_custom.regiones = Object.assign({payload}, {{
+    normalizar(nombre) {{
+        return (nombre || "")
+            .normalize("NFKD")
+            .replace(/[\\u0300-\\u036f]/g, "")
+            .toLowerCase()
+            .split(/\\s+/)
+            .filter(Boolean)
+            .join(" ");
+    }},
+
+    // Mismo formato que chile_custom.api.get_region_from_comuna
+    get_region_from_comuna(comuna) {{
+        const idx = this.comunas[this.normalizar(comuna)];
+        if (idx === undefined) return {{}};
+        const [region, numero] = this.regiones[idx];
+        return {{ region, numero }};
+    }}
+}});
+"""
+
+
+def write_regiones_asset():
+    """
+    Reescribe public/js/regiones_map.js (sólo si cambió). Es un paso de
+    desarrollo: correrlo tras editar constants/regiones.py y commitear el
+    resultado.
+
+    Para ejecutarlo:
+        python -m chile_custom.utils.regiones
+    """
+    content = build_regiones_js()
+
+    if os.path.exists(REGIONES_ASSET_PATH):
+        with open(REGIONES_ASSET_PATH, encoding="utf-8") as f:
+            if f.read() == content:
+                return
+
+    with open(REGIONES_ASSET_PATH, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+if __name__ == "__main__":
+    write_regiones_asset()
@@ -1,5 +1,27 @@
 import re
-import frappe
+from functools import lru_cache
+from itertools import cycle, islice
+from operator import mul
+
+# Códigos de error por fila para normalize_ruts
+RUT_ERROR_FORMATO = "formato_invalido"
+RUT_ERROR_DV = "dv_invalido"
+
+RUT_RE = re.compile(r"^(\d+)-([\dK])$")
+
+# Pesos del módulo 11 (2..7 repetido) de derecha a izquierda, precalculados
+# para cuerpos de hasta 24 dígitos (un RUT real tiene 8 o 9).
+DV_WEIGHTS = tuple(islice(cycle(range(2, 8)), 24))
+
+# Para cuerpos ASCII se multiplican directamente los bytes: el aporte del
+# "0" (48) en los primeros n dígitos se descuenta con esta tabla.
+DV_ASCII_OFFSETS = tuple(48 * sum(DV_WEIGHTS[:n]) for n in range(len(DV_WEIGHTS) + 1))
+
+# DV según suma % 11: 0 → "0", 1 → "K", r → str(11 - r)
+DV_TABLE = "0K987654321"
+
+# Memo de RUTs ya normalizados (los imports repiten mucho los mismos)
+RUT_CACHE_SIZE = 65_536
 
 
 def normalize_rut(rut: str) -> str:
@@ -9,10 +31,72 @@ def normalize_rut(rut: str) -> str:
     Ej: "12.345.678-k" -> "12345678-K"
     """
 
+    # import local: el resto del módulo no depende de frappe (tests sin site)
+    import frappe
+
+    value, error = _normalize_value(rut)
+
+    if error == RUT_ERROR_FORMATO:
+        raise frappe.ValidationError("Formato de RUT inválido. Use: 12345678-K")
+
+    if error == RUT_ERROR_DV:
+        raise frappe.ValidationError(f"RUT inválido: el dígito verificador no coincide ({value})")
+
+    return value
+
+
+def normalize_ruts(ruts) -> tuple[list, list]:
+    """
+    Versión batch de normalize_rut, pensada para importaciones grandes.
+
+    No lanza excepciones: devuelve dos listas alineadas con la entrada,
+        - valores: RUT normalizado ("" si venía vacío, None si es inválido)
+        - errores: None o el código de error de la fila
+                   (RUT_ERROR_FORMATO / RUT_ERROR_DV)
+
+    Ej:
+        normalize_ruts(["12.345.678-5", "1-2"]) -> (["12345678-5", None], [None, "dv_invalido"])
+    """
+
+    valores = []
+    errores = []
+
+    for rut in ruts:
+        value, error = _normalize_value(rut)
+        valores.append(None if error else value)
+        errores.append(error)
+
+    return valores, errores
+
+
+def _normalize_value(rut) -> tuple[str | None, str | None]:
+    """
+    Filtra el tipo antes del memo: desde un JSON pueden llegar listas /
+    dicts (no hasheables, romperían el lru_cache para todo el lote). Sólo
+    str, int (RUT sin formato) o vacío pasan a _normalize; el resto es
+    RUT_ERROR_FORMATO de esa fila.
+    """
+
+    if isinstance(rut, int) and not isinstance(rut, bool):
+        rut = str(rut)
+
+    if rut is None or isinstance(rut, str):
+        return _normalize(rut)
+
+    return None, RUT_ERROR_FORMATO
+
+
+@lru_cache(maxsize=RUT_CACHE_SIZE)
+def _normalize(rut: str) -> tuple[str, str | None]:
+    """
+    Núcleo común de normalize_rut / normalize_ruts.
+    Devuelve (rut, código de error o None).
+    """
+
     if not rut:
-        return ""
+        return "", None
 
-    rut = rut.strip().upper()
+    rut = str(rut).strip().upper()
 
     # 1. quitar puntos
     rut = rut.replace(".", "")
@@ -23,39 +107,32 @@ def normalize_rut(rut: str) -> str:
         rut = rut[:-1] + "-" + rut[-1:]
 
     # Validar formato básico
-    if not re.match(r"^\d+-[\dK]$", rut):
-        raise frappe.ValidationError("Formato de RUT inválido. Use: 12345678-K")
+    match = RUT_RE.match(rut)
+    if not match:
+        return rut, RUT_ERROR_FORMATO
 
-    cuerpo, dv = rut.split("-")
-
-    if not cuerpo.isdigit():
-        raise frappe.ValidationError("RUT inválido: el cuerpo debe ser numérico.")
+    cuerpo, dv = match.groups()
 
     # Validar DV
     if calculate_dv(cuerpo) != dv:
-        raise frappe.ValidationError(f"RUT inválido: el dígito verificador no coincide ({rut})")
+        return rut, RUT_ERROR_DV
 
     # 3. Devolver en formato estándar
-    return f"{cuerpo}-{dv}"
+    return f"{cuerpo}-{dv}", None
 
 
-def calculate_dv(cuerpo: str) -> str:
+def calculate_dv(cuerpo: str | int) -> str:
     """
     Calcula el dígito verificador con el algoritmo OFICIAL del SII (2-7).
+    Acepta el cuerpo como str o int (p. ej. 12345678 o "12345678").
     """
 
-    suma = 0
-    factor = 2
-
-    for c in reversed(cuerpo):
-        suma += int(c) * factor
-        factor = 2 if factor == 7 else factor + 1
+    digits = str(cuerpo)[::-1]
 
-    resto = suma % 11
-    dv = 11 - resto
+    if digits.isascii() and digits.isdigit() and len(digits) <= len(DV_WEIGHTS):
+        # camino rápido: multiplica los bytes ASCII y descuenta el "0" por tabla
+        suma = sum(map(mul, digits.encode(), DV_WEIGHTS)) - DV_ASCII_OFFSETS[len(digits)]
+    else:
+        suma = sum(map(mul, map(int, digits), cycle(range(2, 8))))
 
-    if dv == 11:
-        return "0"
-    if dv == 10:
-        return "K"
-    return str(dv)
+    return DV_TABLE[suma % 11]
@@ -0,0 +1,253 @@
+# File: chile_custom/utils/timeline.py
+# ---------------------------------------------------------
+# Motor de acumulado + forward fill para reportes tipo "timeline".
+#
+# Recibe filas agregadas por (día, grupo) y devuelve, para cada grupo,
+# una serie alineada con TODAS las fechas del rango (sin saltos), con el
+# valor acumulado a esa fecha. Se usa en los reportes
+# "Net Profit Timeline por Cost Center" y "Net Profit Timeline por Project".
+#
+# No depende de frappe: así se puede medir con los benchmarks sin BD.
+# ---------------------------------------------------------
+
+from datetime import date, timedelta
+
+
+def date_range(start: date, end: date) -> list[date]:
+    """Lista COMPLETA de fechas entre start y end (ambas incluidas)."""
+    n_days = (end - start).days + 1
+    return [start + timedelta(days=i) for i in range(max(0, n_days))]
+
+
+# Granularidades soportadas por los reportes timeline y la expresión SQL
+# que lleva cada fecha al inicio de su bucket (lunes / día 1 del mes)
+GRANULARITIES = ("day", "week", "month")
+
+_BUCKET_SQL = {
+    "day": "{col}",
+    "week": "DATE_SUB({col}, INTERVAL WEEKDAY({col}) DAY)",
+    "month": "DATE_SUB({col}, INTERVAL DAYOFMONTH({col}) - 1 DAY)",
+}
+
+# Puntos / series máximas del gráfico (el reporte puede traer cientos de
+# columnas y miles de fechas; el gráfico no necesita tanto detalle)
+CHART_MAX_POINTS = 200
+CHART_MAX_SERIES = 10
+
+
+def normalize_granularity(granularity: str | None) -> str:
+    """'Week' / 'week' / None → 'week' / 'week' / 'day'."""
+    granularity = (granularity or "day").lower()
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Granularidad inválida: {granularity}. Use una de {', '.join(GRANULARITIES)}.")
+    return granularity
+
+
+def bucket_sql(column: str, granularity: str) -> str:
+    """Expresión SQL con el inicio del bucket de `column` (una fecha)."""
+    return _BUCKET_SQL[granularity].format(col=column)
+
+
+def bucket_start(d: date, granularity: str) -> date:
+    """Inicio del bucket de d (mismo criterio que bucket_sql)."""
+    if granularity == "week":
+        return d - timedelta(days=d.weekday())
+    if granularity == "month":
+        return d.replace(day=1)
+    return d
+
+
+def bucket_range(start: date, end: date, granularity: str) -> list[date]:
+    """Inicios de TODOS los buckets entre start y end (ambos incluidos)."""
+    if granularity == "day":
+        return date_range(start, end)
+
+    current = bucket_start(start, granularity)
+    buckets = []
+    while current <= end:
+        buckets.append(current)
+        if granularity == "week":
+            current += timedelta(days=7)
+        else:
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return buckets
+
+
+def group_rows(rows, group_field: str = "cost_center", value_field: str = "net_profit"):
+    """
+    Agrupa filas [{day, <group_field>, <value_field>}] por grupo.
+
+    Devuelve un dict {grupo: [(day, valor), ...]} respetando el orden de
+    aparición de los grupos (el mismo orden que usan las columnas).
+    Las filas deben venir ordenadas por día.
+    """
+    data_by_group = {}
+    for r in rows:
+        data_by_group.setdefault(r[group_field], []).append((r["day"], r[value_field]))
+    return data_by_group
+
+
+def forward_fill_cumulative(values, all_dates: list[date]) -> list:
+    """
+    Acumulado con forward fill en UNA sola pasada.
+
+    `values` es una lista [(day, valor)] ordenada por día. Se recorre con un
+    cursor a la vez que las fechas, así el costo es O(días + entradas) en vez
+    de buscar la última fecha previa para cada día.
+
+    Días anteriores al primer movimiento quedan en 0.
+    """
+    serie = []
+    total = 0
+    i = 0
+    n = len(values)
+
+    for d in all_dates:
+        while i < n and values[i][0] <= d:
+            total += values[i][1]
+            i += 1
+        serie.append(total)
+
+    return serie
+
+
+def build_timeline(data_by_group: dict, all_dates: list[date]) -> dict:
+    """Devuelve {grupo: serie acumulada alineada con all_dates}."""
+    return {
+        group: forward_fill_cumulative(values, all_dates)
+        for group, values in data_by_group.items()
+    }
+
+
+def group_fieldname(group: str) -> str:
+    """Fieldname de la columna de un grupo (mismo criterio en todos los reportes)."""
+    return group.replace(" ", "_").lower()
+
+
+def build_report(
+    rows,
+    all_dates: list[date],
+    group_field: str,
+    labels: dict | None = None,
+    order: list | None = None,
+):
+    """
+    Núcleo común de los reportes timeline: de filas [{day, <group_field>,
+    net_profit}] ordenadas por día a (columns, data) con una columna Float
+    por grupo y una fila por fecha de all_dates.
+
+    `labels` permite cambiar la etiqueta de la columna ({grupo: etiqueta}).
+    `order` fija el orden de las columnas (por defecto, orden de aparición).
+    """
+    labels = labels or {}
+
+    # 1. Agrupar por grupo (cost center, project, ...)
+    data_by_group = group_rows(rows, group_field)
+    if order:
+        data_by_group = {g: data_by_group[g] for g in order if g in data_by_group}
+
+    # 2. Columnas
+    columns = [{"label": "Fecha", "fieldname": "day", "fieldtype": "Date"}]
+
+    fields = {}
+    for group in data_by_group:
+        fields[group] = group_fieldname(group)
+        columns.append({
+            "label": labels.get(group, group),
+            "fieldname": fields[group],
+            "fieldtype": "Float"
+        })
+
+    # 3. Acumulado + FORWARD FILL en una sola pasada por grupo
+    series = build_timeline(data_by_group, all_dates)
+
+    data = [{"day": d} for d in all_dates]
+    for group, serie in series.items():
+        field = fields[group]
+        for row, value in zip(data, serie):
+            row[field] = value
+
+    return columns, data
+
+
+def to_columnar(columns: list, data: list) -> dict:
+    """
+    (columns, data) de build_report en formato columnar:
+        {"dates": [...], "series": [{"fieldname", "label", "values": [...]}]}
+
+    Cada fieldname aparece una sola vez (no en cada fila), lo que reduce
+    bastante el JSON de reportes anchos.
+    """
+    return {
+        "dates": [str(row["day"]) for row in data],
+        "series": [
+            {
+                "fieldname": c["fieldname"],
+                "label": c["label"],
+                "values": [row.get(c["fieldname"], 0) for row in data],
+            }
+            for c in columns[1:]
+        ],
+    }
+
+
+def downsample_indexes(n: int, max_points: int = CHART_MAX_POINTS) -> list[int]:
+    """
+    Índices de a lo más `max_points` puntos equiespaciados entre n, siempre
+    incluyendo el último. Como las series son acumuladas, el último punto
+    es el total.
+    """
+    if n <= max_points:
+        return list(range(n))
+
+    step = (n - 1) / (max_points - 1)
+    return [round(i * step) for i in range(max_points)]
+
+
+def build_chart(
+    columnar: dict,
+    max_points: int = CHART_MAX_POINTS,
+    max_series: int = CHART_MAX_SERIES,
+):
+    """
+    Gráfico de líneas para frappe a partir del formato columnar (to_columnar).
+
+    Se muestran las `max_series` series con mayor |acumulado final| y a lo
+    más `max_points` puntos, para que el navegador no dibuje cientos de
+    líneas con miles de puntos.
+    """
+    dates = columnar["dates"]
+    if not dates:
+        return None
+
+    series = sorted(columnar["series"], key=lambda s: abs(s["values"][-1] or 0), reverse=True)[:max_series]
+    idx = downsample_indexes(len(dates), max_points)
+
+    return {
+        "data": {
+            "labels": [dates[i] for i in idx],
+            "datasets": [{"name": s["label"], "values": [s["values"][i] for i in idx]} for s in series],
+        },
+        "type": "line",
+        "lineOptions": {"hideDots": 1},
+    }
+
+
+def report_result(columns: list, data: list, columnar: bool = False) -> tuple:
+    """
+    Tupla de execute() de los reportes timeline. El gráfico siempre se arma
+    desde el formato columnar (build_chart: top series + downsampling).
+
+    Con `columnar` (opt-in, filtro "Respuesta columnar") la respuesta NO
+    trae filas: el formato columnar completo viaja en chart["columnar"],
+    junto al gráfico que se dibuja desde él.
+    """
+    payload = to_columnar(columns, data)
+    chart = build_chart(payload)
+
+    if not columnar:
+        return columns, data, None, chart
+
+    if chart:
+        chart["columnar"] = payload
+    return columns, [], None, chart
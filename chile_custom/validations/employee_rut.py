@@ -6,6 +6,7 @@
 
 import frappe
 from chile_custom.utils.rut import normalize_rut
+from chile_custom.chile_custom.doctype.rut_party_index.rut_party_index import sync_rut_index
 
 
 def validate_employee_rut(doc, method):
@@ -16,6 +17,7 @@ def validate_employee_rut(doc, method):
         return
 
     if not doc.rut:
+        sync_rut_index(doc, None)
         return
 
     try:
@@ -23,3 +25,6 @@ def validate_employee_rut(doc, method):
         doc.rut = normalize_rut(doc.rut)
     except Exception as e:
         frappe.throw(str(e))
+
+    # Índice RUT → party (unicidad y búsqueda por RUT)
+    sync_rut_index(doc, doc.rut)
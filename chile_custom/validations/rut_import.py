@@ -0,0 +1,137 @@
+# File: chile_custom/validations/rut_import.py
+# ---------------------------------------------------------
+# Pre-validación (pre-flight) de RUTs para Data Import.
+#
+# - Al guardar un Data Import de Supplier / Customer / Employee / Shareholder
+#   se validan TODOS los RUT del archivo en una sola pasada (normalize_ruts)
+#   y se informan todas las filas inválidas juntas, antes de crear documentos.
+# - Durante el job de importación cada documento se sigue validando con su
+#   validate hook: normalize_rut cuesta microsegundos y está memoizado, así
+#   que no vale la pena volver a leer el archivo completo para saltárselo.
+# ---------------------------------------------------------
+
+import frappe
+from chile_custom.utils.rut import RUT_ERROR_DV, RUT_ERROR_FORMATO, normalize_ruts
+
+# Campo RUT por DocType
+RUT_FIELDS = {
+    "Supplier": "tax_id",
+    "Customer": "tax_id",
+    "Employee": "rut",
+    "Shareholder": "rut",
+}
+
+ERROR_LABELS = {
+    RUT_ERROR_FORMATO: "Formato de RUT inválido (use 12345678-K)",
+    RUT_ERROR_DV: "El dígito verificador no coincide",
+}
+
+# Máximo de filas a listar en el mensaje de error
+MAX_FILAS_MENSAJE = 200
+
+
+def preflight_data_import(data_import) -> dict | None:
+    """
+    Valida en una pasada la columna RUT del archivo del Data Import.
+
+    Devuelve None si el DocType no tiene RUT o el archivo no trae la columna.
+    Si no, un dict:
+        {
+            "doctype", "fieldname", "total",
+            "invalidos": [{"row", "valor", "error"}, ...],
+            "validos": {valor original: RUT normalizado},
+        }
+    """
+    fieldname = RUT_FIELDS.get(data_import.reference_doctype)
+    if not fieldname or not (data_import.import_file or data_import.google_sheets_url):
+        return None
+
+    import_file = data_import.get_importer().import_file
+
+    column = next(
+        (
+            col for col in import_file.header.columns
+            if col.df
+            and not col.skip_import
+            and col.df.fieldname == fieldname
+            and col.df.parent == data_import.reference_doctype
+        ),
+        None,
+    )
+    if not column:
+        return None
+
+    filas = []
+    valores = []
+    for row in import_file.data:
+        valor = row.data[column.index] if column.index < len(row.data) else None
+        if valor in (None, ""):
+            continue
+        filas.append(row.row_number)
+        valores.append(valor)
+
+    normalizados, errores = normalize_ruts(valores)
+
+    invalidos = []
+    validos = {}
+    for fila, valor, normalizado, error in zip(filas, valores, normalizados, errores):
+        if error:
+            invalidos.append({"row": fila, "valor": valor, "error": error})
+        else:
+            validos[valor] = normalizado
+
+    return {
+        "doctype": data_import.reference_doctype,
+        "fieldname": fieldname,
+        "total": len(valores),
+        "invalidos": invalidos,
+        "validos": validos,
+    }
+
+
+def validate_data_import(doc, method):
+    """doc_event validate de Data Import: rechaza archivos con RUTs inválidos."""
+
+    if doc.reference_doctype not in RUT_FIELDS:
+        return
+
+    if not (doc.is_new() or doc.has_value_changed("import_file")
+            or doc.has_value_changed("google_sheets_url")):
+        return
+
+    resultado = preflight_data_import(doc)
+    if not resultado or not resultado["invalidos"]:
+        return
+
+    frappe.throw(_mensaje_invalidos(resultado), title="RUTs inválidos en el archivo")
+
+
+@frappe.whitelist()
+def validar_ruts_data_import(data_import: str):
+    """Pre-flight a pedido: devuelve el resumen sin crear documentos."""
+    doc = frappe.get_doc("Data Import", data_import)
+    doc.check_permission("read")
+
+    resultado = preflight_data_import(doc)
+    if not resultado:
+        return {}
+
+    resultado.pop("validos")
+    return resultado
+
+
+def _mensaje_invalidos(resultado: dict) -> str:
+    invalidos = resultado["invalidos"]
+
+    lineas = [
+        f"<li>Fila {r['row']}: <b>{frappe.utils.escape_html(str(r['valor']))}</b> — "
+        f"{ERROR_LABELS.get(r['error'], r['error'])}</li>"
+        for r in invalidos[:MAX_FILAS_MENSAJE]
+    ]
+    if len(invalidos) > MAX_FILAS_MENSAJE:
+        lineas.append(f"<li>… y {len(invalidos) - MAX_FILAS_MENSAJE} filas más</li>")
+
+    return (
+        f"{len(invalidos)} de {resultado['total']} filas tienen un "
+        f"{resultado['fieldname']} inválido:<ul>{''.join(lineas)}</ul>"
+    )
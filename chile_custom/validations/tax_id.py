@@ -1,5 +1,6 @@
 import frappe
 from chile_custom.utils.rut import normalize_rut
+from chile_custom.chile_custom.doctype.rut_party_index.rut_party_index import sync_rut_index
 
 def validate_tax_id(doc, method):
     """Valida y normaliza tax_id en cualquier DocType."""
@@ -8,9 +9,13 @@ def validate_tax_id(doc, method):
         return
 
     if not doc.tax_id:
+        sync_rut_index(doc, None)
         return
 
     try:
         doc.tax_id = normalize_rut(doc.tax_id)
     except Exception as e:
         frappe.throw(str(e))
+
+    # Índice RUT → party (unicidad y búsqueda por RUT)
+    sync_rut_index(doc, doc.tax_id)